@@ -0,0 +1,26 @@
+"""add permission scheme version
+
+Revision ID: ee7e5f38a207
+Revises: fec453e3f128
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ee7e5f38a207'
+down_revision: Union[str, None] = 'fec453e3f128'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('permission_schemes', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('permission_schemes', 'version')
@@ -0,0 +1,32 @@
+"""add task keyset indexes
+
+Revision ID: 44947de61016
+Revises: ee7e5f38a207
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '44947de61016'
+down_revision: Union[str, None] = 'ee7e5f38a207'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so large task tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        op.create_index('idx_task_project_created_id', 'tasks', ['project_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_task_project_status_created_id', 'tasks', ['project_id', 'status', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_task_created_id', 'tasks', ['created_at', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_task_created_id', table_name='tasks', postgresql_concurrently=True)
+        op.drop_index('idx_task_project_status_created_id', table_name='tasks', postgresql_concurrently=True)
+        op.drop_index('idx_task_project_created_id', table_name='tasks', postgresql_concurrently=True)
@@ -0,0 +1,46 @@
+"""add task rank
+
+Revision ID: 825248df3c0e
+Revises: 44947de61016
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '825248df3c0e'
+down_revision: Union[str, None] = '44947de61016'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('rank', sa.String(length=255, collation='C'), nullable=True))
+    # Backfill from the current position order: fixed-width hex digits plus a
+    # trailing "V" are valid base-62 ranks that never end in "0"
+    op.execute(
+        """
+        UPDATE tasks SET rank = ordered.rank
+        FROM (
+            SELECT id,
+                   lpad(to_hex(row_number() OVER (
+                       PARTITION BY project_id, sprint_id
+                       ORDER BY position, created_at, id
+                   )), 8, '0') || 'V' AS rank
+            FROM tasks
+        ) AS ordered
+        WHERE tasks.id = ordered.id
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.create_index('idx_task_project_sprint_rank', 'tasks', ['project_id', 'sprint_id', 'rank'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_task_project_sprint_rank', table_name='tasks', postgresql_concurrently=True)
+    op.drop_column('tasks', 'rank')
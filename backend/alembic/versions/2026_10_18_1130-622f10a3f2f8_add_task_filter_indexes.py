@@ -0,0 +1,29 @@
+"""add task filter indexes
+
+Revision ID: 622f10a3f2f8
+Revises: 6e26fa2b425a
+Create Date: 2026-10-18 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '622f10a3f2f8'
+down_revision: Union[str, None] = '6e26fa2b425a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('idx_task_tags', 'tasks', ['tags'], unique=False, postgresql_using='gin', postgresql_concurrently=True)
+        op.create_index('idx_task_project_due_date', 'tasks', ['project_id', 'due_date'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_task_project_due_date', table_name='tasks', postgresql_concurrently=True)
+        op.drop_index('idx_task_tags', table_name='tasks', postgresql_concurrently=True)
@@ -0,0 +1,47 @@
+"""add saved views
+
+Revision ID: ffc27edded62
+Revises: 622f10a3f2f8
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ffc27edded62'
+down_revision: Union[str, None] = '622f10a3f2f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('saved_views',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('project_id', sa.UUID(), nullable=False),
+    sa.Column('owner_id', sa.UUID(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('filter', sa.Text(), nullable=True),
+    sa.Column('is_shared', sa.Boolean(), nullable=True),
+    sa.Column('page_size', sa.Integer(), nullable=False),
+    sa.Column('cached_count', sa.Integer(), nullable=True),
+    sa.Column('cached_task_ids', postgresql.ARRAY(sa.UUID()), nullable=True),
+    sa.Column('cached_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_saved_view_project_cached', 'saved_views', ['project_id', 'cached_at'], unique=False)
+    op.create_index(op.f('ix_saved_views_owner_id'), 'saved_views', ['owner_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_saved_views_owner_id'), table_name='saved_views')
+    op.drop_index('idx_saved_view_project_cached', table_name='saved_views')
+    op.drop_table('saved_views')
@@ -0,0 +1,51 @@
+"""add project status counts
+
+Revision ID: 5d4e1e118453
+Revises: ffc27edded62
+Create Date: 2026-10-18 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d4e1e118453'
+down_revision: Union[str, None] = 'ffc27edded62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('project_status_counts',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('project_id', sa.UUID(), nullable=False),
+    sa.Column('sprint_id', sa.UUID(), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['sprint_id'], ['sprints.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'uq_project_status_count', 'project_status_counts', ['project_id', 'sprint_id', 'status'],
+        unique=True, postgresql_nulls_not_distinct=True
+    )
+    op.create_index('idx_project_status_count_sprint', 'project_status_counts', ['sprint_id'], unique=False)
+    op.execute(
+        """
+        INSERT INTO project_status_counts (id, project_id, sprint_id, status, count)
+        SELECT gen_random_uuid(), project_id, sprint_id, status, count(*)
+        FROM tasks
+        WHERE status IS NOT NULL
+        GROUP BY project_id, sprint_id, status
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_project_status_count_sprint', table_name='project_status_counts')
+    op.drop_index('uq_project_status_count', table_name='project_status_counts')
+    op.drop_table('project_status_counts')
@@ -0,0 +1,26 @@
+"""add sprint stats version
+
+Revision ID: b41ece01d12d
+Revises: 5d4e1e118453
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41ece01d12d'
+down_revision: Union[str, None] = '5d4e1e118453'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('sprints', sa.Column('stats_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('sprints', 'stats_version')
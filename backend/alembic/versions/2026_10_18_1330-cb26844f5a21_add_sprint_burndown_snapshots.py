@@ -0,0 +1,36 @@
+"""add sprint burndown snapshots
+
+Revision ID: cb26844f5a21
+Revises: b41ece01d12d
+Create Date: 2026-10-18 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cb26844f5a21'
+down_revision: Union[str, None] = 'b41ece01d12d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('sprint_burndown_snapshots',
+    sa.Column('sprint_id', sa.UUID(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('total_tasks', sa.Integer(), nullable=False),
+    sa.Column('remaining_tasks', sa.Integer(), nullable=False),
+    sa.Column('total_points', sa.Integer(), nullable=False),
+    sa.Column('remaining_points', sa.Integer(), nullable=False),
+    sa.Column('recorded_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['sprint_id'], ['sprints.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('sprint_id', 'day')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('sprint_burndown_snapshots')
@@ -0,0 +1,44 @@
+"""add task status transitions
+
+Revision ID: 27077abfd477
+Revises: cb26844f5a21
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '27077abfd477'
+down_revision: Union[str, None] = 'cb26844f5a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filled for existing tasks by backfill_status_transitions.py
+    op.create_table('task_status_transitions',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('task_id', sa.UUID(), nullable=False),
+    sa.Column('project_id', sa.UUID(), nullable=False),
+    sa.Column('from_status', sa.String(length=50), nullable=True),
+    sa.Column('to_status', sa.String(length=50), nullable=False),
+    sa.Column('transitioned_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'idx_task_status_transition_cfd', 'task_status_transitions', ['project_id', 'transitioned_at'],
+        unique=False, postgresql_include=['from_status', 'to_status']
+    )
+    op.create_index(op.f('ix_task_status_transitions_task_id'), 'task_status_transitions', ['task_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_task_status_transitions_task_id'), table_name='task_status_transitions')
+    op.drop_index('idx_task_status_transition_cfd', table_name='task_status_transitions')
+    op.drop_table('task_status_transitions')
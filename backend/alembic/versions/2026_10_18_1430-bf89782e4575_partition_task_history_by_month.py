@@ -0,0 +1,95 @@
+"""partition task_history by month
+
+Revision ID: bf89782e4575
+Revises: 27077abfd477
+Create Date: 2026-10-18 14:30:00.000000
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bf89782e4575'
+down_revision: Union[str, None] = '27077abfd477'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Kept in line with app.services.history_partitions, which maintains them afterwards
+MONTHS_AHEAD = 3
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _history_table(name: str, *, partitioned: bool) -> None:
+    op.create_table(name,
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('task_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.Column('action', sa.String(length=50), nullable=False),
+    sa.Column('field_name', sa.String(length=100), nullable=True),
+    sa.Column('old_value', sa.Text(), nullable=True),
+    sa.Column('new_value', sa.Text(), nullable=True),
+    sa.Column('extra_metadata', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=not partitioned),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint(*(['id', 'created_at'] if partitioned else ['id']), name=f'{name}_pkey'),
+    **({'postgresql_partition_by': 'RANGE (created_at)'} if partitioned else {})
+    )
+
+
+def upgrade() -> None:
+    op.rename_table('task_history', 'task_history_unpartitioned')
+    op.execute('ALTER INDEX task_history_pkey RENAME TO task_history_unpartitioned_pkey')
+    op.drop_index('ix_task_history_task_id', table_name='task_history_unpartitioned')
+    op.drop_index('ix_task_history_created_at', table_name='task_history_unpartitioned')
+
+    _history_table('task_history', partitioned=True)
+    op.create_index(op.f('ix_task_history_created_at'), 'task_history', ['created_at'], unique=False)
+    op.create_index('idx_task_history_task_created', 'task_history', ['task_id', 'created_at'], unique=False)
+
+    # One partition per month from the oldest row to a few months ahead; the
+    # default partition only catches rows outside them
+    oldest = op.get_bind().scalar(sa.text('SELECT min(created_at) FROM task_history_unpartitioned'))
+    current = datetime.now(timezone.utc).date().replace(day=1)
+    month = min(oldest.date().replace(day=1), current) if oldest else current
+    while month <= _add_months(current, MONTHS_AHEAD):
+        following = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE task_history_y{month.year}m{month.month:02d} PARTITION OF task_history "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+        )
+        month = following
+    op.execute('CREATE TABLE task_history_default PARTITION OF task_history DEFAULT')
+
+    op.execute(
+        'INSERT INTO task_history '
+        '(id, task_id, user_id, action, field_name, old_value, new_value, extra_metadata, created_at) '
+        'SELECT id, task_id, user_id, action, field_name, old_value, new_value, extra_metadata, '
+        'coalesce(created_at, now()) FROM task_history_unpartitioned'
+    )
+    op.drop_table('task_history_unpartitioned')
+
+
+def downgrade() -> None:
+    # Archived (dropped) partitions are not restored
+    _history_table('task_history_unpartitioned', partitioned=False)
+    op.execute(
+        'INSERT INTO task_history_unpartitioned '
+        '(id, task_id, user_id, action, field_name, old_value, new_value, extra_metadata, created_at) '
+        'SELECT id, task_id, user_id, action, field_name, old_value, new_value, extra_metadata, created_at '
+        'FROM task_history'
+    )
+    op.drop_table('task_history')
+    op.rename_table('task_history_unpartitioned', 'task_history')
+    op.execute('ALTER INDEX task_history_unpartitioned_pkey RENAME TO task_history_pkey')
+    op.create_index(op.f('ix_task_history_created_at'), 'task_history', ['created_at'], unique=False)
+    op.create_index(op.f('ix_task_history_task_id'), 'task_history', ['task_id'], unique=False)
@@ -0,0 +1,35 @@
+"""index project purge foreign keys
+
+Revision ID: 4ac2122e2992
+Revises: 0d66f3e245a0
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4ac2122e2992'
+down_revision: Union[str, None] = '0d66f3e245a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Foreign keys without an index made every cascaded delete scan the referencing table
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_attachments_task_id'), 'attachments', ['task_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_task_dependencies_depends_on_task_id'), 'task_dependencies', ['depends_on_task_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_sprints_project_id'), 'sprints', ['project_id'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_project_deleted', 'projects', ['id'], unique=False, postgresql_where=sa.text('deleted_at IS NOT NULL'), postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_project_deleted', table_name='projects', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_sprints_project_id'), table_name='sprints', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_task_dependencies_depends_on_task_id'), table_name='task_dependencies', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_attachments_task_id'), table_name='attachments', postgresql_concurrently=True)
@@ -0,0 +1,26 @@
+"""add job heartbeat
+
+Revision ID: 7c1e5b9d2f48
+Revises: 4ac2122e2992
+Create Date: 2026-10-18 16:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e5b9d2f48'
+down_revision: Union[str, None] = '4ac2122e2992'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('jobs', 'heartbeat_at')
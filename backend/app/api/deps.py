@@ -1,5 +1,5 @@
-from typing import AsyncGenerator
-from fastapi import Depends, HTTPException, status
+from typing import AsyncGenerator, Optional
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -7,6 +7,8 @@ from app.db.session import AsyncSessionLocal
 from app.core.security import decode_token
 from app.crud.user import user as crud_user
 from app.models.user import User
+from app.services.principal_cache import Principal, principal_cache
+from app.services.auth_context import AuthContext, bind_auth_context
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
@@ -28,7 +30,17 @@ async def get_current_user(
     db: AsyncSession = Depends(get_db),
     token: str = Depends(oauth2_scheme)
 ) -> User:
-    """Get current authenticated user"""
+    """Get current authenticated user.
+
+    Returns a detached `User` carrying only `id`, `is_active` and
+    `is_superuser`; principals are cached by the token `sub` claim so most
+    requests skip the users table. Load the full row when other fields are needed.
+    """
+    return await authenticate_token(db, token)
+
+
+async def authenticate_token(db: AsyncSession, token: str) -> User:
+    """Resolve an access token to its user (see `get_current_user`)."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -43,14 +55,35 @@ async def get_current_user(
     except Exception:
         raise credentials_exception
 
-    user = await crud_user.get(db, id=user_id)
-    if user is None:
-        raise credentials_exception
+    principal = await principal_cache.get(user_id)
+    if principal is None:
+        user = await crud_user.get(db, id=user_id)
+        if user is None:
+            raise credentials_exception
+
+        principal = Principal(
+            id=user.id,
+            is_active=bool(user.is_active),
+            is_superuser=bool(user.is_superuser),
+        )
+        await principal_cache.set(user_id, principal)
 
-    if not user.is_active:
+    if not principal.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
 
-    return user
+    return User(
+        id=principal.id,
+        is_active=principal.is_active,
+        is_superuser=principal.is_superuser,
+    )
+
+
+async def get_auth_context(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> AuthContext:
+    """Get request-scoped authorization context bound to the request's session"""
+    return bind_auth_context(db, current_user.id)
 
 
 async def get_current_active_superuser(
@@ -62,3 +95,8 @@ async def get_current_active_superuser(
             status_code=403, detail="The user doesn't have enough privileges"
         )
     return current_user
+
+
+def prefers_async(prefer: Optional[str] = Header(None)) -> bool:
+    """Whether the client asked for a 202 job instead of waiting (`Prefer: respond-async`)"""
+    return prefer is not None and "respond-async" in prefer.lower()
@@ -1,14 +1,23 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.api.v1.endpoints import auth, tasks, projects, comments, organizations, workflows, permission_schemes, sprints
+from app.api.deps import get_auth_context
+from app.api.v1.endpoints import auth, board, tasks, projects, comments, organizations, workflows, permission_schemes, sprints, saved_views, outbox, jobs
 
 api_router = APIRouter()
 
+# Authorization lookups are memoized per request for all authenticated routers
+authorized = [Depends(get_auth_context)]
+
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
-api_router.include_router(tasks.router, prefix="/tasks", tags=["tasks"])
-api_router.include_router(projects.router, prefix="/projects", tags=["projects"])
-api_router.include_router(comments.router, prefix="/comments", tags=["comments"])
-api_router.include_router(organizations.router, prefix="/organizations", tags=["organizations"])
-api_router.include_router(workflows.router, tags=["workflows"])
-api_router.include_router(permission_schemes.router, tags=["permission-schemes"])
-api_router.include_router(sprints.router, tags=["sprints"])
+api_router.include_router(tasks.router, prefix="/tasks", tags=["tasks"], dependencies=authorized)
+api_router.include_router(projects.router, prefix="/projects", tags=["projects"], dependencies=authorized)
+# WebSockets authenticate with a token query parameter instead
+api_router.include_router(board.router, prefix="/projects", tags=["board"])
+api_router.include_router(comments.router, prefix="/comments", tags=["comments"], dependencies=authorized)
+api_router.include_router(organizations.router, prefix="/organizations", tags=["organizations"], dependencies=authorized)
+api_router.include_router(workflows.router, tags=["workflows"], dependencies=authorized)
+api_router.include_router(permission_schemes.router, tags=["permission-schemes"], dependencies=authorized)
+api_router.include_router(sprints.router, tags=["sprints"], dependencies=authorized)
+api_router.include_router(saved_views.router, tags=["saved-views"], dependencies=authorized)
+api_router.include_router(outbox.router, prefix="/outbox", tags=["outbox"], dependencies=authorized)
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"], dependencies=authorized)
@@ -77,10 +77,14 @@ async def login(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get current user info"""
-    return current_user
+    user = await crud_user.get(db, id=current_user.id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
 
 
 class RefreshTokenRequest(BaseModel):
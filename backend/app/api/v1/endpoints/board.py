@@ -0,0 +1,131 @@
+import asyncio
+import json
+import time
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from jose import JWTError, jwt
+
+from app.api.deps import authenticate_token
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.services.access import ensure_project_access
+from app.services.board_events import board_hub
+
+router = APIRouter()
+
+# Browsers cannot set headers on WebSockets; the access token is offered as
+# the second subprotocol instead of a query parameter, which would be logged
+TOKEN_SUBPROTOCOL = "bearer"
+
+
+def _subprotocol_token(subprotocols: List[str]) -> Optional[str]:
+    if len(subprotocols) == 2 and subprotocols[0] == TOKEN_SUBPROTOCOL:
+        return subprotocols[1]
+    return None
+
+
+def _token_expiry(token: str) -> Optional[float]:
+    # Already verified by authenticate_token
+    try:
+        return jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        return None
+
+
+async def _authorized(project_id: UUID, token: str) -> bool:
+    # The session is only held for the check, not for the connection
+    async with AsyncSessionLocal() as db:
+        try:
+            user = await authenticate_token(db, token)
+            await ensure_project_access(db, project_id=project_id, user_id=user.id)
+        except HTTPException:
+            return False
+    return True
+
+
+@router.websocket("/{project_id}/events")
+async def project_events(
+    websocket: WebSocket,
+    project_id: UUID,
+    since: Optional[int] = Query(None, ge=0, description="Last sequence number received")
+):
+    """Stream task events of a project board.
+
+    Connect offering the subprotocols `bearer, <access token>`. Sends
+    `{"type": "board.ready", "seq": n}` once caught up, then every event as
+    JSON with its `seq`. Reconnect with `since` set to the last `seq` seen to
+    receive missed events; `{"type": "board.reload"}` means they are gone and
+    the board must be fetched again. Closes with 1013 when events are
+    disabled, in which case boards fall back to polling, and with 1008 once
+    the token expires or project access is lost.
+    """
+    token = _subprotocol_token(websocket.scope.get("subprotocols", []))
+    if token is None or not await _authorized(project_id, token):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    if not board_hub.enabled:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+    expires_at = _token_expiry(token)
+
+    def next_check() -> float:
+        check_at = time.time() + settings.BOARD_SOCKET_RECHECK_SECONDS
+        return min(check_at, expires_at) if expires_at else check_at
+
+    await websocket.accept(subprotocol=TOKEN_SUBPROTOCOL)
+    # Subscribed before reading the history so nothing falls in between
+    queue = board_hub.subscribe(project_id)
+    receiver = asyncio.create_task(_drain(websocket))
+    try:
+        latest, missed = await board_hub.replay(project_id, since)
+        if missed is None:
+            await _send_reload(websocket, latest)
+            return
+        for event in missed:
+            await websocket.send_text(event)
+        await websocket.send_text(json.dumps({"type": "board.ready", "seq": latest}))
+
+        check_at = next_check()
+        while not receiver.done():
+            getter = asyncio.create_task(queue.get())
+            await asyncio.wait(
+                {getter, receiver}, timeout=max(check_at - time.time(), 0), return_when=asyncio.FIRST_COMPLETED
+            )
+            if not getter.done():
+                getter.cancel()
+                if receiver.done():
+                    break
+                expired = expires_at is not None and time.time() >= expires_at
+                if expired or not await _authorized(project_id, token):
+                    await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+                    return
+                check_at = next_check()
+                continue
+            event = getter.result()
+            if event is None:
+                await _send_reload(websocket, latest)
+                return
+            seq = json.loads(event)["seq"]
+            if seq > latest:  # replayed events may also have been queued
+                latest = seq
+                await websocket.send_text(event)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        board_hub.unsubscribe(project_id, queue)
+        receiver.cancel()
+
+
+async def _drain(websocket: WebSocket) -> None:
+    # Clients only listen; reading notices when they go away
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+async def _send_reload(websocket: WebSocket, latest: int) -> None:
+    await websocket.send_text(json.dumps({"type": "board.reload", "seq": latest}))
+    await websocket.close()
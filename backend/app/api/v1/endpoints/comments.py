@@ -8,8 +8,8 @@ from app.crud.comment import comment as crud_comment
 from app.schemas.comment import CommentCreate, CommentUpdate, CommentResponse
 from app.models.user import User
 from app.models.task import Task
-from app.services.access import ensure_task_access
-from app.services.permissions import require_project_permission
+from app.services.access import ensure_task_access, get_task_or_404
+from app.services.permissions import require_project_permission, resolve_project_access
 
 router = APIRouter()
 
@@ -37,7 +37,7 @@ async def create_comment(
     current_user: User = Depends(get_current_user)
 ):
     """Create new comment"""
-    task = await ensure_task_access(db, task_id=comment_in.task_id, user_id=current_user.id)
+    task = await get_task_or_404(db, task_id=comment_in.task_id)
     
     await require_project_permission(
         db,
@@ -45,12 +45,9 @@ async def create_comment(
         user_id=current_user.id,
         permission_key="COMMENT"
     )
-    comment_data = comment_in.model_dump()
-    comment_data["user_id"] = current_user.id
-
-    from app.models.comment import Comment
-    comment = Comment(**comment_data)
-    db.add(comment)
+    comment = await crud_comment.create_for_user(
+        db, obj_in=comment_in, user_id=current_user.id, project_id=task.project_id
+    )
     await db.commit()
     await db.refresh(comment)
     return comment
@@ -68,13 +65,14 @@ async def update_comment(
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
 
-    await ensure_task_access(db, task_id=comment.task_id, user_id=current_user.id)
+    task = await ensure_task_access(db, task_id=comment.task_id, user_id=current_user.id)
 
     if comment.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
-    comment.content = comment_in.content
-    comment.edited = True
+    comment = await crud_comment.update_content(
+        db, db_obj=comment, content=comment_in.content, project_id=task.project_id
+    )
     await db.commit()
     await db.refresh(comment)
     return comment
@@ -91,17 +89,15 @@ async def delete_comment(
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
 
-    task = await ensure_task_access(db, task_id=comment.task_id, user_id=current_user.id)
+    task = await get_task_or_404(db, task_id=comment.task_id)
+    access = await resolve_project_access(db, project_id=task.project_id, user_id=current_user.id)
 
     # User can delete own comment, or if has DELETE_COMMENT permission
     if comment.user_id != current_user.id:
-        await require_project_permission(
-            db,
-            project_id=task.project_id,
-            user_id=current_user.id,
-            permission_key="DELETE_COMMENT"
-        )
-
-    await crud_comment.delete(db, id=comment_id)
+        access.require("DELETE_COMMENT")
+    else:
+        access.ensure_access()
+
+    await crud_comment.delete(db, id=comment_id, actor_id=current_user.id, project_id=task.project_id)
     await db.commit()
     return None
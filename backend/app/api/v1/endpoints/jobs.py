@@ -0,0 +1,90 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+
+from app.api.deps import get_db, get_current_user
+from app.core.config import settings
+from app.models.job import Job
+from app.models.user import User
+from app.schemas.job import JobResponse
+from app.services.jobs import job_file, set_job_paused
+from app.worker import enqueue
+
+router = APIRouter()
+
+
+async def accept_job(db: AsyncSession, job: Job, created: bool) -> JSONResponse:
+    """Commit and start a new job, or again one that never started (its task
+    may not have reached the broker); 202 response pointing at its status"""
+    await db.commit()
+    if created or (job.status == "queued" and job.started_at is None):
+        enqueue(job)
+    return JSONResponse(
+        status_code=202,
+        content=jsonable_encoder(JobResponse.model_validate(job)),
+        headers={"Location": f"{settings.API_V1_STR}/jobs/{job.id}"},
+    )
+
+
+async def get_own_job(db: AsyncSession, job_id: UUID, user: User) -> Job:
+    """Jobs are visible to whoever started them and to superusers"""
+    job = await db.get(Job, job_id)
+    if job is None or (job.created_by != user.id and not user.is_superuser):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get job status and progress"""
+    return await get_own_job(db, job_id, current_user)
+
+
+@router.post("/{job_id}/pause", response_model=JobResponse)
+async def pause_job(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Pause a project purge; a running purge stops after its current chunk"""
+    job = await get_own_job(db, job_id, current_user)
+    if not await set_job_paused(db, job, True):
+        raise HTTPException(status_code=409, detail="Job cannot be paused")
+    await db.commit()
+    return job
+
+
+@router.post("/{job_id}/resume", status_code=202, response_model=JobResponse)
+async def resume_job(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Resume a paused job, or retry a failed project purge, where it stopped"""
+    job = await get_own_job(db, job_id, current_user)
+    if not await set_job_paused(db, job, False):
+        raise HTTPException(status_code=409, detail="Job is not paused or failed")
+    # A run that has not noticed the pause yet simply goes on
+    return await accept_job(db, job, job.status == "queued")
+
+
+@router.get("/{job_id}/download")
+async def download_job_result(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Download the file produced by an export job"""
+    job = await get_own_job(db, job_id, current_user)
+    if job.status != "succeeded" or not (job.result or {}).get("file"):
+        raise HTTPException(status_code=409, detail="Job has no file to download")
+    path = job_file(job.id, job.result["file"].split(".", 1)[1])
+    if not path.exists():
+        raise HTTPException(status_code=410, detail="Export file is no longer available")
+    return FileResponse(path, filename=job.result["filename"])
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_active_superuser, get_db
+from app.models.user import User
+from app.schemas.outbox import OutboxMetrics
+from app.services.outbox import get_backlog, relay_metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_model=OutboxMetrics)
+async def get_outbox_metrics(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_superuser)
+):
+    """Outbox backlog and relay throughput (lag: event age when published)"""
+    pending, oldest_age = await get_backlog(db)
+    return OutboxMetrics(
+        pending_events=pending,
+        oldest_pending_age_seconds=oldest_age,
+        published_events=relay_metrics.published,
+        published_batches=relay_metrics.batches,
+        throughput_per_second=relay_metrics.throughput(),
+        last_lag_seconds=relay_metrics.last_lag_seconds,
+        max_lag_seconds=relay_metrics.max_lag_seconds,
+    )
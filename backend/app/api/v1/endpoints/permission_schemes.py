@@ -15,6 +15,7 @@ from app.schemas.permission_scheme import (
 )
 from app.models.user import User
 from app.services.access import ensure_org_member
+from app.services.permission_cache import permission_scheme_cache
 
 router = APIRouter()
 
@@ -87,7 +88,9 @@ async def add_rule(
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
     rule = await crud_permission_scheme.add_rule(db, scheme=scheme, rule_in=rule_in)
+    version = await crud_permission_scheme.bump_version(db, scheme_id=scheme.id)
     await db.commit()
+    await permission_scheme_cache.publish_invalidation(scheme.id, version)
     await db.refresh(rule)
     return rule
 
@@ -113,7 +116,9 @@ async def update_rule(
         raise HTTPException(status_code=404, detail="Rule not found")
 
     updated = await crud_permission_scheme.update_rule(db, rule=rule, rule_in=rule_in)
+    version = await crud_permission_scheme.bump_version(db, scheme_id=scheme.id)
     await db.commit()
+    await permission_scheme_cache.publish_invalidation(scheme.id, version)
     await db.refresh(updated)
     return updated
 
@@ -134,5 +139,7 @@ async def delete_rule(
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
     await crud_permission_scheme.delete_rule(db, rule_id=rule_id)
+    version = await crud_permission_scheme.bump_version(db, scheme_id=scheme.id)
     await db.commit()
+    await permission_scheme_cache.publish_invalidation(scheme.id, version)
     return None
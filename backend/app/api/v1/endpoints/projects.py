@@ -1,16 +1,30 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID
+from datetime import date, datetime, timedelta, timezone
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_current_user, prefers_async
+from app.api.v1.endpoints.jobs import accept_job
+from app.core.config import settings
+from app.core.pagination import decode_cursor
+from app.db.session import AsyncSessionLocal
 from sqlalchemy import select
 
 from app.crud.project import project as crud_project
-from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse
+from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectStatusCounts
+from app.schemas.job import JobResponse
+from app.schemas.analytics import CumulativeFlow, CumulativeFlowDay, ProjectAnalytics
 from app.models.user import User
 from app.services.access import ensure_project_access, ensure_org_member
+from app.services.analytics import get_project_analytics
+from app.services.jobs import create_job
+from app.services.outbox import record_event
 from app.services.permissions import require_project_permission
+from app.services.status_transitions import get_cumulative_flow
+from app.services.status_counts import get_project_counts
+from app.services.task_export import EXPORT_INCLUDES, encode_export, iter_task_records
 from app.models.workflow import Workflow, WorkflowStatus
 from app.models.permission import PermissionScheme
 from app.schemas.workflow import WorkflowResponse
@@ -123,13 +137,12 @@ async def update_project(
     current_user: User = Depends(get_current_user)
 ):
     """Update project"""
-    await require_project_permission(
+    project = await require_project_permission(
         db,
         project_id=project_id,
         user_id=current_user.id,
         permission_key="ADMINISTER_PROJECT"
     )
-    project = await ensure_project_access(db, project_id=project_id, user_id=current_user.id)
 
     project = await crud_project.update(db, db_obj=project, obj_in=project_in)
     await db.commit()
@@ -137,24 +150,140 @@ async def update_project(
     return project
 
 
-@router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{project_id}", status_code=status.HTTP_202_ACCEPTED, response_model=JobResponse)
 async def delete_project(
     project_id: UUID,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Delete project"""
-    await require_project_permission(
+    """Delete project: hidden at once, its rows purged by the returned job"""
+    project = await require_project_permission(
         db,
         project_id=project_id,
         user_id=current_user.id,
         permission_key="ADMINISTER_PROJECT"
     )
+
+    project.deleted_at = datetime.now(timezone.utc)
+    db.add(project)
+    await record_event(db, "project", project_id, "project.deleted", project_id=project_id, actor_id=current_user.id)
+    job, created = await create_job(
+        db, "project.delete", user_id=current_user.id, project_id=project_id, idempotency_key=str(project_id)
+    )
+    return await accept_job(db, job, created)
+
+
+@router.get("/{project_id}/status-counts", response_model=ProjectStatusCounts)
+async def get_project_status_counts(
+    project_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get task counts per status for the backlog and each sprint (board headers)"""
     await ensure_project_access(db, project_id=project_id, user_id=current_user.id)
+    counts = await get_project_counts(db, project_id=project_id)
 
-    await crud_project.delete(db, id=project_id)
-    await db.commit()
-    return None
+    totals = {}
+    for row in counts:
+        totals[row.status] = totals.get(row.status, 0) + row.count
+    return ProjectStatusCounts(project_id=project_id, totals=totals, counts=counts)
+
+
+@router.get("/{project_id}/analytics", response_model=ProjectAnalytics)
+async def get_analytics(
+    project_id: UUID,
+    sprints: int = Query(6, ge=1, le=26, description="Number of last completed sprints to cover"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get velocity, throughput and cycle-time percentiles per project and assignee.
+
+    Results only change when a sprint is completed.
+    """
+    await ensure_project_access(db, project_id=project_id, user_id=current_user.id)
+    return await get_project_analytics(db, project_id=project_id, window=sprints)
+
+
+@router.get("/{project_id}/cfd", response_model=CumulativeFlow)
+async def get_project_cumulative_flow(
+    project_id: UUID,
+    start: Optional[date] = Query(None, description="First day (UTC); defaults to 29 days before end"),
+    end: Optional[date] = Query(None, description="Last day (UTC); defaults to today"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get cumulative flow diagram data: tasks per status at the end of each day"""
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=29)
+    if start > end or (end - start).days >= settings.CFD_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range must be 1 to {settings.CFD_MAX_DAYS} days")
+
+    await ensure_project_access(db, project_id=project_id, user_id=current_user.id)
+    series = await get_cumulative_flow(db, project_id=project_id, start=start, end=end)
+    return CumulativeFlow(
+        project_id=project_id,
+        days=[CumulativeFlowDay(day=day, counts=counts) for day, counts in series]
+    )
+
+
+@router.get("/{project_id}/export", responses={202: {"model": JobResponse}})
+async def export_project_tasks(
+    project_id: UUID,
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    include: List[str] = Query([], description="Related records to embed: history, comments"),
+    gzip: bool = Query(False, description="Compress the stream (.gz download)"),
+    cursor: Optional[str] = Query(None, description="`cursor` of the last task received; resumes after it"),
+    respond_async: bool = Depends(prefers_async),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream all project tasks as NDJSON or CSV in constant memory.
+
+    Tasks come oldest first from a server-side cursor within one snapshot.
+    Each task record has a `cursor` field for resuming an interrupted export.
+    With `Prefer: respond-async` the export is written by a background job
+    instead, downloadable from `/jobs/{id}/download` once it succeeded.
+    """
+    project = await require_project_permission(
+        db,
+        project_id=project_id,
+        user_id=current_user.id,
+        permission_key="VIEW_ISSUES"
+    )
+    unknown = set(include) - set(EXPORT_INCLUDES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include: {', '.join(sorted(unknown))}")
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    if respond_async:
+        job, created = await create_job(
+            db, "project.export", user_id=current_user.id, project_id=project_id,
+            params={"format": export_format, "include": include, "gzip": gzip, "cursor": cursor},
+        )
+        return await accept_job(db, job, created)
+
+    async def records():
+        async with AsyncSessionLocal() as session:
+            # One snapshot for the task cursor and the related-record queries
+            await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            async for record in iter_task_records(session, project=project, include=include, after=after):
+                yield record
+
+    filename = f"{project.key}-tasks.{export_format}"
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        encode_export(records(), export_format=export_format, include=include, compress=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/{project_id}/workflow", response_model=WorkflowResponse)
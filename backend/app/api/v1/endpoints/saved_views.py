@@ -0,0 +1,100 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from uuid import UUID
+
+from app.api.deps import get_db, get_current_user
+from app.core.pagination import encode_cursor
+from app.crud.saved_view import saved_view as crud_saved_view
+from app.schemas.saved_view import SavedViewCreate, SavedViewUpdate, SavedViewResponse, SavedViewResults
+from app.models.saved_view import SavedView
+from app.models.user import User
+from app.services.access import ensure_project_access
+from app.services.saved_views import get_view_results
+
+router = APIRouter()
+
+
+async def get_view_or_404(db: AsyncSession, *, view_id: UUID, user_id: UUID, owner_only: bool = False) -> SavedView:
+    """Load view visible to user (own or shared in an accessible project)"""
+    view = await crud_saved_view.get(db, id=view_id)
+    if not view or (view.owner_id != user_id and (owner_only or not view.is_shared)):
+        raise HTTPException(status_code=404, detail="Saved view not found")
+    await ensure_project_access(db, project_id=view.project_id, user_id=user_id)
+    return view
+
+
+@router.get("/projects/{project_id}/views", response_model=List[SavedViewResponse])
+async def get_saved_views(
+    project_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get own and shared saved views of project"""
+    await ensure_project_access(db, project_id=project_id, user_id=current_user.id)
+    return await crud_saved_view.get_for_project(db, project_id=project_id, user_id=current_user.id)
+
+
+@router.post("/projects/{project_id}/views", response_model=SavedViewResponse, status_code=status.HTTP_201_CREATED)
+async def create_saved_view(
+    project_id: UUID,
+    view_in: SavedViewCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Create saved view (`me` in its filter refers to the owner)"""
+    await ensure_project_access(db, project_id=project_id, user_id=current_user.id)
+    view = SavedView(**view_in.model_dump(), project_id=project_id, owner_id=current_user.id)
+    db.add(view)
+    await db.commit()
+    await db.refresh(view)
+    return view
+
+
+@router.get("/views/{view_id}", response_model=SavedViewResults)
+async def get_saved_view_results(
+    view_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get view with its result count and first page (served from precomputed results)"""
+    view = await get_view_or_404(db, view_id=view_id, user_id=current_user.id)
+    total, tasks = await get_view_results(db, view=view)
+    await db.commit()
+
+    next_cursor = None
+    if len(tasks) == view.page_size:
+        next_cursor = encode_cursor(tasks[-1].created_at, tasks[-1].id)
+    return SavedViewResults(view=view, total=total, tasks=tasks, next_cursor=next_cursor)
+
+
+@router.patch("/views/{view_id}", response_model=SavedViewResponse)
+async def update_saved_view(
+    view_id: UUID,
+    view_in: SavedViewUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Update own saved view"""
+    view = await get_view_or_404(db, view_id=view_id, user_id=current_user.id, owner_only=True)
+    update_data = view_in.model_dump(exclude_unset=True)
+    if "filter" in update_data or "page_size" in update_data:
+        update_data.update(cached_count=None, cached_task_ids=None, cached_at=None)
+
+    view = await crud_saved_view.update(db, db_obj=view, obj_in=update_data)
+    await db.commit()
+    await db.refresh(view)
+    return view
+
+
+@router.delete("/views/{view_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_saved_view(
+    view_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Delete own saved view"""
+    await get_view_or_404(db, view_id=view_id, user_id=current_user.id, owner_only=True)
+    await crud_saved_view.delete(db, id=view_id)
+    await db.commit()
+    return None
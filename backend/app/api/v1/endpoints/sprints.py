@@ -4,12 +4,17 @@ from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_current_user, prefers_async
+from app.api.v1.endpoints.jobs import accept_job
 from app.crud.sprint import sprint as crud_sprint
-from app.schemas.sprint import SprintCreate, SprintUpdate, SprintResponse, SprintWithTasks
+from app.schemas.job import JobResponse
+from app.schemas.sprint import SprintCreate, SprintUpdate, SprintResponse, SprintWithTasks, SprintBurndown
 from app.models.user import User
 from app.services.access import ensure_project_access
+from app.services.jobs import create_job
 from app.services.permissions import require_project_permission
+from app.services.sprint_stats import get_sprint_stats, get_sprints_stats
+from app.services.status_counts import move_sprint_to_backlog
 
 router = APIRouter()
 
@@ -35,6 +40,28 @@ async def get_sprints(
     return sprints
 
 
+@router.get("/projects/{project_id}/sprints/stats", response_model=List[SprintWithTasks])
+async def get_sprints_with_stats(
+    project_id: UUID,
+    status: Optional[str] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get sprints for project with statistics (one aggregate query for all of them)"""
+    await ensure_project_access(db, project_id=project_id, user_id=current_user.id)
+    sprints = await crud_sprint.get_by_project(
+        db,
+        project_id=project_id,
+        status=status,
+        skip=skip,
+        limit=limit
+    )
+    stats = await get_sprints_stats(db, sprints=sprints)
+    return [SprintWithTasks(**sprint.__dict__, **stats[sprint.id]) for sprint in sprints]
+
+
 @router.get("/projects/{project_id}/sprints/active", response_model=SprintResponse)
 async def get_active_sprint(
     project_id: UUID,
@@ -67,7 +94,7 @@ async def create_sprint(
     if sprint_in.project_id != project_id:
         raise HTTPException(status_code=400, detail="Project ID mismatch")
 
-    sprint = await crud_sprint.create(db, obj_in=sprint_in)
+    sprint = await crud_sprint.create(db, obj_in=sprint_in, actor_id=current_user.id)
     await db.commit()
     await db.refresh(sprint)
     return sprint
@@ -86,13 +113,35 @@ async def get_sprint(
 
     await ensure_project_access(db, project_id=sprint.project_id, user_id=current_user.id)
 
-    stats = await crud_sprint.get_stats(db, sprint_id=sprint_id)
+    stats = await get_sprint_stats(db, sprint=sprint)
     return SprintWithTasks(
         **sprint.__dict__,
         **stats
     )
 
 
+@router.get("/sprints/{sprint_id}/burndown", response_model=SprintBurndown)
+async def get_sprint_burndown(
+    sprint_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get daily remaining tasks and story points of a sprint"""
+    sprint = await crud_sprint.get(db, id=sprint_id)
+    if not sprint:
+        raise HTTPException(status_code=404, detail="Sprint not found")
+
+    await ensure_project_access(db, project_id=sprint.project_id, user_id=current_user.id)
+
+    points = await crud_sprint.get_burndown(db, sprint_id=sprint_id)
+    return SprintBurndown(
+        sprint_id=sprint.id,
+        start_date=sprint.start_date,
+        end_date=sprint.end_date,
+        points=points
+    )
+
+
 @router.patch("/sprints/{sprint_id}", response_model=SprintResponse)
 async def update_sprint(
     sprint_id: UUID,
@@ -107,7 +156,7 @@ async def update_sprint(
 
     await ensure_project_access(db, project_id=sprint.project_id, user_id=current_user.id)
 
-    sprint = await crud_sprint.update(db, db_obj=sprint, obj_in=sprint_in)
+    sprint = await crud_sprint.update(db, db_obj=sprint, obj_in=sprint_in, actor_id=current_user.id)
     await db.commit()
     await db.refresh(sprint)
     return sprint
@@ -143,19 +192,20 @@ async def start_sprint(
             detail=f"Another sprint ({active_sprint.name}) is already active"
         )
 
-    sprint = await crud_sprint.start(db, sprint=sprint, start_date=start_date)
+    sprint = await crud_sprint.start(db, sprint=sprint, start_date=start_date, actor_id=current_user.id)
     await db.commit()
     await db.refresh(sprint)
     return sprint
 
 
-@router.post("/sprints/{sprint_id}/complete", response_model=SprintResponse)
+@router.post("/sprints/{sprint_id}/complete", response_model=SprintResponse, responses={202: {"model": JobResponse}})
 async def complete_sprint(
     sprint_id: UUID,
+    respond_async: bool = Depends(prefers_async),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Complete sprint"""
+    """Complete sprint (in a background job with `Prefer: respond-async`)"""
     sprint = await crud_sprint.get(db, id=sprint_id)
     if not sprint:
         raise HTTPException(status_code=404, detail="Sprint not found")
@@ -170,7 +220,14 @@ async def complete_sprint(
     if sprint.status == "completed":
         raise HTTPException(status_code=400, detail="Sprint is already completed")
 
-    sprint = await crud_sprint.complete(db, sprint=sprint)
+    if respond_async:
+        job, created = await create_job(
+            db, "sprint.complete", user_id=current_user.id, project_id=sprint.project_id,
+            idempotency_key=str(sprint.id), params={"sprint_id": str(sprint.id)},
+        )
+        return await accept_job(db, job, created)
+
+    sprint = await crud_sprint.complete(db, sprint=sprint, actor_id=current_user.id)
     await db.commit()
     await db.refresh(sprint)
     return sprint
@@ -197,7 +254,8 @@ async def delete_sprint(
     if sprint.status == "active":
         raise HTTPException(status_code=400, detail="Cannot delete active sprint")
 
-    await crud_sprint.delete(db, id=sprint_id)
+    await move_sprint_to_backlog(db, sprint_id=sprint_id)
+    await crud_sprint.delete(db, id=sprint_id, actor_id=current_user.id)
     await db.commit()
     return None
 
@@ -1,33 +1,84 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
+import json
+import logging
+
+import asyncpg
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_current_user, prefers_async
+from app.api.v1.endpoints.jobs import accept_job
+from app.core.config import settings
+from app.core.pagination import encode_cursor, decode_cursor, encode_rank_cursor, decode_rank_cursor
+from app.db.session import AsyncSessionLocal
 from app.crud.task import task as crud_task
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskStatus
+from app.crud.sprint import sprint as crud_sprint
+from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskStatus, TaskMove, TaskBulkUpdate
 from app.schemas.task_history import TaskHistoryResponse
 from app.schemas.common import PaginatedResponse
+from app.schemas.job import JobResponse
 from app.models.user import User
-from app.models.task import Task, TaskHistory
-from app.services.access import ensure_project_access, ensure_task_access
-from app.services.permissions import require_project_permission
+from app.models.task import TaskHistory
+from app.services.access import ensure_project_access, ensure_task_access, get_task_or_404
+from app.services.board_events import board_hub, publish_task_events
+from app.services.jobs import create_job, job_file
+from app.services.permissions import require_project_permission, resolve_project_access
+from app.services.outbox import record_event
+from app.services.ranking import rank_between, rebalance_ranks
+from app.services.search import search_tasks
+from app.services.task_history import TaskChangeSet
+from app.services.task_filter import FilterError, compile_filter, task_values
+from app.services.saved_views import apply_task_change, invalidate_project_views
+from app.services.sprint_stats import invalidate_sprint_stats
+from app.services.status_counts import count_key, record_task_change
+from app.services.status_transitions import record_transitions
+from app.services.task_import import TaskImportError, import_tasks, parse_rows, read_chunks, spool_body
 from sqlalchemy import select
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 @router.get("", response_model=List[TaskResponse])
 async def get_tasks(
+    response: Response,
     project_id: Optional[UUID] = None,
     status: Optional[TaskStatus] = None,
     assignee_id: Optional[UUID] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page; replaces skip"),
+    filter: Optional[str] = Query(
+        None, max_length=1000, description="Filter expression, e.g. `status in (todo, review) and assignee = me`"
+    ),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get tasks with filters"""
+    """Get tasks with filters.
+
+    Full pages carry an `X-Next-Cursor` header; pass it back as `cursor` to
+    fetch the next page by keyset, which stays fast on deep pages and does not
+    skip or repeat rows when tasks are added concurrently. See
+    `app.services.task_filter` for the `filter` syntax.
+    """
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    filter_clause = None
+    if filter:
+        try:
+            filter_clause = compile_filter(filter).clause(user_id=current_user.id)
+        except FilterError as exc:
+            raise HTTPException(status_code=400, detail=f"Invalid filter: {exc}")
+
     if project_id:
         await ensure_project_access(db, project_id=project_id, user_id=current_user.id)
         tasks = await crud_task.get_by_project(
@@ -35,7 +86,9 @@ async def get_tasks(
             project_id=project_id,
             skip=skip,
             limit=limit,
-            status=status.value if status else None
+            status=status.value if status else None,
+            after=after,
+            filter_clause=filter_clause
         )
     else:
         filters = {}
@@ -49,12 +102,56 @@ async def get_tasks(
             user_id=current_user.id,
             skip=skip,
             limit=limit,
-            filters=filters
+            filters=filters,
+            after=after,
+            filter_clause=filter_clause
         )
 
+    if len(tasks) == limit:
+        last = tasks[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
     return tasks
 
 
+@router.get("/search", response_model=List[TaskResponse])
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Words, \"phrases\", -excluded, or a task key like PROJ-12"),
+    project_id: Optional[UUID] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Search task titles, descriptions and comments, best matches first.
+
+    Full pages carry an `X-Next-Cursor` header for the next page.
+    """
+    after = None
+    if cursor:
+        try:
+            after = decode_rank_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if project_id:
+        await ensure_project_access(db, project_id=project_id, user_id=current_user.id)
+
+    results = await search_tasks(
+        db,
+        q=q,
+        user_id=current_user.id,
+        project_id=project_id,
+        limit=limit,
+        after=after
+    )
+
+    if len(results) == limit:
+        last, rank = results[-1]
+        response.headers["X-Next-Cursor"] = encode_rank_cursor(rank, last.id)
+    return [task for task, _ in results]
+
+
 @router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(
     task_in: TaskCreate,
@@ -75,18 +172,58 @@ async def create_task(
     )
 
     # Add history record
-    await crud_task.add_history(
-        db,
-        task_id=task.id,
-        user_id=current_user.id,
-        action="created"
-    )
+    history = TaskChangeSet(user_id=current_user.id)
+    history.record(task.id, "created")
+    await history.write(db)
+    await record_transitions(db, [(task.id, task.project_id, None, task.status)])
+    await apply_task_change(db, task=task, before=None, after=task_values(task))
 
     await db.commit()
     await db.refresh(task)
+    await publish_task_events("task.created", [task])
     return task
 
 
+@router.post("/bulk", response_model=List[TaskResponse])
+async def bulk_update_tasks(
+    bulk_in: TaskBulkUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Apply one change set to many tasks in a single transaction.
+
+    Permissions are checked once per project; all tasks are updated by one
+    statement and their history written by one multi-row insert.
+    """
+    changes = bulk_in.changes.model_dump(exclude_unset=True)
+    tasks = await crud_task.get_many(db, ids=bulk_in.task_ids)
+    if len(tasks) != len(bulk_in.task_ids):
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    tasks_by_project = {}
+    for task in tasks:
+        tasks_by_project.setdefault(task.project_id, []).append(task)
+
+    new_status = changes.get("status")
+    for project_id, project_tasks in tasks_by_project.items():
+        access = await resolve_project_access(db, project_id=project_id, user_id=current_user.id)
+        if new_status and any(task.status != new_status for task in project_tasks):
+            access.require("TRANSITION_ISSUES")
+        else:
+            access.require("EDIT_ISSUES")
+
+    if changes.get("sprint_id"):
+        sprint = await crud_sprint.get(db, id=changes["sprint_id"])
+        if not sprint or set(tasks_by_project) != {sprint.project_id}:
+            raise HTTPException(status_code=400, detail="Sprint does not belong to the tasks' project")
+
+    updated = await crud_task.bulk_update(db, tasks=tasks, changes=changes, user_id=current_user.id)
+    await invalidate_project_views(db, project_ids=tasks_by_project)
+    await db.commit()
+    await publish_task_events("task.updated", updated)
+    return updated
+
+
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: UUID,
@@ -106,7 +243,7 @@ async def update_task(
     current_user: User = Depends(get_current_user)
 ):
     """Update task"""
-    task = await ensure_task_access(db, task_id=task_id, user_id=current_user.id)
+    task = await get_task_or_404(db, task_id=task_id)
     
     # Check permission for status transitions
     if task_in.status and task_in.status != task.status:
@@ -124,24 +261,19 @@ async def update_task(
             permission_key="EDIT_ISSUES"
         )
 
-    # Record changes in history
-    update_data = task_in.model_dump(exclude_unset=True)
-    for field, new_value in update_data.items():
-        old_value = getattr(task, field, None)
-        if old_value != new_value:
-            await crud_task.add_history(
-                db,
-                task_id=task.id,
-                user_id=current_user.id,
-                action="updated",
-                field_name=field,
-                old_value=str(old_value) if old_value else None,
-                new_value=str(new_value) if new_value else None
-            )
-
-    task = await crud_task.update(db, db_obj=task, obj_in=task_in)
+    before = task_values(task)
+
+    # Diff before the update; all changed fields are written by one insert
+    history = TaskChangeSet(user_id=current_user.id)
+    history.diff(task, task_in.model_dump(exclude_unset=True))
+
+    task = await crud_task.update(db, db_obj=task, obj_in=task_in, actor_id=current_user.id)
+    await history.write(db)
+    await record_transitions(db, [(task.id, task.project_id, before["status"], task.status)])
+    await apply_task_change(db, task=task, before=before, after=task_values(task))
     await db.commit()
     await db.refresh(task)
+    await publish_task_events("task.updated", [task])
     return task
 
 
@@ -152,7 +284,7 @@ async def delete_task(
     current_user: User = Depends(get_current_user)
 ):
     """Delete task"""
-    task = await ensure_task_access(db, task_id=task_id, user_id=current_user.id)
+    task = await get_task_or_404(db, task_id=task_id)
     
     await require_project_permission(
         db,
@@ -162,15 +294,14 @@ async def delete_task(
     )
 
     # Add history before deletion
-    await crud_task.add_history(
-        db,
-        task_id=task.id,
-        user_id=current_user.id,
-        action="deleted"
-    )
+    history = TaskChangeSet(user_id=current_user.id)
+    history.record(task.id, "deleted")
+    await history.write(db)
 
-    await crud_task.delete(db, id=task_id)
+    await apply_task_change(db, task=task, before=task_values(task), after=None)
+    await crud_task.delete(db, id=task_id, actor_id=current_user.id)
     await db.commit()
+    await board_hub.publish(task.project_id, "task.deleted", task_id=str(task_id))
     return None
 
 
@@ -184,24 +315,158 @@ async def update_backlog_order(
     """Update backlog task order"""
     await ensure_project_access(db, project_id=project_id, user_id=current_user.id)
 
-    # Validate that all tasks belong to the project
-    task_ids = [item.get("task_id") for item in task_positions if item.get("task_id")]
-    if task_ids:
-        tasks = await db.execute(
-            select(Task).where(
-                Task.id.in_(task_ids),
-                Task.project_id == project_id
-            )
-        )
-        found_tasks = tasks.scalars().all()
-        if len(found_tasks) != len(task_ids):
-            raise HTTPException(status_code=400, detail="Some tasks not found or don't belong to project")
+    # Tasks outside the project are not updated, so a short count means invalid input
+    task_ids = {item.get("task_id") for item in task_positions if item.get("task_id")}
+    try:
+        updated = await crud_task.update_positions(db, project_id=project_id, task_positions=task_positions)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if updated != len(task_ids):
+        raise HTTPException(status_code=400, detail="Some tasks not found or don't belong to project")
 
-    await crud_task.update_positions(db, task_positions=task_positions)
     await db.commit()
+    # Positions of many tasks changed: boards refetch the backlog
+    await board_hub.publish(project_id, "tasks.reordered")
     return None
 
 
+@router.post("/{task_id}/move", response_model=TaskResponse)
+async def move_task(
+    task_id: UUID,
+    move_in: TaskMove,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Move task after/before another task of the same backlog list.
+
+    Only the moved task's row is written.
+    """
+    task = await get_task_or_404(db, task_id=task_id)
+    await require_project_permission(
+        db,
+        project_id=task.project_id,
+        user_id=current_user.id,
+        permission_key="EDIT_ISSUES"
+    )
+
+    try:
+        lower, upper, sprint_id = await crud_task.get_move_bounds(
+            db, task=task, after_id=move_in.after_id, before_id=move_in.before_id
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    try:
+        rank = rank_between(lower, upper)
+    except ValueError:
+        # Equal neighbour ranks (concurrent moves into one gap): respace the list
+        return JSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content={"detail": "Backlog is being rebalanced, retry the move"},
+            background=BackgroundTask(rebalance_ranks, project_id=task.project_id, sprint_id=sprint_id),
+        )
+
+    before = task_values(task)
+    before_key = count_key(task)
+    task.rank = rank
+    task.sprint_id = sprint_id
+    if sprint_id != before["sprint_id"]:
+        await apply_task_change(db, task=task, before=before, after=task_values(task))
+        await record_task_change(db, removed=[before_key], added=[count_key(task)])
+        await invalidate_sprint_stats(db, sprint_ids=[before["sprint_id"], sprint_id])
+    await record_event(
+        db, "task", task.id, "task.moved",
+        project_id=task.project_id, actor_id=current_user.id,
+        from_sprint_id=before["sprint_id"], sprint_id=sprint_id, rank=rank,
+    )
+    await db.commit()
+    await db.refresh(task)
+    await publish_task_events("task.moved", [task])
+
+    if len(rank) > settings.TASK_RANK_REBALANCE_LENGTH:
+        background_tasks.add_task(rebalance_ranks, project_id=task.project_id, sprint_id=sprint_id)
+    return task
+
+
+@router.post("/projects/{project_id}/import", responses={202: {"model": JobResponse}})
+async def import_project_tasks(
+    project_id: UUID,
+    request: Request,
+    import_format: Optional[str] = Query(
+        None, alias="format", pattern="^(ndjson|csv)$", description="Defaults from Content-Type"
+    ),
+    respond_async: bool = Depends(prefers_async),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Import tasks from an NDJSON or CSV request body into the project backlog.
+
+    Responds with NDJSON progress events (`imported`, `first_number`,
+    `last_number`) after each batch, then a final event with `status`
+    `completed` or `failed`. A failed import is rolled back entirely.
+    With `Prefer: respond-async` the body is stored and imported by a
+    background job instead.
+    """
+    await require_project_permission(
+        db,
+        project_id=project_id,
+        user_id=current_user.id,
+        permission_key="CREATE_ISSUES"
+    )
+    if not import_format:
+        import_format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+
+    if respond_async:
+        job, created = await create_job(
+            db, "tasks.import", user_id=current_user.id, project_id=project_id, params={"format": import_format}
+        )
+        path = job_file(job.id, "upload")
+        try:
+            with path.open("wb") as upload:
+                async for chunk in request.stream():
+                    await asyncio.to_thread(upload.write, chunk)
+        except Exception:
+            path.unlink(missing_ok=True)
+            raise
+        return await accept_job(db, job, created)
+
+    async def events():
+        progress = None
+        async with AsyncSessionLocal() as session:
+            try:
+                # The import locks the project row; a slow upload must not hold it
+                body = await spool_body(request.stream())
+                with body:
+                    async for progress in import_tasks(
+                        session,
+                        project_id=project_id,
+                        reporter_id=current_user.id,
+                        rows=parse_rows(read_chunks(body), import_format),
+                    ):
+                        yield json.dumps({"status": "running", **progress.to_dict()}) + "\n"
+                await session.commit()
+            except (TaskImportError, asyncpg.PostgresError) as exc:
+                await session.rollback()
+                event = {"status": "failed", "imported": 0, "detail": str(exc)}
+                if isinstance(exc, TaskImportError):
+                    event["line"] = exc.line
+                yield json.dumps(event) + "\n"
+                return
+            except Exception:
+                await session.rollback()
+                logger.exception("Task import into project %s failed", project_id)
+                yield json.dumps({"status": "failed", "imported": 0, "detail": "Import failed"}) + "\n"
+                return
+
+        final = progress.to_dict() if progress else {"imported": 0}
+        if final["imported"]:
+            await board_hub.publish(project_id, "tasks.imported", imported=final["imported"])
+        yield json.dumps({"status": "completed", **final}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 @router.get("/projects/{project_id}/backlog", response_model=List[TaskResponse])
 async def get_backlog(
     project_id: UUID,
@@ -228,11 +493,14 @@ async def get_task_history(
     current_user: User = Depends(get_current_user)
 ):
     """Get task history"""
-    await ensure_task_access(db, task_id=task_id, user_id=current_user.id)
+    task = await ensure_task_access(db, task_id=task_id, user_id=current_user.id)
     
+    query = select(TaskHistory).where(TaskHistory.task_id == task_id)
+    if task.created_at is not None:
+        # No history predates the task: lets the planner skip older partitions
+        query = query.where(TaskHistory.created_at >= task.created_at)
     query = (
-        select(TaskHistory)
-        .where(TaskHistory.task_id == task_id)
+        query
         .order_by(TaskHistory.created_at.desc())
         .offset(skip)
         .limit(limit)
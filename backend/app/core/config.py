@@ -18,6 +18,16 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    PASSWORD_HASH_WORKERS: int = 4
+
+    # Principal cache (authenticated user lookups)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    PRINCIPAL_CACHE_USE_REDIS: bool = False
+
+    # Compiled permission scheme cache
+    PERMISSION_SCHEME_CACHE_PUBSUB: bool = False
+    PERMISSION_SCHEME_CACHE_CHANNEL: str = "permission-schemes:invalidate"
 
     # CORS
     CORS_ORIGINS: str = '["http://localhost:3000","http://localhost:5173","http://localhost","http://127.0.0.1","http://127.0.0.1:3000","http://127.0.0.1:5173"]'
@@ -56,6 +66,105 @@ class Settings(BaseSettings):
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
 
+    # Maximum number of tasks accepted by POST /tasks/bulk
+    TASK_BULK_MAX_SIZE: int = 500
+
+    # Rows per COPY batch (and progress event) of a task import
+    TASK_IMPORT_BATCH_SIZE: int = 5000
+
+    # Tasks fetched per server-side cursor batch of a project export
+    TASK_EXPORT_BATCH_SIZE: int = 1000
+
+    # Parsed task filter expressions kept per process
+    TASK_FILTER_CACHE_SIZE: int = 1024
+
+    # Saved view results with now/today in their filter are recomputed after this
+    SAVED_VIEW_TIME_FILTER_TTL_SECONDS: int = 60
+
+    # Sprint statistics cached per process (entries are versioned, see Sprint.stats_version)
+    SPRINT_STATS_CACHE_SIZE: int = 10000
+
+    # Project analytics cached per process, keyed by the last completed sprint
+    ANALYTICS_CACHE_SIZE: int = 1000
+
+    # Longest date range served by the cumulative flow endpoint
+    CFD_MAX_DAYS: int = 366
+
+    # Active sprints' burndown snapshot for today is refreshed this often (0 disables)
+    BURNDOWN_SNAPSHOT_INTERVAL_SECONDS: int = 3600
+
+    # Project status counters are recounted from tasks this often (0 disables)
+    STATUS_COUNT_RECONCILE_INTERVAL_SECONDS: int = 3600
+
+    # task_history is partitioned by month: partitions are created this many months ahead
+    TASK_HISTORY_PARTITION_MONTHS_AHEAD: int = 3
+
+    # Months of task history kept in the database; older partitions are archived (0 keeps all)
+    TASK_HISTORY_RETENTION_MONTHS: int = 0
+
+    # Directory receiving archived history partitions (gzipped CSV)
+    TASK_HISTORY_ARCHIVE_DIR: str = "./archive/task_history"
+
+    # Task history partition maintenance runs this often (0 disables)
+    TASK_HISTORY_MAINTENANCE_INTERVAL_SECONDS: int = 86400
+
+    # Real-time board events over WebSocket (published and fanned out through Redis)
+    BOARD_EVENTS_ENABLED: bool = False
+
+    # Latest events kept per project (and for how long) so reconnecting boards can resume
+    BOARD_EVENT_HISTORY_SIZE: int = 1000
+    BOARD_EVENT_HISTORY_TTL_SECONDS: int = 3600
+
+    # Events buffered per socket; a board falling further behind is told to reload
+    BOARD_SOCKET_QUEUE_SIZE: int = 256
+
+    # Open board sockets recheck their token and project access this often
+    BOARD_SOCKET_RECHECK_SECONDS: int = 300
+
+    # Outbox relay polls for new events this often when idle (0 disables)
+    OUTBOX_RELAY_INTERVAL_SECONDS: float = 1.0
+
+    # Outbox events claimed, published and deleted per relay transaction
+    OUTBOX_RELAY_BATCH_SIZE: int = 500
+
+    # Redis streams receiving outbox events (prefix + aggregate type), capped at about this length
+    OUTBOX_STREAM_PREFIX: str = "events:"
+    OUTBOX_STREAM_MAXLEN: int = 100000
+
+    # Changes to a task within this many seconds are emailed as one digest per recipient
+    NOTIFICATION_COALESCE_SECONDS: float = 120.0
+
+    # Notification emails sent per SMTP connection
+    NOTIFICATION_SMTP_BATCH_SIZE: int = 50
+
+    # Celery broker for background jobs (defaults to REDIS_URL)
+    CELERY_BROKER_URL: Optional[str] = None
+
+    # Run jobs in the API process instead of a Celery worker (tests, development without a broker)
+    JOBS_RUN_LOCALLY: bool = False
+
+    # Job exports and uploaded import bodies, shared by the API and the workers
+    JOB_FILES_DIR: str = "./uploads/jobs"
+
+    # How often a running job records that it is alive, and how old that record may get
+    # before the job counts as crashed and may be claimed by another delivery
+    JOB_HEARTBEAT_INTERVAL_SECONDS: float = 30.0
+    JOB_HEARTBEAT_TIMEOUT_SECONDS: float = 120.0
+
+    # Redis redelivers unacknowledged job tasks after this; longer than the longest job
+    JOB_VISIBILITY_TIMEOUT_SECONDS: int = 12 * 3600
+
+    # Jobs queued longer than this, or running with a stale heartbeat, are enqueued again
+    # by a sweep running this often (0 disables)
+    JOB_SWEEP_INTERVAL_SECONDS: int = 300
+
+    # Rows deleted per transaction when purging a deleted project, and the pause between chunks
+    PROJECT_PURGE_CHUNK_SIZE: int = 1000
+    PROJECT_PURGE_PAUSE_SECONDS: float = 0.1
+
+    # Backlog ranks longer than this trigger a background rebalance
+    TASK_RANK_REBALANCE_LENGTH: int = 32
+
     # Default admin bootstrap
     DEFAULT_ADMIN_EMAIL: Optional[str] = "admin@example.com"
     DEFAULT_ADMIN_USERNAME: Optional[str] = "admin"
@@ -0,0 +1,43 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+
+def _encode(data: dict) -> str:
+    raw = json.dumps(data, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> dict:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """Encode keyset position (created_at, id) as opaque cursor"""
+    return _encode({"c": created_at.isoformat(), "i": str(id)})
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode opaque cursor, raise ValueError if malformed"""
+    try:
+        data = _decode(cursor)
+        return datetime.fromisoformat(data["c"]), UUID(data["i"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def encode_rank_cursor(rank: float, id: UUID) -> str:
+    """Encode keyset position (relevance rank, id) as opaque cursor"""
+    return _encode({"r": rank, "i": str(id)})
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, UUID]:
+    """Decode opaque rank cursor, raise ValueError if malformed"""
+    try:
+        data = _decode(cursor)
+        return float(data["r"]), UUID(data["i"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
@@ -1,11 +1,18 @@
-from typing import List
+import re
+from typing import List, Optional
 from uuid import UUID
-from sqlalchemy import select
+from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import CRUDBase
+from app.models.associations import project_members
 from app.models.comment import Comment
+from app.models.user import User
 from app.schemas.comment import CommentCreate, CommentUpdate
+from app.services.outbox import record_event
+
+# "@username", not part of an e-mail address or another word
+MENTION_PATTERN = re.compile(r"(?<![\w@])@([A-Za-z0-9_-]{3,50})")
 
 
 class CRUDComment(CRUDBase[Comment, CommentCreate, CommentUpdate]):
@@ -23,5 +30,68 @@ class CRUDComment(CRUDBase[Comment, CommentCreate, CommentUpdate]):
         result = await db.execute(query)
         return result.scalars().all()
 
+    async def resolve_mentions(self, db: AsyncSession, *, content: str, project_id: UUID) -> List[UUID]:
+        """Active project members mentioned as @username in content, in one query"""
+        usernames = list(dict.fromkeys(MENTION_PATTERN.findall(content)))
+        if not usernames:
+            return []
+        result = await db.execute(
+            select(User.id, User.username)
+            .join(project_members, project_members.c.user_id == User.id)
+            .where(
+                project_members.c.project_id == project_id,
+                User.username.in_(usernames),
+                User.is_active.is_(True),
+            )
+        )
+        ids = {row.username: row.id for row in result.all()}
+        return [ids[username] for username in usernames if username in ids]
+
+    async def create_for_user(
+        self, db: AsyncSession, *, obj_in: CommentCreate, user_id: UUID, project_id: UUID
+    ) -> Comment:
+        """Create comment by user (project_id is the task's, for the outbox event)"""
+        mentioned = await self.resolve_mentions(db, content=obj_in.content, project_id=project_id)
+        db_obj = Comment(**obj_in.model_dump(), user_id=user_id, mentioned_users=mentioned)
+        db.add(db_obj)
+        await db.flush()
+        await db.refresh(db_obj)
+        await record_event(
+            db, "comment", db_obj.id, "comment.created",
+            project_id=project_id, actor_id=user_id, task_id=db_obj.task_id,
+            mentioned_users=db_obj.mentioned_users or [],
+        )
+        return db_obj
+
+    async def update_content(
+        self, db: AsyncSession, *, db_obj: Comment, content: str, project_id: UUID
+    ) -> Comment:
+        """Edit comment text; the event lists only users mentioned by the edit"""
+        mentioned = await self.resolve_mentions(db, content=content, project_id=project_id)
+        already_mentioned = set(db_obj.mentioned_users or [])
+        db_obj.content = content
+        db_obj.mentioned_users = mentioned
+        db_obj.edited = True
+        await db.flush()
+        await record_event(
+            db, "comment", db_obj.id, "comment.updated",
+            project_id=project_id, actor_id=db_obj.user_id, task_id=db_obj.task_id,
+            mentioned_users=[user_id for user_id in mentioned if user_id not in already_mentioned],
+        )
+        return db_obj
+
+    async def delete(
+        self, db: AsyncSession, *, id: UUID, actor_id: Optional[UUID] = None, project_id: Optional[UUID] = None
+    ) -> bool:
+        """Delete comment"""
+        result = await db.execute(delete(Comment).where(Comment.id == id).returning(Comment.task_id))
+        task_id = result.scalar()
+        if task_id is None:
+            return False
+        await record_event(
+            db, "comment", id, "comment.deleted", project_id=project_id, actor_id=actor_id, task_id=task_id
+        )
+        return True
+
 
 comment = CRUDComment(Comment)
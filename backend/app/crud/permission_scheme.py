@@ -1,6 +1,6 @@
 from typing import List
 from uuid import UUID
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import CRUDBase
@@ -81,5 +81,15 @@ class CRUDPermissionScheme(CRUDBase[PermissionScheme, PermissionSchemeCreate, Pe
     async def delete_rule(self, db: AsyncSession, *, rule_id: UUID) -> None:
         await db.execute(delete(PermissionSchemeRule).where(PermissionSchemeRule.id == rule_id))
 
+    async def bump_version(self, db: AsyncSession, *, scheme_id: UUID) -> int:
+        """Increment scheme version after a rule change and return the new value"""
+        result = await db.execute(
+            update(PermissionScheme)
+            .where(PermissionScheme.id == scheme_id)
+            .values(version=PermissionScheme.version + 1)
+            .returning(PermissionScheme.version)
+        )
+        return result.scalar_one()
+
 
 permission_scheme = CRUDPermissionScheme(PermissionScheme)
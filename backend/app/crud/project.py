@@ -22,7 +22,7 @@ class CRUDProject(CRUDBase[Project, ProjectCreate, ProjectUpdate]):
         """Get projects by organization"""
         query = (
             select(Project)
-            .where(Project.organization_id == organization_id)
+            .where(Project.organization_id == organization_id, Project.deleted_at.is_(None))
             .offset(skip)
             .limit(limit)
         )
@@ -46,7 +46,8 @@ class CRUDProject(CRUDBase[Project, ProjectCreate, ProjectUpdate]):
                 or_(
                     Project.created_by == user_id,
                     project_members.c.user_id == user_id
-                )
+                ),
+                Project.deleted_at.is_(None)
             )
         )
 
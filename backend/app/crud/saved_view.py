@@ -0,0 +1,28 @@
+from typing import List
+from uuid import UUID
+from sqlalchemy import select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.saved_view import SavedView
+from app.schemas.saved_view import SavedViewCreate, SavedViewUpdate
+
+
+class CRUDSavedView(CRUDBase[SavedView, SavedViewCreate, SavedViewUpdate]):
+    async def get_for_project(
+        self, db: AsyncSession, *, project_id: UUID, user_id: UUID
+    ) -> List[SavedView]:
+        """Get user's own and shared views of project"""
+        query = (
+            select(SavedView)
+            .where(
+                SavedView.project_id == project_id,
+                or_(SavedView.owner_id == user_id, SavedView.is_shared.is_(True))
+            )
+            .order_by(SavedView.name.asc())
+        )
+        result = await db.execute(query)
+        return result.scalars().all()
+
+
+saved_view = CRUDSavedView(SavedView)
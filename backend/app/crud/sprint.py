@@ -1,13 +1,31 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
-from datetime import datetime
-from sqlalchemy import select, func, and_
+from datetime import date, datetime, timezone
+from sqlalchemy import select, delete, func, and_, any_, literal, Date
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import CRUDBase
-from app.models.sprint import Sprint
+from app.models.sprint import Sprint, SprintBurndownSnapshot
 from app.models.task import Task
 from app.schemas.sprint import SprintCreate, SprintUpdate
+from app.services.outbox import record_event
+
+# Task statuses counted by each *_tasks_count statistic
+STATUS_CATEGORIES = {
+    "todo": ("backlog", "todo"),
+    "in_progress": ("in_progress", "review", "testing"),
+    "completed": ("done",),
+    "cancelled": ("cancelled",),
+}
+STATS_KEYS = (
+    "tasks_count",
+    *(f"{category}_tasks_count" for category in STATUS_CATEGORIES),
+    "total_story_points",
+    "completed_story_points",
+    "estimated_hours",
+    "logged_hours",
+)
 
 
 class CRUDSprint(CRUDBase[Sprint, SprintCreate, SprintUpdate]):
@@ -53,7 +71,7 @@ class CRUDSprint(CRUDBase[Sprint, SprintCreate, SprintUpdate]):
         max_number = result.scalar()
         return (max_number or 0) + 1
 
-    async def create(self, db: AsyncSession, *, obj_in: SprintCreate) -> Sprint:
+    async def create(self, db: AsyncSession, *, obj_in: SprintCreate, actor_id: Optional[UUID] = None) -> Sprint:
         """Create new sprint with auto-generated sprint number"""
         sprint_number = await self.get_next_sprint_number(db, project_id=obj_in.project_id)
 
@@ -65,9 +83,52 @@ class CRUDSprint(CRUDBase[Sprint, SprintCreate, SprintUpdate]):
         db.add(db_obj)
         await db.flush()
         await db.refresh(db_obj)
+        await record_event(
+            db, "sprint", db_obj.id, "sprint.created",
+            project_id=db_obj.project_id, actor_id=actor_id, sprint_number=sprint_number,
+        )
+        return db_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Sprint,
+        obj_in: SprintUpdate | dict,
+        actor_id: Optional[UUID] = None
+    ) -> Sprint:
+        """Update sprint"""
+        update_data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+        changes = {
+            field: {"old": getattr(db_obj, field, None), "new": value}
+            for field, value in update_data.items()
+            if getattr(db_obj, field, None) != value
+        }
+        db_obj = await super().update(db, db_obj=db_obj, obj_in=update_data)
+        if changes:
+            await record_event(
+                db, "sprint", db_obj.id, "sprint.updated",
+                project_id=db_obj.project_id, actor_id=actor_id, changes=changes,
+            )
         return db_obj
 
-    async def start(self, db: AsyncSession, *, sprint: Sprint, start_date: Optional[datetime] = None) -> Sprint:
+    async def delete(self, db: AsyncSession, *, id: UUID, actor_id: Optional[UUID] = None) -> bool:
+        """Delete sprint"""
+        result = await db.execute(delete(Sprint).where(Sprint.id == id).returning(Sprint.project_id))
+        project_id = result.scalar()
+        if project_id is None:
+            return False
+        await record_event(db, "sprint", id, "sprint.deleted", project_id=project_id, actor_id=actor_id)
+        return True
+
+    async def start(
+        self,
+        db: AsyncSession,
+        *,
+        sprint: Sprint,
+        start_date: Optional[datetime] = None,
+        actor_id: Optional[UUID] = None
+    ) -> Sprint:
         """Start sprint"""
         sprint.status = "active"
         if start_date:
@@ -78,9 +139,14 @@ class CRUDSprint(CRUDBase[Sprint, SprintCreate, SprintUpdate]):
         db.add(sprint)
         await db.flush()
         await db.refresh(sprint)
+        await self.record_burndown(db, sprint_ids=[sprint.id])
+        await record_event(
+            db, "sprint", sprint.id, "sprint.started",
+            project_id=sprint.project_id, actor_id=actor_id, start_date=sprint.start_date,
+        )
         return sprint
 
-    async def complete(self, db: AsyncSession, *, sprint: Sprint) -> Sprint:
+    async def complete(self, db: AsyncSession, *, sprint: Sprint, actor_id: Optional[UUID] = None) -> Sprint:
         """Complete sprint"""
         sprint.status = "completed"
         sprint.completed_at = datetime.utcnow()
@@ -88,33 +154,104 @@ class CRUDSprint(CRUDBase[Sprint, SprintCreate, SprintUpdate]):
         db.add(sprint)
         await db.flush()
         await db.refresh(sprint)
+        await self.record_burndown(db, sprint_ids=[sprint.id])
+        await record_event(
+            db, "sprint", sprint.id, "sprint.completed",
+            project_id=sprint.project_id, actor_id=actor_id, completed_at=sprint.completed_at,
+        )
         return sprint
 
+    async def record_burndown(
+        self,
+        db: AsyncSession,
+        *,
+        sprint_ids: Optional[List[UUID]] = None,
+        day: Optional[date] = None
+    ) -> None:
+        """Upsert today's burndown snapshot of the given sprints (default: all active).
+
+        One INSERT ... SELECT aggregates the tasks of every sprint at once.
+        """
+        day = day or datetime.now(timezone.utc).date()
+        closed = Task.status.in_(STATUS_CATEGORIES["completed"] + STATUS_CATEGORIES["cancelled"])
+        totals = (
+            select(
+                Sprint.id,
+                literal(day, Date),
+                func.count(Task.id),
+                func.count(Task.id).filter(~closed),
+                func.coalesce(func.sum(Task.story_points), 0),
+                func.coalesce(func.sum(Task.story_points).filter(~closed), 0),
+            )
+            .select_from(Sprint)
+            .outerjoin(Task, Task.sprint_id == Sprint.id)
+            .group_by(Sprint.id)
+        )
+        if sprint_ids is None:
+            totals = totals.where(Sprint.status == "active")
+        else:
+            totals = totals.where(Sprint.id == any_(literal(list(sprint_ids), ARRAY(PG_UUID(as_uuid=True)))))
+
+        stmt = insert(SprintBurndownSnapshot).from_select(
+            ["sprint_id", "day", "total_tasks", "remaining_tasks", "total_points", "remaining_points"], totals
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["sprint_id", "day"],
+                set_={
+                    column: stmt.excluded[column]
+                    for column in ("total_tasks", "remaining_tasks", "total_points", "remaining_points")
+                } | {"recorded_at": func.now()},
+            )
+        )
+
+    async def get_burndown(self, db: AsyncSession, *, sprint_id: UUID) -> List[SprintBurndownSnapshot]:
+        """Get burndown snapshots of a sprint, one per day"""
+        result = await db.execute(
+            select(SprintBurndownSnapshot)
+            .where(SprintBurndownSnapshot.sprint_id == sprint_id)
+            .order_by(SprintBurndownSnapshot.day)
+        )
+        return result.scalars().all()
+
     async def get_stats(self, db: AsyncSession, *, sprint_id: UUID) -> dict:
-        """Get sprint statistics"""
-        tasks_query = select(
-            func.count(Task.id).label("total"),
-            func.sum(Task.story_points).label("total_points"),
-            func.sum(
-                func.case((Task.status == "done", Task.story_points), else_=0)
-            ).label("completed_points")
-        ).where(Task.sprint_id == sprint_id)
-
-        result = await db.execute(tasks_query)
-        row = result.first()
-
-        completed_query = select(func.count(Task.id)).where(
-            and_(Task.sprint_id == sprint_id, Task.status == "done")
+        """Get sprint statistics in one aggregate query"""
+        result = await db.execute(select(*_stats_columns()).where(Task.sprint_id == sprint_id))
+        return _stats_dict(result.first())
+
+    async def get_stats_batch(self, db: AsyncSession, *, sprint_ids: List[UUID]) -> Dict[UUID, dict]:
+        """Get statistics of many sprints in one grouped aggregate query"""
+        if not sprint_ids:
+            return {}
+        result = await db.execute(
+            select(Task.sprint_id, *_stats_columns())
+            .where(Task.sprint_id == any_(literal(list(sprint_ids), ARRAY(PG_UUID(as_uuid=True)))))
+            .group_by(Task.sprint_id)
         )
-        completed_result = await db.execute(completed_query)
-        completed_count = completed_result.scalar() or 0
-
-        return {
-            "tasks_count": row.total or 0,
-            "completed_tasks_count": completed_count,
-            "total_story_points": row.total_points or 0,
-            "completed_story_points": row.completed_points or 0,
-        }
+        stats = {row.sprint_id: _stats_dict(row) for row in result.all()}
+        return {sprint_id: stats.get(sprint_id) or _stats_dict(None) for sprint_id in sprint_ids}
+
+
+def _stats_columns() -> list:
+    # Every metric is an aggregate over the same rows, filtered per metric
+    status_counts = [
+        func.count().filter(Task.status.in_(statuses)).label(f"{category}_tasks_count")
+        for category, statuses in STATUS_CATEGORIES.items()
+    ]
+    done = Task.status.in_(STATUS_CATEGORIES["completed"])
+    return [
+        func.count().label("tasks_count"),
+        *status_counts,
+        func.sum(Task.story_points).label("total_story_points"),
+        func.sum(Task.story_points).filter(done).label("completed_story_points"),
+        func.sum(Task.estimated_hours).label("estimated_hours"),
+        func.sum(Task.logged_hours).label("logged_hours"),
+    ]
+
+
+def _stats_dict(row) -> dict:
+    # Sums over no rows are NULL
+    return {name: (getattr(row, name) if row is not None else None) or 0 for name in STATS_KEYS}
 
 
 sprint = CRUDSprint(Sprint)
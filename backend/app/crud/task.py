@@ -1,16 +1,53 @@
-from typing import List, Optional
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
-from sqlalchemy import select, func, or_
+from datetime import datetime
+from sqlalchemy import select, func, and_, or_, tuple_, update, delete, values, column, literal, any_, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.orm import aliased
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import CRUDBase
-from app.models.task import Task, TaskHistory
+from app.models.task import Task
 from app.models.project import Project
 from app.schemas.task import TaskCreate, TaskUpdate
 from app.models.associations import project_members
+from app.services.outbox import record_event, record_events
+from app.services.ranking import rank_after, reordered_ranks
+from app.services.sprint_stats import STATS_FIELDS, invalidate_sprint_stats, stats_changed
+from app.services.status_counts import count_key, record_task_change
+from app.services.status_transitions import record_transitions
+from app.services.task_history import TaskChangeSet, diff_task
 
 
 class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
+    @staticmethod
+    def _paginate(query, *, skip: int, limit: int, after: Optional[Tuple[datetime, UUID]]):
+        """Order newest first; page by keyset when `after` is given, else by offset."""
+        query = query.order_by(Task.created_at.desc(), Task.id.desc())
+        if after:
+            query = query.where(tuple_(Task.created_at, Task.id) < tuple_(*after))
+        else:
+            query = query.offset(skip)
+        return query.limit(limit)
+
+    @staticmethod
+    def visible_to(user_id: UUID):
+        """Filter for tasks a user sees in cross-project listings"""
+        project_ids_subquery = select(project_members.c.project_id).where(
+            project_members.c.user_id == user_id
+        )
+        # Tasks of deleted projects stay until purged
+        deleted_project_ids = select(Project.id).where(Project.deleted_at.isnot(None))
+        return and_(
+            or_(
+                Task.assignee_id == user_id,
+                Task.reporter_id == user_id,
+                Task.project_id.in_(project_ids_subquery)
+            ),
+            Task.project_id.not_in(deleted_project_ids)
+        )
+
     async def get_by_project(
         self,
         db: AsyncSession,
@@ -18,15 +55,19 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         project_id: UUID,
         skip: int = 0,
         limit: int = 100,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        filter_clause=None
     ) -> List[Task]:
-        """Get tasks by project ID"""
+        """Get tasks by project ID (`after` is a (created_at, id) keyset position)"""
         query = select(Task).where(Task.project_id == project_id)
 
         if status:
             query = query.where(Task.status == status)
+        if filter_clause is not None:
+            query = query.where(filter_clause)
 
-        query = query.offset(skip).limit(limit).order_by(Task.created_at.desc())
+        query = self._paginate(query, skip=skip, limit=limit, after=after)
         result = await db.execute(query)
         return result.scalars().all()
 
@@ -37,27 +78,21 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         user_id: UUID,
         skip: int = 0,
         limit: int = 100,
-        filters: Optional[dict] = None
+        filters: Optional[dict] = None,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        filter_clause=None
     ) -> List[Task]:
         """Get tasks available to a specific user (assignee, reporter, or project member)."""
-        project_ids_subquery = select(project_members.c.project_id).where(
-            project_members.c.user_id == user_id
-        )
-
-        query = select(Task).where(
-            or_(
-                Task.assignee_id == user_id,
-                Task.reporter_id == user_id,
-                Task.project_id.in_(project_ids_subquery)
-            )
-        )
+        query = select(Task).where(self.visible_to(user_id))
+        if filter_clause is not None:
+            query = query.where(filter_clause)
 
         if filters:
             for key, value in filters.items():
                 if hasattr(Task, key) and value is not None:
                     query = query.where(getattr(Task, key) == value)
 
-        query = query.offset(skip).limit(limit).order_by(Task.created_at.desc())
+        query = self._paginate(query, skip=skip, limit=limit, after=after)
         result = await db.execute(query)
         return result.scalars().all()
 
@@ -80,53 +115,253 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         obj_in_data = obj_in.model_dump()
         obj_in_data["task_number"] = task_number
         obj_in_data["reporter_id"] = reporter_id
+        last_rank = await self.get_last_rank(db, project_id=obj_in.project_id, sprint_id=obj_in.sprint_id)
+        obj_in_data["rank"] = rank_after(last_rank)
 
         db_obj = Task(**obj_in_data)
         db.add(db_obj)
         await db.flush()
         await db.refresh(db_obj)
+        await record_task_change(db, added=[count_key(db_obj)])
+        await invalidate_sprint_stats(db, sprint_ids=[db_obj.sprint_id])
+        await record_event(
+            db, "task", db_obj.id, "task.created",
+            project_id=db_obj.project_id, actor_id=reporter_id, task_number=task_number,
+        )
         return db_obj
 
-    async def add_history(
+    async def update(
         self,
         db: AsyncSession,
         *,
-        task_id: UUID,
-        user_id: UUID,
-        action: str,
-        field_name: Optional[str] = None,
-        old_value: Optional[str] = None,
-        new_value: Optional[str] = None
-    ) -> TaskHistory:
-        """Add history record for task"""
-        history = TaskHistory(
-            task_id=task_id,
-            user_id=user_id,
-            action=action,
-            field_name=field_name,
-            old_value=old_value,
-            new_value=new_value
+        db_obj: Task,
+        obj_in: TaskUpdate | dict,
+        actor_id: Optional[UUID] = None
+    ) -> Task:
+        """Update task, its project status counter and sprint statistics"""
+        before_key = count_key(db_obj)
+        before = {field: getattr(db_obj, field) for field in STATS_FIELDS}
+        changes = diff_task(db_obj, obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True))
+        db_obj = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        await record_task_change(db, removed=[before_key], added=[count_key(db_obj)])
+        if stats_changed(before, {field: getattr(db_obj, field) for field in STATS_FIELDS}):
+            await invalidate_sprint_stats(db, sprint_ids=[before["sprint_id"], db_obj.sprint_id])
+        if changes:
+            await record_events(db, [_updated_event(db_obj, changes, actor_id)])
+        return db_obj
+
+    async def delete(self, db: AsyncSession, *, id: UUID, actor_id: Optional[UUID] = None) -> bool:
+        """Delete task, decrement its project status counter and invalidate sprint statistics"""
+        result = await db.execute(
+            delete(Task).where(Task.id == id).returning(Task.project_id, Task.sprint_id, Task.status)
         )
-        db.add(history)
-        await db.flush()
-        return history
+        removed = [tuple(row) for row in result.all()]
+        await record_task_change(db, removed=removed)
+        await invalidate_sprint_stats(db, sprint_ids=[sprint_id for _, sprint_id, _ in removed])
+        for project_id, sprint_id, status in removed:
+            await record_event(
+                db, "task", id, "task.deleted",
+                project_id=project_id, actor_id=actor_id, sprint_id=sprint_id, status=status,
+            )
+        return bool(removed)
+
+    async def get_many(self, db: AsyncSession, *, ids: List[UUID]) -> List[Task]:
+        """Get tasks by IDs in one query (missing IDs are skipped)"""
+        result = await db.execute(select(Task).where(Task.id == any_(self._id_array(ids))))
+        return result.scalars().all()
+
+    async def bulk_update(
+        self,
+        db: AsyncSession,
+        *,
+        tasks: List[Task],
+        changes: Dict[str, Any],
+        user_id: UUID
+    ) -> List[Task]:
+        """Apply the same changes to all tasks with one UPDATE.
+
+        History rows for every changed field (and status transitions) are
+        written with one multi-row INSERT each. Returns the updated tasks; the
+        caller commits.
+        """
+        changes = {
+            field: value.value if isinstance(value, Enum) else value
+            for field, value in changes.items()
+        }
+        history = TaskChangeSet(user_id=user_id)
+        diffs = {task.id: history.diff(task, changes) for task in tasks}
+        await history.write(db)
+        if "status" in changes:
+            await record_transitions(
+                db, [(task.id, task.project_id, task.status, changes["status"]) for task in tasks]
+            )
+        # Taken before the UPDATE refreshes the same objects
+        removed = [count_key(task) for task in tasks]
+
+        result = await db.execute(
+            update(Task)
+            .where(Task.id == any_(self._id_array([task.id for task in tasks])))
+            .values(**changes)
+            .returning(Task)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        updated = result.scalars().all()
+        await record_task_change(
+            db,
+            removed=removed,
+            added=[count_key(task) for task in updated],
+        )
+        if set(changes) & set(STATS_FIELDS):
+            await invalidate_sprint_stats(
+                db, sprint_ids=[key[1] for key in removed] + [task.sprint_id for task in updated]
+            )
+        await record_events(
+            db, [_updated_event(task, diffs[task.id], user_id) for task in updated if diffs.get(task.id)]
+        )
+        return updated
+
+    @staticmethod
+    def _id_array(ids: List[UUID]):
+        # One array parameter instead of a placeholder per ID
+        return literal(list(ids), ARRAY(PG_UUID(as_uuid=True)))
 
     async def update_positions(
         self,
         db: AsyncSession,
         *,
+        project_id: UUID,
         task_positions: List[dict]
-    ) -> None:
-        """Update positions for multiple tasks (for backlog ordering)"""
-        for item in task_positions:
-            task_id = item.get("task_id")
-            position = item.get("position")
-            if task_id and position is not None:
-                task = await self.get(db, id=task_id)
-                if task:
-                    task.position = position
-                    db.add(task)
-        await db.flush()
+    ) -> int:
+        """Set positions (and matching ranks) of reordered tasks of one list in one UPDATE.
+
+        Positions are indexes in the reordered list; tasks not submitted keep
+        their ranks and the submitted ones are ranked between them. Returns
+        number of updated tasks; tasks outside the project are skipped.
+        Raises ValueError if the tasks belong to different lists.
+        """
+        items = sorted(
+            (item for item in task_positions if item.get("task_id") and item.get("position") is not None),
+            key=lambda item: item["position"],
+        )
+        if not items:
+            return 0
+        moved = [(UUID(str(item["task_id"])), item["position"]) for item in items]
+
+        result = await db.execute(
+            select(Task.sprint_id)
+            .where(Task.id == any_(self._id_array([task_id for task_id, _ in moved])), Task.project_id == project_id)
+            .distinct()
+        )
+        sprint_ids = {row.sprint_id for row in result.all()}
+        if not sprint_ids:
+            return 0
+        if len(sprint_ids) > 1:
+            raise ValueError("Tasks belong to different lists")
+        sprint_id = sprint_ids.pop()
+        sprint_filter = Task.sprint_id == sprint_id if sprint_id else Task.sprint_id.is_(None)
+        result = await db.execute(
+            select(Task.id, Task.rank)
+            .where(Task.project_id == project_id, sprint_filter)
+            .order_by(Task.rank.asc().nulls_last(), Task.created_at.asc())
+        )
+        ranks = reordered_ranks([(row.id, row.rank) for row in result.all()], moved)
+        if not ranks:
+            return 0
+
+        new_positions = values(
+            column("id", PG_UUID(as_uuid=True)),
+            column("position", Integer),
+            column("rank", String),
+            name="new_positions",
+        ).data([(task_id, position, ranks[task_id]) for task_id, position in moved if task_id in ranks])
+        result = await db.execute(
+            update(Task)
+            .where(Task.id == new_positions.c.id, Task.project_id == project_id)
+            .values(position=new_positions.c.position, rank=new_positions.c.rank)
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        )
+        return len(result.all())
+
+    async def get_last_rank(
+        self,
+        db: AsyncSession,
+        *,
+        project_id: UUID,
+        sprint_id: Optional[UUID] = None
+    ) -> Optional[str]:
+        """Get highest rank in a backlog list (project + sprint)"""
+        sprint_filter = Task.sprint_id == sprint_id if sprint_id else Task.sprint_id.is_(None)
+        result = await db.execute(
+            select(func.max(Task.rank)).where(Task.project_id == project_id, sprint_filter)
+        )
+        return result.scalar()
+
+    async def get_move_bounds(
+        self,
+        db: AsyncSession,
+        *,
+        task: Task,
+        after_id: Optional[UUID] = None,
+        before_id: Optional[UUID] = None
+    ) -> Tuple[Optional[str], Optional[str], Optional[UUID]]:
+        """Return (lower rank, upper rank, sprint_id) of the gap the task moves into.
+
+        With one anchor, its neighbour on the open side is found in the same
+        statement. Raises ValueError if an anchor is missing or in another list.
+        """
+        anchor_ids = [anchor_id for anchor_id in (after_id, before_id) if anchor_id]
+        if task.id in anchor_ids:
+            raise ValueError("Task cannot be placed relative to itself")
+
+        if after_id and before_id:
+            result = await db.execute(
+                select(Task.id, Task.rank, Task.sprint_id).where(
+                    Task.id.in_(anchor_ids), Task.project_id == task.project_id
+                )
+            )
+            anchors = {row.id: row for row in result.all()}
+            if len(anchors) != 2:
+                raise ValueError("Anchor task not found in project")
+            after, before = anchors[after_id], anchors[before_id]
+            if after.sprint_id != before.sprint_id:
+                raise ValueError("Anchor tasks belong to different lists")
+            return after.rank, before.rank, after.sprint_id
+
+        anchor = aliased(Task)
+        if after_id:
+            neighbour = func.min(Task.rank)
+            beyond = Task.rank > anchor.rank
+            combine = func.least
+        else:
+            neighbour = func.max(Task.rank)
+            beyond = Task.rank < anchor.rank
+            combine = func.greatest
+
+        def neighbour_in(list_filter):
+            return (
+                select(neighbour)
+                .where(Task.project_id == anchor.project_id, list_filter, beyond, Task.id != task.id)
+                .scalar_subquery()
+            )
+
+        # Two index-friendly branches instead of IS NOT DISTINCT FROM on sprint_id
+        neighbour_rank = combine(
+            neighbour_in(Task.sprint_id == anchor.sprint_id),
+            neighbour_in(Task.sprint_id.is_(None) & anchor.sprint_id.is_(None)),
+        )
+        result = await db.execute(
+            select(anchor.rank, anchor.sprint_id, neighbour_rank.label("neighbour_rank")).where(
+                anchor.id == (after_id or before_id), anchor.project_id == task.project_id
+            )
+        )
+        row = result.first()
+        if not row:
+            raise ValueError("Anchor task not found in project")
+
+        if after_id:
+            return row.rank, row.neighbour_rank, row.sprint_id
+        return row.neighbour_rank, row.rank, row.sprint_id
 
     async def get_backlog_tasks(
         self,
@@ -135,7 +370,7 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         project_id: UUID,
         sprint_id: Optional[UUID] = None
     ) -> List[Task]:
-        """Get backlog tasks (not in sprint or in specific sprint) ordered by position"""
+        """Get backlog tasks (not in sprint or in specific sprint) ordered by rank"""
         query = select(Task).where(Task.project_id == project_id)
 
         if sprint_id:
@@ -143,9 +378,17 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         else:
             query = query.where(Task.sprint_id.is_(None))
 
-        query = query.order_by(Task.position.asc(), Task.created_at.asc())
+        query = query.order_by(Task.rank.asc(), Task.created_at.asc())
         result = await db.execute(query)
         return result.scalars().all()
 
 
+def _updated_event(task: Task, changes, actor_id: Optional[UUID]):
+    payload = {
+        "actor_id": actor_id,
+        "changes": {field: {"old": old, "new": new} for field, old, new in changes},
+    }
+    return ("task", task.id, task.project_id, "task.updated", payload)
+
+
 task = CRUDTask(Task)
@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.crud.base import CRUDBase
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash_async, verify_password_async
 
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
@@ -24,7 +24,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         db_obj = User(
             email=obj_in.email,
             username=obj_in.username,
-            password_hash=get_password_hash(obj_in.password),
+            password_hash=await get_password_hash_async(obj_in.password),
             first_name=obj_in.first_name,
             last_name=obj_in.last_name,
             bio=obj_in.bio,
@@ -45,7 +45,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
 
         if not user:
             return None
-        if not verify_password(password, user.password_hash):
+        if not await verify_password_async(password, user.password_hash):
             return None
         return user
 
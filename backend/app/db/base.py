@@ -3,12 +3,16 @@ from app.db.session import Base
 from app.models.user import User
 from app.models.organization import Organization
 from app.models.project import Project
-from app.models.task import Task, TaskHistory, TaskDependency
+from app.models.task import Task, TaskHistory, TaskDependency, TaskStatusTransition
 from app.models.comment import Comment
-from app.models.sprint import Sprint
+from app.models.sprint import Sprint, SprintBurndownSnapshot
 from app.models.attachment import Attachment
 from app.models.workflow import Workflow, WorkflowStatus, WorkflowTransition
 from app.models.permission import PermissionScheme, PermissionSchemeRule
+from app.models.saved_view import SavedView
+from app.models.status_count import ProjectStatusCount
+from app.models.outbox import OutboxEvent
+from app.models.job import Job
 
 # Association tables
 from app.models.associations import (
@@ -2,11 +2,22 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 
 from app.core.config import settings
 from app.api.v1.api import api_router
 from app.db.session import engine
+from app.core.redis import close_redis
+from app.core.security import shutdown_password_executor
 from app.services.bootstrap import ensure_default_admin
+from app.services.board_events import board_hub
+from app.services.burndown import run_burndown_snapshots
+from app.services.history_partitions import run_partition_maintenance
+from app.services.notifications import run_notifications
+from app.services.outbox import run_relay
+from app.services.permission_cache import permission_scheme_cache
+from app.services.status_counts import run_reconciliation
+from app.worker.tasks import run_job_sweep
 
 
 @asynccontextmanager
@@ -23,9 +34,40 @@ async def lifespan(app: FastAPI):
     except Exception as exc:
         print("❌ Failed to connect to database:", exc)
         raise
+
+    background_tasks = []
+    if settings.PERMISSION_SCHEME_CACHE_PUBSUB:
+        background_tasks.append(asyncio.create_task(permission_scheme_cache.listen()))
+        print("🔐 Permission scheme invalidation listener started")
+    if settings.BOARD_EVENTS_ENABLED:
+        background_tasks.append(asyncio.create_task(board_hub.listen()))
+        print("📡 Board event listener started")
+    if settings.STATUS_COUNT_RECONCILE_INTERVAL_SECONDS:
+        background_tasks.append(asyncio.create_task(run_reconciliation()))
+        print("🧮 Status count reconciliation scheduled")
+    if settings.BURNDOWN_SNAPSHOT_INTERVAL_SECONDS:
+        background_tasks.append(asyncio.create_task(run_burndown_snapshots()))
+        print("📉 Sprint burndown snapshots scheduled")
+    if settings.TASK_HISTORY_MAINTENANCE_INTERVAL_SECONDS:
+        background_tasks.append(asyncio.create_task(run_partition_maintenance()))
+        print("🗄️ Task history partition maintenance scheduled")
+    if settings.OUTBOX_RELAY_INTERVAL_SECONDS:
+        background_tasks.append(asyncio.create_task(run_relay()))
+        print("📤 Outbox relay started")
+    if settings.SMTP_HOST and settings.OUTBOX_RELAY_INTERVAL_SECONDS:
+        background_tasks.append(asyncio.create_task(run_notifications()))
+        print("📬 Notification pipeline started")
+    if settings.JOB_SWEEP_INTERVAL_SECONDS:
+        background_tasks.append(asyncio.create_task(run_job_sweep()))
+        print("🧹 Stalled job sweep scheduled")
     yield
     # Shutdown
     print("🛑 Shutting down...")
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await close_redis()
+    shutdown_password_executor()
     await engine.dispose()
 
 
@@ -45,6 +87,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -2,9 +2,13 @@
 from .user import User
 from .organization import Organization
 from .project import Project
-from .task import Task, TaskHistory, TaskDependency
+from .task import Task, TaskHistory, TaskDependency, TaskStatusTransition
 from .comment import Comment
-from .sprint import Sprint
+from .sprint import Sprint, SprintBurndownSnapshot
 from .attachment import Attachment
 from .workflow import Workflow, WorkflowStatus, WorkflowTransition
 from .permission import PermissionScheme, PermissionSchemeRule
+from .saved_view import SavedView
+from .status_count import ProjectStatusCount
+from .outbox import OutboxEvent
+from .job import Job
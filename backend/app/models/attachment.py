@@ -11,7 +11,7 @@ class Attachment(Base):
     __tablename__ = "attachments"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True)
     uploaded_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     filename = Column(String(255), nullable=False)
     original_filename = Column(String(255), nullable=False)
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Text, ForeignKey, Boolean, DateTime, ARRAY
-from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, Text, ForeignKey, Boolean, DateTime, ARRAY, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 import uuid
 
@@ -18,6 +18,11 @@ class Comment(Base):
     mentioned_users = Column(ARRAY(UUID(as_uuid=True)))
     attachments = Column(JSONB, default=[])
     edited = Column(Boolean, default=False)
+    # Full-text search document maintained by PostgreSQL (see app.services.search)
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', coalesce(content, ''))", persisted=True),
+    ))
 
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -28,3 +33,7 @@ class Comment(Base):
     task = relationship("Task", back_populates="comments")
     user = relationship("User", back_populates="comments")
     parent_comment = relationship("Comment", remote_side=[id], backref="replies")
+
+    __table_args__ = (
+        Index("idx_comment_search_vector", "search_vector", postgresql_using="gin"),
+    )
@@ -0,0 +1,46 @@
+from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Integer, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+import uuid
+
+from app.db.session import Base
+
+# Jobs in these states block another job of the same kind and idempotency key
+ACTIVE_JOB_STATUSES = ("queued", "running")
+
+
+class Job(Base):
+    """Background operation run by app.worker (or in-process when JOBS_RUN_LOCALLY).
+
+    No foreign key to projects: a project deletion job outlives its project.
+    """
+    __tablename__ = "jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String(50), nullable=False)  # project.delete, project.export, tasks.import, sprint.complete
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, paused, succeeded, failed
+    project_id = Column(UUID(as_uuid=True), index=True)
+    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
+    # Identifies the target of the operation, e.g. the sprint being completed
+    idempotency_key = Column(String(255))
+    params = Column(JSONB, nullable=False, default={})
+
+    progress = Column(Integer, nullable=False, default=0)
+    total = Column(Integer)
+    result = Column(JSONB)
+    error = Column(Text)
+    attempts = Column(Integer, nullable=False, default=0)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    # Refreshed while a worker runs the job; NULL once a paused run has stopped
+    heartbeat_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index(
+            "uq_job_active_key", "kind", "idempotency_key", unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+    )
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, BigInteger, DateTime
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+
+from app.db.session import Base
+
+
+class OutboxEvent(Base):
+    """Domain event written in the transaction of the change it describes.
+
+    Rows are published to Redis streams and deleted by app.services.outbox.
+    No foreign keys: events outlive the rows they are about.
+    """
+    __tablename__ = "outbox_events"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    aggregate_type = Column(String(20), nullable=False)  # task, sprint, comment, project
+    aggregate_id = Column(UUID(as_uuid=True), nullable=False)
+    project_id = Column(UUID(as_uuid=True))
+    event_type = Column(String(50), nullable=False)
+    payload = Column(JSONB, nullable=False, default={})
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Date, Numeric, Integer
+from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Date, Numeric, Integer, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -31,6 +31,8 @@ class Project(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     archived_at = Column(DateTime(timezone=True))
+    # Set when deletion is requested; the rows are then purged in the background
+    # (app.services.project_purge)
     deleted_at = Column(DateTime(timezone=True))
 
     # Relationships
@@ -47,3 +49,8 @@ class Project(Base):
     lead = relationship("User", foreign_keys=[lead_id])
     workflow = relationship("Workflow", back_populates="projects")
     permission_scheme = relationship("PermissionScheme", back_populates="projects")
+
+    __table_args__ = (
+        # Soft-deleted projects, excluded from cross-project task listings
+        Index("idx_project_deleted", "id", postgresql_where=text("deleted_at IS NOT NULL")),
+    )
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, String, Text, ForeignKey, Boolean, DateTime, Integer, Index
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy.sql import func
+import uuid
+
+from app.db.session import Base
+
+
+class SavedView(Base):
+    __tablename__ = "saved_views"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    name = Column(String(255), nullable=False)
+    # Task filter expression (app.services.task_filter); "me" is the owner
+    filter = Column(Text)
+    is_shared = Column(Boolean, default=False)
+    page_size = Column(Integer, default=20, nullable=False)
+
+    # Precomputed results maintained by app.services.saved_views: the count is
+    # valid while cached_at is set, cached_task_ids (first page) may be NULL
+    cached_count = Column(Integer)
+    cached_task_ids = Column(ARRAY(UUID(as_uuid=True)))
+    cached_at = Column(DateTime(timezone=True))
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        Index("idx_saved_view_project_cached", "project_id", "cached_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Integer
+from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Date, Integer
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -11,11 +11,14 @@ class Sprint(Base):
     __tablename__ = "sprints"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
     goal = Column(Text)
     status = Column(String(50), default="planned")
     sprint_number = Column(Integer)
+    # Bumped by task writes that change the sprint's statistics; keys the
+    # cached stats in app.services.sprint_stats
+    stats_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Dates
     start_date = Column(DateTime(timezone=True))
@@ -29,3 +32,16 @@ class Sprint(Base):
     # Relationships
     project = relationship("Project", back_populates="sprints")
     tasks = relationship("Task", back_populates="sprint")
+
+
+class SprintBurndownSnapshot(Base):
+    """Remaining work of a sprint at the end of one day (UTC)."""
+    __tablename__ = "sprint_burndown_snapshots"
+
+    sprint_id = Column(UUID(as_uuid=True), ForeignKey("sprints.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    total_tasks = Column(Integer, nullable=False, default=0)
+    remaining_tasks = Column(Integer, nullable=False, default=0)
+    total_points = Column(Integer, nullable=False, default=0)
+    remaining_points = Column(Integer, nullable=False, default=0)
+    recorded_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, String, ForeignKey, Integer, Index
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+from app.db.session import Base
+
+
+class ProjectStatusCount(Base):
+    """Number of tasks per project, sprint (NULL for the backlog) and status.
+
+    Maintained in the task writer's transaction by app.services.status_counts.
+    """
+    __tablename__ = "project_status_counts"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    sprint_id = Column(UUID(as_uuid=True), ForeignKey("sprints.id", ondelete="CASCADE"))
+    status = Column(String(50), nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # Conflict target of the counter upserts; the backlog row has sprint_id NULL
+        Index(
+            "uq_project_status_count",
+            "project_id", "sprint_id", "status",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+        Index("idx_project_status_count_sprint", "sprint_id"),
+    )
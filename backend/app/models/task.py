@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Text, ForeignKey, Integer, Float, DateTime, ARRAY, Index
-from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, String, Text, ForeignKey, Integer, BigInteger, Float, DateTime, ARRAY, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 import uuid
 
@@ -37,6 +37,17 @@ class Task(Base):
     tags = Column(ARRAY(String))
     custom_fields = Column(JSONB, default={})
     position = Column(Integer, default=0)
+    # Lexicographic backlog rank (see app.services.ranking), compared bytewise
+    rank = Column(String(255, collation="C"))
+    # Full-text search document maintained by PostgreSQL (see app.services.search)
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+    ))
 
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
@@ -58,6 +69,15 @@ class Task(Base):
 
     __table_args__ = (
         Index("idx_task_project_number", "project_id", "task_number", unique=True),
+        # Keyset pagination on (created_at, id), newest first
+        Index("idx_task_project_created_id", "project_id", "created_at", "id"),
+        Index("idx_task_project_status_created_id", "project_id", "status", "created_at", "id"),
+        Index("idx_task_created_id", "created_at", "id"),
+        Index("idx_task_project_sprint_rank", "project_id", "sprint_id", "rank"),
+        Index("idx_task_search_vector", "search_vector", postgresql_using="gin"),
+        # Task filter expressions: "tags has x" / "tags in (...)" and "due < ..."
+        Index("idx_task_tags", "tags", postgresql_using="gin"),
+        Index("idx_task_project_due_date", "project_id", "due_date"),
     )
 
 
@@ -65,7 +85,7 @@ class TaskHistory(Base):
     __tablename__ = "task_history"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True)
+    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     action = Column(String(50), nullable=False)
     field_name = Column(String(100))
@@ -73,16 +93,48 @@ class TaskHistory(Base):
     new_value = Column(Text)
     extra_metadata = Column(JSONB, default={})
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    # Partition key (monthly ranges, see app.services.history_partitions), so
+    # it is part of the primary key
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now(), index=True)
 
     # Relationships
     task = relationship("Task", back_populates="history")
 
+    __table_args__ = (
+        Index("idx_task_history_task_created", "task_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+
+class TaskStatusTransition(Base):
+    """Compact log of status changes (from_status NULL when the task was created).
+
+    Written next to task_history by the task write paths; feeds the
+    cumulative flow diagram (app.services.status_transitions).
+    """
+    __tablename__ = "task_status_transitions"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    from_status = Column(String(50))
+    to_status = Column(String(50), nullable=False)
+    transitioned_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # Covers the CFD aggregate: index-only scan of a project's time range
+        Index(
+            "idx_task_status_transition_cfd",
+            "project_id", "transitioned_at",
+            postgresql_include=["from_status", "to_status"],
+        ),
+    )
+
 
 class TaskDependency(Base):
     __tablename__ = "task_dependencies"
 
     task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
-    depends_on_task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    depends_on_task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True, index=True)
     dependency_type = Column(String(50), default="blocks")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
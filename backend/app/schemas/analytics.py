@@ -0,0 +1,46 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import date, datetime
+from uuid import UUID
+
+
+class SprintVelocity(BaseModel):
+    sprint_id: UUID
+    name: str
+    completed_at: datetime
+    committed_points: int
+    completed_points: int
+
+
+class FlowMetrics(BaseModel):
+    # None on the project-wide entry and for unassigned tasks
+    assignee_id: Optional[UUID] = None
+    # Average completed story points per sprint of the window
+    velocity: float = 0
+    resolved_tasks: int = 0
+    throughput_per_week: float = 0
+    cycle_time_p50_hours: Optional[float] = None
+    cycle_time_p85_hours: Optional[float] = None
+    cycle_time_p95_hours: Optional[float] = None
+
+
+class ProjectAnalytics(BaseModel):
+    project_id: UUID
+    # Window: the last completed sprints, oldest first
+    last_completed_sprint_id: Optional[UUID]
+    window_start: Optional[datetime]
+    window_end: Optional[datetime]
+    sprints: List[SprintVelocity]
+    project: FlowMetrics
+    assignees: List[FlowMetrics]
+
+
+class CumulativeFlowDay(BaseModel):
+    day: date
+    # Tasks per status at the end of the day (UTC); empty statuses are omitted
+    counts: Dict[str, int]
+
+
+class CumulativeFlow(BaseModel):
+    project_id: UUID
+    days: List[CumulativeFlowDay]
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class OutboxMetrics(BaseModel):
+    # Across all relays, from the outbox table
+    pending_events: int
+    oldest_pending_age_seconds: Optional[float]
+    # This worker's relay since it started
+    published_events: int
+    published_batches: int
+    throughput_per_second: float
+    last_lag_seconds: Optional[float]
+    max_lag_seconds: float
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime, date
 from uuid import UUID
 from decimal import Decimal
@@ -68,3 +68,20 @@ class ProjectWithStats(ProjectResponse):
     completed_tasks: int = 0
     active_tasks: int = 0
     members_count: int = 0
+
+
+class StatusCountResponse(BaseModel):
+    sprint_id: Optional[UUID]
+    status: str
+    count: int
+
+    class Config:
+        from_attributes = True
+
+
+class ProjectStatusCounts(BaseModel):
+    project_id: UUID
+    # Tasks per status across the backlog and all sprints
+    totals: Dict[str, int]
+    # Per list: sprint_id is None for the backlog
+    counts: List[StatusCountResponse]
@@ -0,0 +1,61 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, List
+from datetime import datetime
+from uuid import UUID
+
+from app.schemas.task import TaskResponse
+from app.services.task_filter import compile_filter
+
+
+def check_filter(v: Optional[str]) -> Optional[str]:
+    """Validate filter expression (FilterError is a ValueError); blank means no filter"""
+    if v is not None and v.strip():
+        compile_filter(v)
+        return v
+    return None
+
+
+class SavedViewBase(BaseModel):
+    name: str = Field(..., min_length=1, max_length=255)
+    filter: Optional[str] = Field(None, max_length=1000)
+    is_shared: bool = False
+    page_size: int = Field(20, ge=1, le=100)
+
+    @field_validator('filter')
+    @classmethod
+    def validate_filter(cls, v: Optional[str]) -> Optional[str]:
+        return check_filter(v)
+
+
+class SavedViewCreate(SavedViewBase):
+    pass
+
+
+class SavedViewUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    filter: Optional[str] = Field(None, max_length=1000)
+    is_shared: Optional[bool] = None
+    page_size: Optional[int] = Field(None, ge=1, le=100)
+
+    @field_validator('filter')
+    @classmethod
+    def validate_filter(cls, v: Optional[str]) -> Optional[str]:
+        return check_filter(v)
+
+
+class SavedViewResponse(SavedViewBase):
+    id: UUID
+    project_id: UUID
+    owner_id: UUID
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+
+class SavedViewResults(BaseModel):
+    view: SavedViewResponse
+    total: int
+    tasks: List[TaskResponse]
+    next_cursor: Optional[str] = Field(None, description="Continue with GET /tasks?project_id=..&filter=..&cursor=..")
@@ -1,6 +1,6 @@
 from typing import Optional, List
 from uuid import UUID
-from datetime import datetime
+from datetime import date, datetime
 from pydantic import BaseModel, Field
 
 
@@ -38,7 +38,31 @@ class SprintResponse(SprintBase):
 
 class SprintWithTasks(SprintResponse):
     tasks_count: int = 0
+    todo_tasks_count: int = 0
+    in_progress_tasks_count: int = 0
     completed_tasks_count: int = 0
+    cancelled_tasks_count: int = 0
     total_story_points: Optional[int] = 0
     completed_story_points: Optional[int] = 0
+    estimated_hours: float = 0
+    logged_hours: float = 0
 
+
+
+class BurndownPoint(BaseModel):
+    day: date
+    total_tasks: int
+    remaining_tasks: int
+    total_points: int
+    remaining_points: int
+
+    class Config:
+        from_attributes = True
+
+
+class SprintBurndown(BaseModel):
+    sprint_id: UUID
+    start_date: Optional[datetime]
+    end_date: Optional[datetime]
+    # One point per day with a snapshot, oldest first
+    points: List[BurndownPoint]
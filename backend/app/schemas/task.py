@@ -1,9 +1,11 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import Optional, List
 from datetime import datetime
 from uuid import UUID
 from enum import Enum
 
+from app.core.config import settings
+
 
 class TaskStatus(str, Enum):
     BACKLOG = "backlog"
@@ -83,6 +85,61 @@ class TaskUpdate(BaseModel):
     logged_hours: Optional[float] = Field(None, ge=0)
 
 
+class TaskMove(BaseModel):
+    """Place task after `after_id` and/or before `before_id` in a backlog list."""
+    after_id: Optional[UUID] = None
+    before_id: Optional[UUID] = None
+
+    @model_validator(mode="after")
+    def validate_anchor(self) -> "TaskMove":
+        if not self.after_id and not self.before_id:
+            raise ValueError("after_id or before_id is required")
+        return self
+
+
+class TaskBulkChanges(BaseModel):
+    """Fields applied to every task of a bulk update (unset fields are left alone)."""
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+    assignee_id: Optional[UUID] = None
+    sprint_id: Optional[UUID] = None
+    tags: Optional[List[str]] = Field(None, max_length=20)
+
+    @field_validator('tags')
+    @classmethod
+    def validate_tags(cls, v: Optional[List[str]]) -> Optional[List[str]]:
+        if v:
+            return list(set([tag.strip() for tag in v if tag and tag.strip()]))
+        return v
+
+
+class TaskBulkUpdate(BaseModel):
+    task_ids: List[UUID] = Field(..., min_length=1, max_length=settings.TASK_BULK_MAX_SIZE)
+    changes: TaskBulkChanges
+
+    @model_validator(mode="after")
+    def validate_changes(self) -> "TaskBulkUpdate":
+        if not self.changes.model_fields_set:
+            raise ValueError("At least one change is required")
+        self.task_ids = list(dict.fromkeys(self.task_ids))
+        return self
+
+
+class TaskImportRow(TaskBase):
+    """One task of a bulk import; CSV tags may be a comma-separated string.
+
+    Sprint and parent references are not imported: imported tasks are
+    appended to the project backlog.
+    """
+
+    @field_validator('tags', mode='before')
+    @classmethod
+    def split_tags(cls, v):
+        if isinstance(v, str):
+            return v.split(',')
+        return v
+
+
 class TaskResponse(TaskBase):
     id: UUID
     project_id: UUID
@@ -90,6 +147,7 @@ class TaskResponse(TaskBase):
     reporter_id: UUID
     logged_hours: float
     position: int
+    rank: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime]
     resolved_at: Optional[datetime]
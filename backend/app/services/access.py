@@ -1,5 +1,5 @@
 from fastapi import HTTPException, status
-from sqlalchemy import select, or_
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 from uuid import UUID
@@ -7,7 +7,9 @@ from uuid import UUID
 from app.models.project import Project
 from app.models.task import Task
 from app.models.organization import Organization
-from app.models.associations import project_members, user_organizations
+from app.models.associations import user_organizations
+from app.services.auth_context import get_auth_context_for
+from app.services.permissions import resolve_project_access
 
 
 async def ensure_org_member(
@@ -18,21 +20,14 @@ async def ensure_org_member(
     allowed_roles: Optional[List[str]] = None
 ) -> str:
     """Ensure user is member of organization (optionally with specific role)."""
-    org = await db.get(Organization, organization_id)
-    if not org:
-        raise HTTPException(status_code=404, detail="Organization not found")
-
-    if org.owner_id == user_id:
-        return "owner"
+    context = get_auth_context_for(db, user_id)
+    if context is not None and organization_id in context.org_roles:
+        role = context.org_roles[organization_id]
+    else:
+        role = await _load_org_role(db, organization_id=organization_id, user_id=user_id)
+        if context is not None:
+            context.org_roles[organization_id] = role
 
-    query = select(
-        user_organizations.c.role
-    ).where(
-        user_organizations.c.organization_id == organization_id,
-        user_organizations.c.user_id == user_id,
-    )
-    result = await db.execute(query)
-    role = result.scalar_one_or_none()
     if not role:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -48,6 +43,30 @@ async def ensure_org_member(
     return role
 
 
+async def _load_org_role(
+    db: AsyncSession,
+    *,
+    organization_id: UUID,
+    user_id: UUID
+) -> Optional[str]:
+    """Return user's organization role, raise 404 if organization is missing."""
+    org = await db.get(Organization, organization_id)
+    if not org:
+        raise HTTPException(status_code=404, detail="Organization not found")
+
+    if org.owner_id == user_id:
+        return "owner"
+
+    query = select(
+        user_organizations.c.role
+    ).where(
+        user_organizations.c.organization_id == organization_id,
+        user_organizations.c.user_id == user_id,
+    )
+    result = await db.execute(query)
+    return result.scalar_one_or_none()
+
+
 async def ensure_project_access(
     db: AsyncSession,
     *,
@@ -55,31 +74,16 @@ async def ensure_project_access(
     user_id: UUID
 ) -> Project:
     """Ensure user has access to project and return project."""
-    project = await db.get(Project, project_id)
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    access = await resolve_project_access(db, project_id=project_id, user_id=user_id)
+    return access.ensure_access()
 
-    if project.created_by == user_id:
-        return project
 
-    membership_query = select(project_members.c.project_id).where(
-        project_members.c.project_id == project_id,
-        project_members.c.user_id == user_id,
-    )
-    membership = await db.execute(membership_query)
-    if membership.scalar_one_or_none():
-        return project
-
-    try:
-        await ensure_org_member(db, organization_id=project.organization_id, user_id=user_id)
-        return project
-    except HTTPException:
-        pass
-
-    raise HTTPException(
-        status_code=status.HTTP_403_FORBIDDEN,
-        detail="Not enough permissions for this project",
-    )
+async def get_task_or_404(db: AsyncSession, *, task_id: UUID) -> Task:
+    """Load task or raise 404 (access is checked by the caller)."""
+    task = await db.get(Task, task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
 
 
 async def ensure_task_access(
@@ -89,9 +93,6 @@ async def ensure_task_access(
     user_id: UUID
 ) -> Task:
     """Ensure user has access to task via its project membership."""
-    task = await db.get(Task, task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-
+    task = await get_task_or_404(db, task_id=task_id)
     await ensure_project_access(db, project_id=task.project_id, user_id=user_id)
     return task
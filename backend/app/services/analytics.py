@@ -0,0 +1,181 @@
+"""Velocity, throughput and cycle-time analytics.
+
+Metrics cover a window of the project's last completed sprints, from the
+first sprint's start to the last one's completion. Every metric is
+aggregated in PostgreSQL over whole columns (FILTER, GROUPING SETS and
+`percentile_cont`); Python only reshapes the few per-sprint and per-assignee
+rows. Since the window ends at the last completed sprint, results only change
+when a sprint closes and are cached by project, last completed sprint and
+window size.
+
+Cycle time runs from a task's first move into an in-progress status (or its
+creation) to `resolved_at` (or its last move to done), both taken from the
+status rows of `task_history`.
+"""
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import any_, extract, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud.sprint import STATUS_CATEGORIES
+from app.models.sprint import Sprint
+from app.models.task import Task, TaskHistory
+from app.schemas.analytics import FlowMetrics, ProjectAnalytics, SprintVelocity
+from app.services.status_transitions import history_status
+
+PERCENTILES = (0.5, 0.85, 0.95)
+DONE_STATUSES = STATUS_CATEGORIES["completed"]
+STARTED_STATUSES = STATUS_CATEGORIES["in_progress"] + DONE_STATUSES
+
+_cache: "OrderedDict[Tuple[UUID, UUID, int], ProjectAnalytics]" = OrderedDict()
+
+
+async def get_project_analytics(db: AsyncSession, *, project_id: UUID, window: int) -> ProjectAnalytics:
+    """Analytics over the last `window` completed sprints of a project."""
+    result = await db.execute(
+        select(Sprint)
+        .where(Sprint.project_id == project_id, Sprint.status == "completed", Sprint.completed_at.is_not(None))
+        .order_by(Sprint.completed_at.desc())
+        .limit(window)
+    )
+    sprints = list(reversed(result.scalars().all()))
+    if not sprints:
+        return ProjectAnalytics(
+            project_id=project_id, last_completed_sprint_id=None, window_start=None, window_end=None,
+            sprints=[], project=FlowMetrics(), assignees=[],
+        )
+
+    key = (project_id, sprints[-1].id, window)
+    cached = _cache.get(key)
+    if cached is not None:
+        _cache.move_to_end(key)
+        return cached
+
+    analytics = await _compute(db, project_id=project_id, sprints=sprints)
+    _cache[key] = analytics
+    while len(_cache) > settings.ANALYTICS_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return analytics
+
+
+def clear_cache() -> None:
+    _cache.clear()
+
+
+async def _compute(db: AsyncSession, *, project_id: UUID, sprints: List[Sprint]) -> ProjectAnalytics:
+    window_start = min(sprint.start_date or sprint.created_at for sprint in sprints)
+    window_end = sprints[-1].completed_at
+    weeks = max((window_end - window_start).total_seconds() / (7 * 86400), 1)
+
+    per_sprint, per_assignee_points = await _velocity(db, sprints=sprints)
+    flow = await _flow(db, project_id=project_id, window_start=window_start, window_end=window_end)
+
+    def metrics(assignee_id: Optional[UUID], completed_points: int, row) -> FlowMetrics:
+        resolved = row.resolved if row is not None else 0
+        return FlowMetrics(
+            assignee_id=assignee_id,
+            velocity=round(completed_points / len(sprints), 2),
+            resolved_tasks=resolved,
+            throughput_per_week=round(resolved / weeks, 2),
+            cycle_time_p50_hours=_hours(row, "p50"),
+            cycle_time_p85_hours=_hours(row, "p85"),
+            cycle_time_p95_hours=_hours(row, "p95"),
+        )
+
+    sprint_rows = [
+        SprintVelocity(
+            sprint_id=sprint.id,
+            name=sprint.name,
+            completed_at=sprint.completed_at,
+            committed_points=per_sprint.get(sprint.id, (0, 0))[0],
+            completed_points=per_sprint.get(sprint.id, (0, 0))[1],
+        )
+        for sprint in sprints
+    ]
+    assignee_ids = sorted(set(per_assignee_points) | (set(flow) - {"project"}), key=str)
+    return ProjectAnalytics(
+        project_id=project_id,
+        last_completed_sprint_id=sprints[-1].id,
+        window_start=window_start,
+        window_end=window_end,
+        sprints=sprint_rows,
+        project=metrics(None, sum(row.completed_points for row in sprint_rows), flow.get("project")),
+        assignees=[
+            metrics(assignee_id, per_assignee_points.get(assignee_id, 0), flow.get(assignee_id))
+            for assignee_id in assignee_ids
+        ],
+    )
+
+
+async def _velocity(
+    db: AsyncSession, *, sprints: List[Sprint]
+) -> Tuple[Dict[UUID, Tuple[int, int]], Dict[Optional[UUID], int]]:
+    """(sprint id -> (committed, completed) points, assignee id -> completed points)."""
+    done = Task.status.in_(DONE_STATUSES)
+    result = await db.execute(
+        select(
+            Task.sprint_id,
+            Task.assignee_id,
+            func.grouping(Task.assignee_id).label("all_assignees"),
+            func.coalesce(func.sum(Task.story_points), 0).label("committed"),
+            func.coalesce(func.sum(Task.story_points).filter(done), 0).label("completed"),
+        )
+        .where(Task.sprint_id == any_(literal([sprint.id for sprint in sprints], ARRAY(PG_UUID(as_uuid=True)))))
+        .group_by(func.grouping_sets(tuple_(Task.sprint_id), tuple_(Task.sprint_id, Task.assignee_id)))
+    )
+    per_sprint, per_assignee = {}, {}
+    for row in result.all():
+        if row.all_assignees:
+            per_sprint[row.sprint_id] = (row.committed, row.completed)
+        else:
+            per_assignee[row.assignee_id] = per_assignee.get(row.assignee_id, 0) + row.completed
+    return per_sprint, per_assignee
+
+
+async def _flow(db: AsyncSession, *, project_id: UUID, window_start: datetime, window_end: datetime) -> dict:
+    """Resolved count and cycle-time percentiles, keyed by assignee id and "project"."""
+    status_rows = (TaskHistory.task_id == Task.id, TaskHistory.field_name == "status")
+    started_at = (
+        select(func.min(TaskHistory.created_at))
+        .where(*status_rows, history_status(TaskHistory.new_value).in_(STARTED_STATUSES))
+        .scalar_subquery()
+    )
+    done_at = (
+        select(func.max(TaskHistory.created_at))
+        .where(*status_rows, history_status(TaskHistory.new_value).in_(DONE_STATUSES))
+        .scalar_subquery()
+    )
+    resolved = (
+        select(
+            Task.assignee_id,
+            func.coalesce(Task.resolved_at, done_at).label("finished_at"),
+            func.coalesce(started_at, Task.created_at).label("started_at"),
+        )
+        .where(Task.project_id == project_id, Task.status.in_(DONE_STATUSES))
+        .subquery("resolved")
+    )
+    cycle_hours = extract("epoch", resolved.c.finished_at - resolved.c.started_at) / 3600
+    result = await db.execute(
+        select(
+            resolved.c.assignee_id,
+            func.grouping(resolved.c.assignee_id).label("all_assignees"),
+            func.count().label("resolved"),
+            *[
+                func.percentile_cont(fraction).within_group(cycle_hours).label(f"p{round(fraction * 100)}")
+                for fraction in PERCENTILES
+            ],
+        )
+        .where(resolved.c.finished_at > window_start, resolved.c.finished_at <= window_end)
+        .group_by(func.grouping_sets(tuple_(), tuple_(resolved.c.assignee_id)))
+    )
+    return {"project" if row.all_assignees else row.assignee_id: row for row in result.all()}
+
+
+def _hours(row, name: str) -> Optional[float]:
+    value = getattr(row, name, None) if row is not None else None
+    return round(value, 1) if value is not None else None
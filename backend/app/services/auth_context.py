@@ -0,0 +1,40 @@
+from typing import Dict, Optional, TYPE_CHECKING
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+if TYPE_CHECKING:
+    from app.services.permissions import ProjectAccess
+
+AUTH_CONTEXT_KEY = "auth_context"
+
+
+class AuthContext:
+    """Request-scoped memo of authorization lookups for one user.
+
+    Bound to the request's DB session (`db.info`) so the access and permission
+    services reuse project, role and permission decisions already made during
+    the same request instead of querying again.
+    """
+
+    def __init__(self, user_id: UUID):
+        self.user_id = user_id
+        self.project_access: Dict[UUID, "ProjectAccess"] = {}
+        # organization_id -> role, None when user is not a member
+        self.org_roles: Dict[UUID, Optional[str]] = {}
+
+
+def bind_auth_context(db: AsyncSession, user_id: UUID) -> AuthContext:
+    """Create context for user and attach it to the session"""
+    context = get_auth_context_for(db, user_id)
+    if context is None:
+        context = AuthContext(user_id)
+        db.info[AUTH_CONTEXT_KEY] = context
+    return context
+
+
+def get_auth_context_for(db: AsyncSession, user_id: UUID) -> Optional[AuthContext]:
+    """Return context bound to the session if it belongs to user"""
+    context = db.info.get(AUTH_CONTEXT_KEY)
+    if context is not None and context.user_id == user_id:
+        return context
+    return None
@@ -0,0 +1,179 @@
+"""Real-time project board events.
+
+Task endpoints publish an event per change after committing. Publishing runs
+one Lua script on Redis that assigns the project's next sequence number,
+keeps the event in a capped per-project history (for resuming clients) and
+publishes it on the project's channel. Every worker runs one pattern
+subscription (`listen`) and hands events to the queues of its local
+WebSocket clients, so open boards cost no database work.
+
+A client resuming with `since` gets the events it missed from the history;
+when they are no longer all there it is told to reload instead.
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.models.task import Task
+from app.schemas.task import TaskResponse
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "board:"
+
+# KEYS: sequence, history. ARGV: event without seq, history size, history TTL, channel
+_PUBLISH = """
+local seq = redis.call('INCR', KEYS[1])
+local message = '{"seq":' .. seq .. ',' .. string.sub(ARGV[1], 2)
+redis.call('ZADD', KEYS[2], seq, message)
+redis.call('ZREMRANGEBYRANK', KEYS[2], 0, -tonumber(ARGV[2]) - 1)
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+redis.call('PUBLISH', ARGV[4], message)
+return seq
+"""
+
+
+def _channel(project_id: UUID) -> str:
+    return f"{CHANNEL_PREFIX}{project_id}"
+
+
+def _keys(project_id: UUID) -> List[str]:
+    # Hash tag keeps both keys of a project on one cluster slot
+    return [f"board:{{{project_id}}}:seq", f"board:{{{project_id}}}:events"]
+
+
+class BoardHub:
+    """Publishes project events and fans them out to this worker's sockets.
+
+    A subscriber's queue receives raw event JSON, or None when it lost events
+    (it fell behind, or the Redis subscription dropped) and must reload.
+    """
+
+    def __init__(self, *, enabled: bool, history_size: int, history_ttl: int, queue_size: int):
+        self.enabled = enabled
+        self.history_size = history_size
+        self.history_ttl = history_ttl
+        self.queue_size = queue_size
+        self._subscribers: Dict[UUID, Set[asyncio.Queue]] = {}
+
+    async def publish(self, project_id: UUID, event_type: str, **data) -> Optional[int]:
+        """Publish an event; returns its sequence number (None when not published)."""
+        seqs = await self.publish_many([(project_id, event_type, data)])
+        return seqs[0] if seqs else None
+
+    async def publish_many(self, events: List[Tuple[UUID, str, dict]]) -> List[int]:
+        """Publish (project id, type, data) events in one pipeline; returns their sequence numbers."""
+        if not self.enabled or not events:
+            return []
+        now = datetime.now(timezone.utc).isoformat()
+        try:
+            redis = get_redis()
+            script = redis.register_script(_PUBLISH)
+            async with redis.pipeline(transaction=False) as pipe:
+                for project_id, event_type, data in events:
+                    event = json.dumps(
+                        {"type": event_type, "project_id": str(project_id), "at": now, **data}, default=str
+                    )
+                    await script(
+                        keys=_keys(project_id),
+                        args=[event, self.history_size, self.history_ttl, _channel(project_id)],
+                        client=pipe,
+                    )
+                return await pipe.execute()
+        except Exception as exc:
+            logger.warning("Failed to publish %d board events: %s", len(events), exc)
+            return []
+
+    async def replay(self, project_id: UUID, since: Optional[int]) -> Tuple[int, Optional[List[str]]]:
+        """(latest sequence, events after `since`); events are None if some are gone."""
+        seq_key, events_key = _keys(project_id)
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.get(seq_key)
+            pipe.zrange(events_key, 0, 0, withscores=True)
+            pipe.zrangebyscore(events_key, f"({since or 0}", "+inf")
+            latest, oldest, events = await pipe.execute()
+
+        latest = int(latest or 0)
+        if since is None or since == latest:
+            return latest, []
+        if since > latest or not oldest or int(oldest[0][1]) > since + 1:
+            return latest, None
+        return latest, events
+
+    def subscribe(self, project_id: UUID) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(project_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, project_id: UUID, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(project_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[project_id]
+
+    def dispatch(self, channel: str, raw: str) -> None:
+        try:
+            project_id = UUID(channel[len(CHANNEL_PREFIX):])
+        except ValueError:
+            return
+        for queue in self._subscribers.get(project_id, ()):
+            try:
+                queue.put_nowait(raw)
+            except asyncio.QueueFull:
+                self._overflow(queue)
+
+    def reset_all(self) -> None:
+        """Tell every local subscriber to reload (events may have been missed)."""
+        for queues in self._subscribers.values():
+            for queue in queues:
+                self._overflow(queue)
+
+    @staticmethod
+    def _overflow(queue: asyncio.Queue) -> None:
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    async def listen(self, *, retry_delay: float = 5.0) -> None:
+        """Consume all projects' events from Redis until cancelled."""
+        while True:
+            pubsub = get_redis().pubsub()
+            try:
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                async for message in pubsub.listen():
+                    if message.get("type") == "pmessage":
+                        self.dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Board event listener failed: %s", exc)
+                self.reset_all()
+                await asyncio.sleep(retry_delay)
+            finally:
+                await pubsub.aclose()
+
+
+board_hub = BoardHub(
+    enabled=settings.BOARD_EVENTS_ENABLED,
+    history_size=settings.BOARD_EVENT_HISTORY_SIZE,
+    history_ttl=settings.BOARD_EVENT_HISTORY_TTL_SECONDS,
+    queue_size=settings.BOARD_SOCKET_QUEUE_SIZE,
+)
+
+
+async def publish_task_events(event_type: str, tasks: List[Task]) -> List[int]:
+    """Publish one event per task, carrying the task as served by the REST API."""
+    return await board_hub.publish_many([
+        (
+            task.project_id,
+            event_type,
+            {"task_id": str(task.id), "task": TaskResponse.model_validate(task).model_dump(mode="json")},
+        )
+        for task in tasks
+    ])
@@ -2,6 +2,7 @@ from app.core.config import settings
 from app.db.session import AsyncSessionLocal
 from app.crud.user import user as crud_user
 from app.schemas.user import UserCreate
+from app.services.principal_cache import principal_cache
 
 
 async def ensure_default_admin():
@@ -29,3 +30,5 @@ async def ensure_default_admin():
                 db.add(existing)
 
         await db.commit()
+        if existing:
+            await principal_cache.invalidate(str(existing.id))
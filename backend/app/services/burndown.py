@@ -0,0 +1,42 @@
+"""Scheduled sprint burndown snapshots.
+
+Every BURNDOWN_SNAPSHOT_INTERVAL_SECONDS the remaining work of all active
+sprints is upserted into today's (UTC) `sprint_burndown_snapshots` row, so the
+last run of a day leaves that day's value. Starting and completing a sprint
+record a snapshot too (see `crud_sprint.record_burndown`), and charts read one
+row per day instead of replaying task history.
+"""
+import asyncio
+import logging
+
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.crud.sprint import sprint as crud_sprint
+from app.db.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# pg_try_advisory_xact_lock key: one snapshot run at a time across workers
+SNAPSHOT_LOCK_ID = 7_140_016
+
+
+async def snapshot_active_sprints() -> bool:
+    """Record today's snapshot of every active sprint; False if another worker is at it."""
+    async with AsyncSessionLocal() as db:
+        acquired = (await db.execute(select(func.pg_try_advisory_xact_lock(SNAPSHOT_LOCK_ID)))).scalar()
+        if not acquired:
+            return False
+        await crud_sprint.record_burndown(db)
+        await db.commit()
+        return True
+
+
+async def run_burndown_snapshots(interval: int = settings.BURNDOWN_SNAPSHOT_INTERVAL_SECONDS) -> None:
+    """Snapshot active sprints every `interval` seconds until cancelled."""
+    while True:
+        try:
+            await snapshot_active_sprints()
+        except Exception:
+            logger.exception("Sprint burndown snapshot failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,155 @@
+"""Monthly partitions of task_history.
+
+`task_history` is range-partitioned by `created_at`, one partition per month
+named `task_history_yYYYYmMM`, plus `task_history_default` which stays empty
+as long as partitions exist ahead of time. Maintenance:
+
+* creates the partitions of the current month and the next
+  TASK_HISTORY_PARTITION_MONTHS_AHEAD months;
+* with TASK_HISTORY_RETENTION_MONTHS set, detaches older partitions, writes
+  each to a gzipped CSV in TASK_HISTORY_ARCHIVE_DIR and drops it. A partition
+  left detached by an interrupted run is archived by the next one.
+
+PostgreSQL refuses DETACH ... CONCURRENTLY while a default partition exists,
+so each partition is detached by a plain DETACH in its own autocommitted
+statement; writers wait only for that catalog change, not for the archive.
+"""
+import asyncio
+import gzip
+import logging
+import os
+import re
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "task_history"
+# pg_try_advisory_lock key: one maintenance run at a time across workers
+MAINTENANCE_LOCK_ID = 7_140_019
+
+_PARTITION_NAME = re.compile(r"^task_history_y(\d{4})m(\d{2})$")
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    match = _PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def current_month() -> date:
+    return datetime.now(timezone.utc).date().replace(day=1)
+
+
+async def create_partitions(conn: AsyncConnection, *, months_ahead: int) -> List[str]:
+    """Create missing partitions from the current month on; returns their names."""
+    existing = {name for name, _, _ in await list_partitions(conn)}
+    created = []
+    month = current_month()
+    for offset in range(months_ahead + 1):
+        start = add_months(month, offset)
+        name = partition_name(start)
+        if name in existing:
+            continue
+        await conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{add_months(start, 1).isoformat()}')"
+        ))
+        created.append(name)
+    return created
+
+
+async def list_partitions(conn: AsyncConnection) -> List[Tuple[str, date, bool]]:
+    """(name, month, attached) of monthly history tables, oldest first."""
+    result = await conn.execute(text(
+        "SELECT relname, relispartition FROM pg_class "
+        "WHERE relkind = 'r' AND relname LIKE 'task\\_history\\_y%'"
+    ))
+    partitions = [
+        (name, partition_month(name), attached)
+        for name, attached in result.all()
+        if partition_month(name)
+    ]
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+async def archive_partitions(conn: AsyncConnection, *, retention_months: int, archive_dir: str) -> List[str]:
+    """Detach, archive and drop partitions older than the retention; returns archive paths.
+
+    `conn` must be in autocommit mode, so every DETACH commits at once.
+    """
+    cutoff = add_months(current_month(), -retention_months)
+    os.makedirs(archive_dir, exist_ok=True)
+    archived = []
+    for name, month, attached in await list_partitions(conn):
+        if month >= cutoff:
+            break
+        if attached:
+            await conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        path = os.path.join(archive_dir, f"{name}.csv.gz")
+        await _copy_to_file(conn, name, path)
+        await conn.execute(text(f"DROP TABLE {name}"))
+        archived.append(path)
+        logger.info("Archived %s to %s", name, path)
+    return archived
+
+
+async def _copy_to_file(conn: AsyncConnection, table: str, path: str) -> None:
+    # Written under a temporary name so a crash never leaves a truncated archive
+    partial = f"{path}.partial"
+    raw = await conn.get_raw_connection()
+    with gzip.open(partial, "wb") as file:
+        async def write(chunk: bytes) -> None:
+            file.write(chunk)
+
+        await raw.driver_connection.copy_from_table(table, output=write, format="csv", header=True)
+    os.replace(partial, path)
+
+
+async def maintain_partitions(
+    *,
+    months_ahead: int = settings.TASK_HISTORY_PARTITION_MONTHS_AHEAD,
+    retention_months: int = settings.TASK_HISTORY_RETENTION_MONTHS,
+    archive_dir: str = settings.TASK_HISTORY_ARCHIVE_DIR
+) -> Optional[Tuple[List[str], List[str]]]:
+    """Run maintenance; returns (created, archived) or None if another process is at it."""
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        if not await conn.scalar(text(f"SELECT pg_try_advisory_lock({MAINTENANCE_LOCK_ID})")):
+            return None
+        try:
+            created = await create_partitions(conn, months_ahead=months_ahead)
+            archived = []
+            if retention_months:
+                archived = await archive_partitions(
+                    conn, retention_months=retention_months, archive_dir=archive_dir
+                )
+            return created, archived
+        finally:
+            await conn.execute(text(f"SELECT pg_advisory_unlock({MAINTENANCE_LOCK_ID})"))
+
+
+async def run_partition_maintenance(
+    interval: int = settings.TASK_HISTORY_MAINTENANCE_INTERVAL_SECONDS
+) -> None:
+    """Maintain history partitions every `interval` seconds until cancelled."""
+    while True:
+        try:
+            await maintain_partitions()
+        except Exception:
+            logger.exception("Task history partition maintenance failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,244 @@
+"""Background jobs: creation, progress and execution.
+
+A `jobs` row records an operation accepted by the API with 202. The work is
+done by a task in app.worker (or in the API process with JOBS_RUN_LOCALLY)
+through `execute_job`, which marks the job running, calls its handler and
+commits the handler's changes together with the final status.
+
+Execution is idempotent: finished jobs are skipped, so a redelivered task
+after a worker crash either finds its job done or redoes the uncommitted
+work from scratch. Handlers therefore do not commit themselves, unless
+their work is resumable like the project purge's. A running job refreshes
+`heartbeat_at` every JOB_HEARTBEAT_INTERVAL_SECONDS; another delivery takes
+it over only once that is older than JOB_HEARTBEAT_TIMEOUT_SECONDS, so a
+job never runs twice at the same time.
+
+A paused job stops at its next progress report (its uncommitted work is
+rolled back) and continues when resumed. Resuming before the run noticed
+the pause just lets that run go on. Pausable jobs can be resumed after
+failing too.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, case, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.job import ACTIVE_JOB_STATUSES, Job
+
+logger = logging.getLogger(__name__)
+
+
+# Jobs that can be paused: their committed work is kept and they resume where they stopped
+PAUSABLE_JOB_KINDS = ("project.delete",)
+
+
+class JobPaused(Exception):
+    """Raised by a progress report of a job paused meanwhile."""
+
+
+def job_alive():
+    """Condition of jobs whose run recorded a heartbeat recently."""
+    timeout = timedelta(seconds=settings.JOB_HEARTBEAT_TIMEOUT_SECONDS)
+    return Job.heartbeat_at > func.now() - timeout
+
+
+def job_crashed():
+    """Condition of running jobs nobody is running any more."""
+    return and_(Job.status == "running", or_(Job.heartbeat_at.is_(None), ~job_alive()))
+
+
+class JobProgress:
+    """Records a running job's progress in short transactions of its own."""
+
+    def __init__(self, job_id: UUID, session_factory: async_sessionmaker = AsyncSessionLocal):
+        self.job_id = job_id
+        self.session_factory = session_factory
+
+    async def __call__(self, progress: int, total: Optional[int] = None) -> None:
+        values = {"progress": progress, "heartbeat_at": func.now()}
+        if total is not None:
+            values["total"] = total
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(Job).where(Job.id == self.job_id).values(**values).returning(Job.status)
+            )
+            status = result.scalar()
+            if status == "paused":
+                # Under the row lock of the update, so a resume sees the run stopped and queues the job
+                await db.execute(update(Job).where(Job.id == self.job_id).values(heartbeat_at=None))
+            await db.commit()
+        if status == "paused":
+            raise JobPaused()
+
+
+async def keep_alive(job_id: UUID, session_factory: async_sessionmaker = AsyncSessionLocal) -> None:
+    """Refresh a job's heartbeat until cancelled, also between progress reports."""
+    while True:
+        await asyncio.sleep(settings.JOB_HEARTBEAT_INTERVAL_SECONDS)
+        async with session_factory() as db:
+            await db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status.in_(("running", "paused")), Job.heartbeat_at.isnot(None))
+                .values(heartbeat_at=func.now())
+            )
+            await db.commit()
+
+
+JobHandler = Callable[[AsyncSession, Job, JobProgress], Awaitable[Optional[dict]]]
+
+
+def job_file(job_id: UUID, suffix: str) -> Path:
+    """Path of a file belonging to a job (export output, import upload)."""
+    directory = Path(settings.JOB_FILES_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / f"{job_id}.{suffix}"
+
+
+async def create_job(
+    db: AsyncSession,
+    kind: str,
+    *,
+    user_id: UUID,
+    project_id: Optional[UUID] = None,
+    idempotency_key: Optional[str] = None,
+    params: Optional[dict] = None
+) -> Tuple[Job, bool]:
+    """Queue a job, or return the active one already doing the same (created False).
+
+    The caller commits, then enqueues the job if it was created.
+    """
+    if idempotency_key is not None:
+        result = await db.execute(
+            select(Job).where(
+                Job.kind == kind,
+                Job.idempotency_key == idempotency_key,
+                Job.status.in_(ACTIVE_JOB_STATUSES),
+            )
+        )
+        existing = result.scalar_one_or_none()
+        if existing is not None:
+            return existing, False
+
+    job = Job(
+        kind=kind,
+        status="queued",
+        project_id=project_id,
+        created_by=user_id,
+        idempotency_key=idempotency_key,
+        params=params or {},
+        progress=0,
+        attempts=0,
+    )
+    db.add(job)
+    await db.flush()
+    await db.refresh(job)
+    return job, True
+
+
+async def find_stalled_jobs(db: AsyncSession, *, queued_for: float) -> List[Job]:
+    """Jobs queued for over `queued_for` seconds (their task may never have
+    reached the broker) and crashed running jobs."""
+    queued_before = func.now() - timedelta(seconds=queued_for)
+    result = await db.execute(
+        select(Job).where(or_(and_(Job.status == "queued", Job.created_at < queued_before), job_crashed()))
+    )
+    return result.scalars().all()
+
+
+async def set_job_paused(db: AsyncSession, job: Job, paused: bool) -> bool:
+    """Pause a queued or running job, or resume a paused or failed one; False if not possible.
+
+    Pausable jobs keep their committed work, so a failed one is resumed like a
+    paused one. A resumed job whose run has not stopped yet goes on running,
+    otherwise it is queued again. The caller commits and enqueues the job if
+    it is queued.
+    """
+    if job.kind not in PAUSABLE_JOB_KINDS:
+        return False
+    if paused:
+        result = await db.execute(
+            update(Job).where(Job.id == job.id, Job.status.in_(ACTIVE_JOB_STATUSES)).values(status="paused")
+        )
+        if not result.rowcount:
+            return False
+        job.status = "paused"
+        return True
+
+    result = await db.execute(
+        update(Job)
+        .where(Job.id == job.id, Job.status.in_(("paused", "failed")))
+        .values(
+            status=case((and_(Job.status == "paused", job_alive()), "running"), else_="queued"),
+            error=None,
+            finished_at=None,
+        )
+        .returning(Job.status)
+    )
+    status = result.scalar()
+    if status is None:
+        return False
+    job.status = status
+    return True
+
+
+async def execute_job(
+    job_id: UUID,
+    handler: JobHandler,
+    *,
+    session_factory: async_sessionmaker = AsyncSessionLocal
+) -> Optional[Job]:
+    """Run a queued or crashed job; returns it, or None when it is finished or running elsewhere."""
+    async with session_factory() as db:
+        result = await db.execute(
+            update(Job)
+            .where(Job.id == job_id, or_(Job.status == "queued", job_crashed()))
+            .values(status="running", started_at=func.now(), heartbeat_at=func.now(), attempts=Job.attempts + 1)
+            .returning(Job)
+        )
+        job = result.scalar_one_or_none()
+        await db.commit()
+        if job is None:
+            return None
+
+        kind = job.kind
+        heartbeat = asyncio.create_task(keep_alive(job_id, session_factory))
+        try:
+            try:
+                job.result = await handler(db, job, JobProgress(job_id, session_factory))
+            finally:
+                heartbeat.cancel()
+            job.status = "succeeded"
+            job.finished_at = datetime.now(timezone.utc)
+            db.add(job)
+            await db.commit()
+        except JobPaused:
+            await db.rollback()
+            await db.refresh(job)
+            return job
+        except Exception as exc:
+            # Rolls back the handler's work and expires the job
+            await db.rollback()
+            logger.exception("Job %s (%s) failed", job_id, kind)
+            await db.execute(
+                update(Job)
+                .where(Job.id == job_id)
+                .values(
+                    status="failed",
+                    error=str(exc)[:1000] or exc.__class__.__name__,
+                    finished_at=datetime.now(timezone.utc),
+                )
+            )
+            await db.commit()
+            await db.refresh(job)
+            return job
+
+    # An upload is only needed until its job succeeds
+    job_file(job_id, "upload").unlink(missing_ok=True)
+    return job
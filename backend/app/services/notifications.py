@@ -0,0 +1,368 @@
+"""Email notifications for task watchers and mentioned users.
+
+The pipeline consumes the task and comment streams written by the outbox
+relay (app.services.outbox) through a Redis consumer group, so it runs off
+the request path. Only the API process holding NOTIFICATIONS_LOCK_ID runs it
+(the others stand by to take over), so all of a task's events are coalesced
+in one place. Events are buffered per task: NOTIFICATION_COALESCE_SECONDS after a task's first
+buffered change, all its changes go out as one email per recipient. Watchers,
+mentioned users and task titles of every due task are resolved together with
+a few set-based queries, and emails are sent over one SMTP connection per
+NOTIFICATION_SMTP_BATCH_SIZE messages.
+
+Stream entries are acknowledged once their emails are sent. A digest
+remembers which recipients a sent batch reached, so after a failed batch
+only the unsent emails are retried. Entries left pending by a stopped
+process are claimed by its successor after a while, so a crash delays
+notifications rather than losing them (or, if it happens right after
+sending, sends them twice).
+"""
+import asyncio
+import json
+import logging
+import os
+import smtplib
+import socket
+import time
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from email.utils import formataddr
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from redis.exceptions import ResponseError
+from sqlalchemy import any_, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.db.session import AsyncSessionLocal, engine
+from app.models.associations import project_members, task_watchers
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Outbox streams carrying events worth notifying about
+NOTIFY_STREAMS = ("task", "comment")
+CONSUMER_GROUP = "notifications"
+READ_COUNT = 500
+# pg_try_advisory_lock key: one pipeline across API processes
+NOTIFICATIONS_LOCK_ID = 7_140_023
+
+
+@dataclass
+class Change:
+    """One line of a task digest."""
+    actor_id: Optional[UUID]
+    text: str
+    # Users notified because they were mentioned, watcher or not
+    mentioned: Tuple[UUID, ...] = ()
+
+
+@dataclass
+class TaskDigest:
+    project_id: Optional[UUID]
+    first_at: float
+    changes: List[Change] = field(default_factory=list)
+    entries: Set[Tuple[str, str]] = field(default_factory=set)  # (stream, entry id)
+    # Recipients already emailed, skipped when a failed send is retried
+    sent_to: Set[UUID] = field(default_factory=set)
+
+
+def describe(event_type: str, payload: dict) -> Optional[Change]:
+    """Digest line for an outbox event, or None when nobody is notified of it."""
+    actor_id = _uuid(payload.get("actor_id"))
+    mentioned = tuple(filter(None, (_uuid(user_id) for user_id in payload.get("mentioned_users") or ())))
+    if event_type == "task.updated":
+        changes = payload.get("changes") or {}
+        text = "; ".join(
+            f"{field_name.replace('_', ' ')}: {_shown(change.get('old'))} → {_shown(change.get('new'))}"
+            for field_name, change in changes.items()
+        )
+        return Change(actor_id, f"Changed {text}") if text else None
+    if event_type == "task.moved":
+        if payload.get("sprint_id") == payload.get("from_sprint_id"):
+            return None
+        return Change(actor_id, "Moved to another sprint" if payload.get("sprint_id") else "Moved to the backlog")
+    if event_type == "comment.created":
+        return Change(actor_id, "New comment", mentioned)
+    if event_type == "comment.updated" and mentioned:
+        return Change(actor_id, "Comment edited", mentioned)
+    return None
+
+
+def _uuid(value) -> Optional[UUID]:
+    try:
+        return UUID(str(value)) if value else None
+    except ValueError:
+        return None
+
+
+def _shown(value) -> str:
+    return "none" if value in (None, "") else str(value)
+
+
+class Mailer:
+    """Sends emails through the SMTP_* settings, one connection per batch."""
+
+    def __init__(
+        self,
+        *,
+        host: str,
+        port: int,
+        use_tls: bool,
+        user: Optional[str],
+        password: Optional[str],
+        sender: str
+    ):
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.user = user
+        self.password = password
+        self.sender = sender
+
+    @classmethod
+    def from_settings(cls) -> "Mailer":
+        return cls(
+            host=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            use_tls=settings.SMTP_TLS,
+            user=settings.SMTP_USER,
+            password=settings.SMTP_PASSWORD,
+            sender=formataddr((settings.EMAILS_FROM_NAME or "", settings.EMAILS_FROM_EMAIL or "")),
+        )
+
+    async def send(self, messages: List[EmailMessage], *, batch_size: int) -> int:
+        """Send messages in batches (smtplib runs in a thread); returns the number sent."""
+        for start in range(0, len(messages), batch_size):
+            await asyncio.to_thread(self._send_batch, messages[start:start + batch_size])
+        return len(messages)
+
+    def _send_batch(self, messages: List[EmailMessage]) -> None:
+        with smtplib.SMTP(self.host, self.port, timeout=30) as smtp:
+            if self.use_tls:
+                smtp.starttls()
+            if self.user:
+                smtp.login(self.user, self.password or "")
+            for message in messages:
+                message["From"] = self.sender
+                smtp.send_message(message)
+
+
+class NotificationPipeline:
+    """Buffers outbox events per task and emails coalesced digests."""
+
+    def __init__(
+        self,
+        *,
+        mailer: Mailer,
+        window: float = settings.NOTIFICATION_COALESCE_SECONDS,
+        batch_size: int = settings.NOTIFICATION_SMTP_BATCH_SIZE
+    ):
+        self.mailer = mailer
+        self.window = window
+        self.batch_size = batch_size
+        self._digests: Dict[UUID, TaskDigest] = {}
+        self._done: List[Tuple[str, str]] = []  # entries to acknowledge without notifying
+
+    def collect(self, stream: str, entry_id: str, fields: dict, *, now: float) -> None:
+        """Add a stream entry (outbox relay fields) to its task's digest."""
+        try:
+            payload = json.loads(fields.get("payload") or "{}")
+            change = describe(fields["type"], payload)
+            task_id = UUID(payload["task_id"] if fields["type"].startswith("comment.") else fields["aggregate_id"])
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Ignoring malformed outbox entry %s on %s", entry_id, stream)
+            change = None
+        if change is None:
+            self._done.append((stream, entry_id))
+            return
+
+        digest = self._digests.get(task_id)
+        if digest is None:
+            digest = self._digests[task_id] = TaskDigest(project_id=_uuid(fields.get("project_id")), first_at=now)
+        if (stream, entry_id) not in digest.entries:
+            digest.entries.add((stream, entry_id))
+            digest.changes.append(change)
+
+    async def flush(self, db: AsyncSession, *, now: float, force: bool = False) -> Tuple[int, List[Tuple[str, str]]]:
+        """Email digests whose window has passed (all with `force`).
+
+        Returns the number of emails sent and the entries to acknowledge.
+        Digests stay buffered when sending fails, remembering the recipients
+        of the batches that went out.
+        """
+        due = {
+            task_id: digest for task_id, digest in self._digests.items()
+            if force or now - digest.first_at >= self.window
+        }
+        outgoing = await self.build(db, due) if due else []
+        sent = 0
+        for start in range(0, len(outgoing), self.batch_size):
+            batch = outgoing[start:start + self.batch_size]
+            sent += await self.mailer.send([message for _, _, message in batch], batch_size=self.batch_size)
+            for task_id, user_id, _ in batch:
+                due[task_id].sent_to.add(user_id)
+
+        entries, self._done = self._done, []
+        for task_id, digest in due.items():
+            entries.extend(digest.entries)
+            del self._digests[task_id]
+        return sent, entries
+
+    async def build(
+        self, db: AsyncSession, digests: Dict[UUID, TaskDigest]
+    ) -> List[Tuple[UUID, UUID, EmailMessage]]:
+        """(task id, recipient id, email) per recipient not yet emailed, resolved with set-based queries."""
+        task_ids = list(digests)
+        result = await db.execute(
+            select(Task.id, Task.task_number, Task.title, Project.key)
+            .join(Project, Project.id == Task.project_id)
+            .where(Task.id == any_(_uuid_array(task_ids)))
+        )
+        tasks = {row.id: row for row in result.all()}
+
+        result = await db.execute(
+            select(task_watchers.c.task_id, User.id, User.email, User.first_name, User.username)
+            .join(User, User.id == task_watchers.c.user_id)
+            .where(task_watchers.c.task_id == any_(_uuid_array(task_ids)), User.is_active.is_(True))
+        )
+        recipients: Dict[UUID, Dict[UUID, tuple]] = {}
+        for row in result.all():
+            recipients.setdefault(row.task_id, {})[row.id] = (row.email, row.first_name or row.username)
+
+        mentioned = {
+            (digest.project_id, user_id)
+            for digest in digests.values()
+            for change in digest.changes
+            for user_id in change.mentioned
+        }
+        actor_ids = {change.actor_id for digest in digests.values() for change in digest.changes if change.actor_id}
+        users = {}
+        members = set()
+        if mentioned or actor_ids:
+            user_ids = actor_ids | {user_id for _, user_id in mentioned}
+            result = await db.execute(
+                select(User.id, User.email, User.first_name, User.username, User.is_active)
+                .where(User.id == any_(_uuid_array(user_ids)))
+            )
+            users = {row.id: row for row in result.all()}
+        if mentioned:
+            # Only project members hear about comments they are mentioned in
+            result = await db.execute(
+                select(project_members.c.project_id, project_members.c.user_id)
+                .where(
+                    project_members.c.user_id == any_(_uuid_array({user_id for _, user_id in mentioned})),
+                    project_members.c.project_id == any_(_uuid_array({project_id for project_id, _ in mentioned})),
+                )
+            )
+            members = {tuple(row) for row in result.all()}
+
+        messages = []
+        for task_id, digest in digests.items():
+            task = tasks.get(task_id)
+            if task is None:  # deleted meanwhile
+                continue
+            task_recipients = dict(recipients.get(task_id, {}))
+            for change in digest.changes:
+                for user_id in change.mentioned:
+                    user = users.get(user_id)
+                    if user is not None and user.is_active and (digest.project_id, user_id) in members:
+                        task_recipients.setdefault(user_id, (user.email, user.first_name or user.username))
+
+            for user_id, (email, name) in task_recipients.items():
+                if user_id in digest.sent_to:
+                    continue
+                lines = [
+                    _line(change, user_id, users)
+                    for change in digest.changes
+                    if change.actor_id != user_id and (user_id in change.mentioned or user_id in recipients.get(task_id, {}))
+                ]
+                if lines:
+                    message = compose_email(email, name, f"{task.key}-{task.task_number}", task.title, lines)
+                    messages.append((task_id, user_id, message))
+        return messages
+
+    async def run(self, *, block_ms: int = 1000, retry_delay: float = 5.0) -> None:
+        """Consume the outbox streams until cancelled."""
+        redis = get_redis()
+        streams = [f"{settings.OUTBOX_STREAM_PREFIX}{name}" for name in NOTIFY_STREAMS]
+        consumer = f"{socket.gethostname()}-{os.getpid()}"
+        # Entries pending this long belong to a stopped worker
+        claim_idle_ms = int((2 * self.window + 60) * 1000)
+        for stream in streams:
+            try:
+                await redis.xgroup_create(stream, CONSUMER_GROUP, id="$", mkstream=True)
+            except ResponseError as exc:
+                if "BUSYGROUP" not in str(exc):
+                    raise
+
+        while True:
+            try:
+                now = time.monotonic()
+                for stream in streams:
+                    _, claimed, *_ = await redis.xautoclaim(
+                        stream, CONSUMER_GROUP, consumer, min_idle_time=claim_idle_ms, count=READ_COUNT
+                    )
+                    for entry_id, fields in claimed:
+                        self.collect(stream, entry_id, fields, now=now)
+                response = await redis.xreadgroup(
+                    CONSUMER_GROUP, consumer, {stream: ">" for stream in streams}, count=READ_COUNT, block=block_ms
+                )
+                now = time.monotonic()
+                for stream, entries in response or []:
+                    for entry_id, fields in entries:
+                        self.collect(stream, entry_id, fields, now=now)
+
+                async with AsyncSessionLocal() as db:
+                    _, entries = await self.flush(db, now=now)
+                for stream in {stream for stream, _ in entries}:
+                    await redis.xack(stream, CONSUMER_GROUP, *[entry_id for name, entry_id in entries if name == stream])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Notification pipeline failed")
+                await asyncio.sleep(retry_delay)
+
+
+def _line(change: Change, recipient_id: UUID, users: dict) -> str:
+    actor = users.get(change.actor_id)
+    text = "You were mentioned in a comment" if recipient_id in change.mentioned else change.text
+    return f"{text} (by {actor.first_name or actor.username})" if actor is not None else text
+
+
+def compose_email(address: str, name: str, task_key: str, title: str, lines: List[str]) -> EmailMessage:
+    message = EmailMessage()
+    message["To"] = formataddr((name or "", address))
+    message["Subject"] = f"[{task_key}] {title}"
+    body = "\n".join(f"- {line}" for line in lines)
+    message.set_content(f"Hi {name},\n\nUpdates on {task_key} {title}:\n\n{body}\n")
+    return message
+
+
+def _uuid_array(ids) -> object:
+    return literal(list(ids), ARRAY(PG_UUID(as_uuid=True)))
+
+
+async def run_notifications(retry_delay: float = 30.0) -> None:
+    """Run the pipeline while holding the advisory lock, or wait to take over, until cancelled."""
+    while True:
+        try:
+            async with engine.connect() as lock_connection:
+                acquired = await lock_connection.scalar(select(func.pg_try_advisory_lock(NOTIFICATIONS_LOCK_ID)))
+                await lock_connection.commit()
+                if acquired:
+                    try:
+                        await NotificationPipeline(mailer=Mailer.from_settings()).run()
+                    finally:
+                        await lock_connection.scalar(select(func.pg_advisory_unlock(NOTIFICATIONS_LOCK_ID)))
+                        await lock_connection.commit()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Notification pipeline lock failed")
+        await asyncio.sleep(retry_delay)
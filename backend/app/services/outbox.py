@@ -0,0 +1,161 @@
+"""Transactional outbox of domain events.
+
+Writers call `record_events` in the transaction of the change, so an event
+exists exactly when its change committed. The relay (one per worker) claims
+the oldest rows with `FOR UPDATE SKIP LOCKED`, XADDs them to the Redis stream
+of their aggregate type (`OUTBOX_STREAM_PREFIX` + `task`, `sprint`, ...) in
+one pipeline and deletes them in the same transaction.
+
+Delivery is at least once: a relay failing between XADD and commit publishes
+the batch again. Concurrent relays work on disjoint batches, so stream order
+only roughly follows commit order; consumers deduplicate and order by the
+`outbox_id` field.
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional, Tuple
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import any_, delete, func, insert, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, BIGINT
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.db.session import AsyncSessionLocal
+from app.models.outbox import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+# aggregate type, aggregate id, project id, event type, payload
+Event = Tuple[str, UUID, Optional[UUID], str, dict]
+
+# Relay throughput is averaged over this many seconds
+THROUGHPUT_WINDOW_SECONDS = 60
+
+
+async def record_events(db: AsyncSession, events: Iterable[Event]) -> None:
+    """Add events to the outbox with one multi-row INSERT; the caller commits."""
+    rows = [
+        {
+            "aggregate_type": aggregate_type,
+            "aggregate_id": aggregate_id,
+            "project_id": project_id,
+            "event_type": event_type,
+            "payload": jsonable_encoder(payload),
+        }
+        for aggregate_type, aggregate_id, project_id, event_type, payload in events
+    ]
+    if rows:
+        await db.execute(insert(OutboxEvent).values(rows))
+
+
+async def record_event(
+    db: AsyncSession,
+    aggregate_type: str,
+    aggregate_id: UUID,
+    event_type: str,
+    *,
+    project_id: Optional[UUID] = None,
+    **payload: Any
+) -> None:
+    await record_events(db, [(aggregate_type, aggregate_id, project_id, event_type, payload)])
+
+
+@dataclass
+class RelayMetrics:
+    """Per-process relay counters."""
+    published: int = 0
+    batches: int = 0
+    last_lag_seconds: Optional[float] = None
+    max_lag_seconds: float = 0.0
+    _recent: deque = field(default_factory=deque)  # (monotonic time, events)
+
+    def record(self, count: int, lag_seconds: float) -> None:
+        now = time.monotonic()
+        self.published += count
+        self.batches += 1
+        self.last_lag_seconds = lag_seconds
+        self.max_lag_seconds = max(self.max_lag_seconds, lag_seconds)
+        self._recent.append((now, count))
+        self._expire(now)
+
+    def throughput(self) -> float:
+        """Events published per second over the last THROUGHPUT_WINDOW_SECONDS."""
+        self._expire(time.monotonic())
+        return sum(count for _, count in self._recent) / THROUGHPUT_WINDOW_SECONDS
+
+    def _expire(self, now: float) -> None:
+        while self._recent and self._recent[0][0] < now - THROUGHPUT_WINDOW_SECONDS:
+            self._recent.popleft()
+
+
+relay_metrics = RelayMetrics()
+
+
+async def relay_batch(db: AsyncSession, *, batch_size: int) -> int:
+    """Publish and delete up to `batch_size` of the oldest unclaimed events; returns their number."""
+    result = await db.execute(
+        select(OutboxEvent)
+        .order_by(OutboxEvent.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    events = result.scalars().all()
+    if not events:
+        return 0
+
+    async with get_redis().pipeline(transaction=False) as pipe:
+        for event in events:
+            pipe.xadd(
+                f"{settings.OUTBOX_STREAM_PREFIX}{event.aggregate_type}",
+                {
+                    "outbox_id": event.id,
+                    "type": event.event_type,
+                    "aggregate_id": str(event.aggregate_id),
+                    "project_id": str(event.project_id) if event.project_id else "",
+                    "payload": json.dumps(event.payload),
+                    "created_at": event.created_at.isoformat(),
+                },
+                maxlen=settings.OUTBOX_STREAM_MAXLEN,
+                approximate=True,
+            )
+        await pipe.execute()
+
+    ids = [event.id for event in events]
+    await db.execute(delete(OutboxEvent).where(OutboxEvent.id == any_(literal(ids, ARRAY(BIGINT)))))
+    await db.commit()
+
+    oldest = min(event.created_at for event in events)
+    relay_metrics.record(len(events), (datetime.now(timezone.utc) - oldest).total_seconds())
+    return len(events)
+
+
+async def get_backlog(db: AsyncSession) -> Tuple[int, Optional[float]]:
+    """(events waiting, age in seconds of the oldest one) across all relays."""
+    result = await db.execute(select(func.count(), func.min(OutboxEvent.created_at)))
+    pending, oldest = result.first() or (0, None)
+    age = (datetime.now(timezone.utc) - oldest).total_seconds() if oldest else None
+    return pending, age
+
+
+async def run_relay(
+    interval: float = settings.OUTBOX_RELAY_INTERVAL_SECONDS,
+    batch_size: int = settings.OUTBOX_RELAY_BATCH_SIZE
+) -> None:
+    """Drain the outbox, then poll every `interval` seconds, until cancelled."""
+    while True:
+        try:
+            while True:
+                async with AsyncSessionLocal() as db:
+                    if await relay_batch(db, batch_size=batch_size) < batch_size:
+                        break
+        except Exception:
+            logger.exception("Outbox relay failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Optional, Set, Tuple
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+_EMPTY: FrozenSet[str] = frozenset()
+
+
+@dataclass(frozen=True)
+class CompiledScheme:
+    """Permission scheme rules indexed by permission key."""
+    scheme_id: UUID
+    version: int
+    # permission_key -> roles / user ids granted by the scheme
+    roles: Dict[str, FrozenSet[str]]
+    users: Dict[str, FrozenSet[str]]
+
+    def allows(self, permission_key: str, *, roles: Set[str], user_id: UUID) -> bool:
+        if self.roles.get(permission_key, _EMPTY) & roles:
+            return True
+        return str(user_id) in self.users.get(permission_key, _EMPTY)
+
+
+def compile_scheme(
+    scheme_id: UUID,
+    version: int,
+    rules: Iterable[Tuple[str, str, str]]
+) -> CompiledScheme:
+    """Compile (permission_key, principal_type, principal_identifier) rules."""
+    roles = defaultdict(set)
+    users = defaultdict(set)
+    for permission_key, principal_type, identifier in rules:
+        if principal_type == "role":
+            roles[permission_key].add(identifier)
+        elif principal_type == "user":
+            users[permission_key].add(identifier)
+
+    return CompiledScheme(
+        scheme_id=scheme_id,
+        version=version,
+        roles={key: frozenset(value) for key, value in roles.items()},
+        users={key: frozenset(value) for key, value in users.items()},
+    )
+
+
+class PermissionSchemeCache:
+    """Per-process cache of compiled permission schemes.
+
+    Entries are keyed by scheme id and only served for the version stored in
+    `permission_schemes.version`, which the permission scheme endpoints bump on
+    every rule change; a stale entry is never used. Invalidations are also
+    broadcast over Redis pub/sub so other workers drop stale entries eagerly.
+    """
+
+    def __init__(self, *, channel: str, use_pubsub: bool = False):
+        self.channel = channel
+        self.use_pubsub = use_pubsub
+        self._schemes: Dict[UUID, CompiledScheme] = {}
+
+    def get(self, scheme_id: UUID, version: int) -> Optional[CompiledScheme]:
+        compiled = self._schemes.get(scheme_id)
+        if compiled is not None and compiled.version == version:
+            return compiled
+        return None
+
+    def put(self, compiled: CompiledScheme) -> CompiledScheme:
+        current = self._schemes.get(compiled.scheme_id)
+        if current is None or current.version <= compiled.version:
+            self._schemes[compiled.scheme_id] = compiled
+        return compiled
+
+    def invalidate(self, scheme_id: UUID, version: Optional[int] = None) -> None:
+        """Drop scheme (only entries older than `version` when given)."""
+        current = self._schemes.get(scheme_id)
+        if current is None:
+            return
+        if version is None or current.version < version:
+            self._schemes.pop(scheme_id, None)
+
+    def clear(self) -> None:
+        self._schemes.clear()
+
+    async def publish_invalidation(self, scheme_id: UUID, version: int) -> None:
+        """Invalidate locally and notify other workers"""
+        self.invalidate(scheme_id, version)
+        if not self.use_pubsub:
+            return
+        message = json.dumps({"scheme_id": str(scheme_id), "version": version})
+        try:
+            await get_redis().publish(self.channel, message)
+        except Exception as exc:
+            logger.warning("Failed to publish permission scheme invalidation: %s", exc)
+
+    def handle_message(self, raw: str) -> None:
+        try:
+            data = json.loads(raw)
+            self.invalidate(UUID(data["scheme_id"]), int(data["version"]))
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed permission scheme invalidation: %r", raw)
+
+    async def listen(self, *, retry_delay: float = 5.0) -> None:
+        """Consume invalidations from Redis until cancelled."""
+        while True:
+            pubsub = get_redis().pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.handle_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Permission scheme invalidation listener failed: %s", exc)
+                # Missed messages are harmless (versions are checked), but
+                # drop everything so stale entries are not kept around
+                self.clear()
+                await asyncio.sleep(retry_delay)
+            finally:
+                await pubsub.aclose()
+
+
+permission_scheme_cache = PermissionSchemeCache(
+    channel=settings.PERMISSION_SCHEME_CACHE_CHANNEL,
+    use_pubsub=settings.PERMISSION_SCHEME_CACHE_PUBSUB,
+)
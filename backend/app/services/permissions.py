@@ -1,169 +1,201 @@
+from dataclasses import dataclass
 from fastapi import HTTPException, status
-from sqlalchemy import select, or_
+from sqlalchemy import select, case
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional, List
+from typing import Optional
 from uuid import UUID
 
 from app.models.project import Project
+from app.models.organization import Organization
 from app.models.permission import PermissionScheme, PermissionSchemeRule
 from app.models.associations import project_members, user_organizations
-from app.services.access import ensure_project_access, ensure_org_member
+from app.services.auth_context import get_auth_context_for
+from app.services.permission_cache import CompiledScheme, compile_scheme, permission_scheme_cache
 
 
-async def check_project_permission(
+# Default permission mappings used when the project scheme grants nothing
+ROLE_PERMISSIONS = {
+    "BROWSE_PROJECTS": ["owner", "admin", "member", "viewer", "lead", "developer", "guest"],
+    "VIEW_ISSUES": ["owner", "admin", "member", "viewer", "lead", "developer", "guest"],
+    "CREATE_ISSUES": ["owner", "admin", "member", "lead", "developer"],
+    "EDIT_ISSUES": ["owner", "admin", "member", "lead", "developer"],
+    "TRANSITION_ISSUES": ["owner", "admin", "member", "lead", "developer"],
+    "MANAGE_SPRINTS": ["owner", "admin", "lead"],
+    "ADMINISTER_PROJECT": ["owner", "admin", "lead"],
+    "COMMENT": ["owner", "admin", "member", "viewer", "lead", "developer"],
+    "DELETE_COMMENT": ["owner", "admin", "lead", "developer"],
+}
+
+
+@dataclass
+class ProjectAccess:
+    """Effective access of one user to one project.
+
+    Built by `resolve_project_access` from a single query and reusable for any
+    number of permission checks on the same project.
+    """
+    project: Project
+    user_id: UUID
+    project_role: Optional[str] = None
+    org_role: Optional[str] = None
+    scheme: Optional[CompiledScheme] = None
+
+    @property
+    def is_creator(self) -> bool:
+        return self.project.created_by == self.user_id
+
+    @property
+    def has_access(self) -> bool:
+        return self.is_creator or self.project_role is not None or self.org_role is not None
+
+    def has_permission(self, permission_key: str) -> bool:
+        """Check permission against scheme rules, then default role mappings."""
+        if not self.has_access:
+            return False
+
+        roles = {role for role in (self.project_role, self.org_role) if role}
+        if self.scheme and self.scheme.allows(permission_key, roles=roles, user_id=self.user_id):
+            return True
+
+        allowed_roles = ROLE_PERMISSIONS.get(permission_key, [])
+        return any(role in allowed_roles for role in roles)
+
+    def ensure_access(self) -> Project:
+        """Raise 403 unless user can access project."""
+        if not self.has_access:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions for this project",
+            )
+        return self.project
+
+    def require(self, permission_key: str) -> Project:
+        """Raise 403 unless user has permission for project."""
+        self.ensure_access()
+        if not self.has_permission(permission_key):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Permission '{permission_key}' required"
+            )
+        return self.project
+
+
+async def resolve_project_access(
     db: AsyncSession,
     *,
     project_id: UUID,
-    user_id: UUID,
-    permission_key: str
-) -> bool:
-    """Check if user has specific permission for project."""
-    project = await ensure_project_access(db, project_id=project_id, user_id=user_id)
-    
-    if not project.permission_scheme_id:
-        # Fallback: use role-based permissions
-        return await _check_role_based_permission(
-            db,
-            project_id=project_id,
-            user_id=user_id,
-            permission_key=permission_key
+    user_id: UUID
+) -> ProjectAccess:
+    """Load project, roles and scheme version in one statement, raise 404 if missing.
+
+    Scheme rules come from the compiled scheme cache and are only queried when
+    the cached version is stale. Decisions are memoized in the request's auth
+    context when one is bound.
+    """
+    context = get_auth_context_for(db, user_id)
+    if context is not None and project_id in context.project_access:
+        return context.project_access[project_id]
+
+    project_role = (
+        select(project_members.c.role)
+        .where(
+            project_members.c.project_id == Project.id,
+            project_members.c.user_id == user_id,
         )
-    
-    # Get permission scheme
-    scheme = await db.get(PermissionScheme, project.permission_scheme_id)
-    if not scheme:
-        return await _check_role_based_permission(
-            db,
-            project_id=project_id,
-            user_id=user_id,
-            permission_key=permission_key
+        .scalar_subquery()
+    )
+    org_member_role = (
+        select(user_organizations.c.role)
+        .where(
+            user_organizations.c.organization_id == Organization.id,
+            user_organizations.c.user_id == user_id,
         )
-    
-    # Get user's role in project
-    project_role = await _get_project_role(db, project_id=project_id, user_id=user_id)
-    org_role = await _get_org_role(db, organization_id=project.organization_id, user_id=user_id)
-    
-    # Check permission scheme rules
-    rules_query = select(PermissionSchemeRule).where(
-        PermissionSchemeRule.scheme_id == scheme.id,
-        PermissionSchemeRule.permission_key == permission_key
+        .scalar_subquery()
     )
-    rules_result = await db.execute(rules_query)
-    rules = rules_result.scalars().all()
-    
-    for rule in rules:
-        if rule.principal_type == "role":
-            if rule.principal_identifier == project_role or rule.principal_identifier == org_role:
-                return True
-        elif rule.principal_type == "user":
-            if rule.principal_identifier == str(user_id):
-                return True
-    
-    # Fallback to role-based
-    return await _check_role_based_permission(
-        db,
-        project_id=project_id,
-        user_id=user_id,
-        permission_key=permission_key
+    org_role = (
+        select(case((Organization.owner_id == user_id, "owner"), else_=org_member_role))
+        .where(Organization.id == Project.organization_id)
+        .scalar_subquery()
+    )
+    scheme_version = (
+        select(PermissionScheme.version)
+        .where(PermissionScheme.id == Project.permission_scheme_id)
+        .scalar_subquery()
     )
 
+    result = await db.execute(
+        select(
+            Project,
+            project_role.label("project_role"),
+            org_role.label("org_role"),
+            scheme_version.label("scheme_version"),
+        ).where(Project.id == project_id, Project.deleted_at.is_(None))
+    )
+    row = result.first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Project not found")
 
-async def require_project_permission(
-    db: AsyncSession,
-    *,
-    project_id: UUID,
-    user_id: UUID,
-    permission_key: str
-) -> Project:
-    """Require specific permission for project, raise 403 if not allowed."""
-    has_permission = await check_project_permission(
-        db,
-        project_id=project_id,
+    scheme = None
+    if row.scheme_version is not None:
+        scheme = await get_compiled_scheme(
+            db,
+            scheme_id=row.Project.permission_scheme_id,
+            version=row.scheme_version,
+        )
+
+    access = ProjectAccess(
+        project=row.Project,
         user_id=user_id,
-        permission_key=permission_key
+        project_role=row.project_role,
+        org_role=row.org_role,
+        scheme=scheme,
     )
-    
-    if not has_permission:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Permission '{permission_key}' required"
-        )
-    
-    return await ensure_project_access(db, project_id=project_id, user_id=user_id)
+    if context is not None:
+        context.project_access[project_id] = access
+    return access
 
 
-async def _get_project_role(
+async def get_compiled_scheme(
     db: AsyncSession,
     *,
-    project_id: UUID,
-    user_id: UUID
-) -> Optional[str]:
-    """Get user's role in project."""
-    query = select(project_members.c.role).where(
-        project_members.c.project_id == project_id,
-        project_members.c.user_id == user_id
+    scheme_id: UUID,
+    version: int
+) -> CompiledScheme:
+    """Return compiled scheme for version, loading rules on cache miss."""
+    compiled = permission_scheme_cache.get(scheme_id, version)
+    if compiled is not None:
+        return compiled
+
+    result = await db.execute(
+        select(
+            PermissionSchemeRule.permission_key,
+            PermissionSchemeRule.principal_type,
+            PermissionSchemeRule.principal_identifier,
+        ).where(PermissionSchemeRule.scheme_id == scheme_id)
     )
-    result = await db.execute(query)
-    return result.scalar_one_or_none()
+    return permission_scheme_cache.put(compile_scheme(scheme_id, version, result.all()))
 
 
-async def _get_org_role(
+async def check_project_permission(
     db: AsyncSession,
     *,
-    organization_id: UUID,
-    user_id: UUID
-) -> Optional[str]:
-    """Get user's role in organization."""
-    from app.models.organization import Organization
-    
-    org = await db.get(Organization, organization_id)
-    if org and org.owner_id == user_id:
-        return "owner"
-    
-    query = select(user_organizations.c.role).where(
-        user_organizations.c.organization_id == organization_id,
-        user_organizations.c.user_id == user_id
-    )
-    result = await db.execute(query)
-    return result.scalar_one_or_none()
+    project_id: UUID,
+    user_id: UUID,
+    permission_key: str
+) -> bool:
+    """Check if user has specific permission for project."""
+    access = await resolve_project_access(db, project_id=project_id, user_id=user_id)
+    access.ensure_access()
+    return access.has_permission(permission_key)
 
 
-async def _check_role_based_permission(
+async def require_project_permission(
     db: AsyncSession,
     *,
     project_id: UUID,
     user_id: UUID,
     permission_key: str
-) -> bool:
-    """Fallback role-based permission check."""
-    project = await db.get(Project, project_id)
-    if not project:
-        return False
-    
-    # Get roles
-    project_role = await _get_project_role(db, project_id=project_id, user_id=user_id)
-    org_role = await _get_org_role(db, organization_id=project.organization_id, user_id=user_id)
-    
-    # Default permission mappings
-    permission_mappings = {
-        "BROWSE_PROJECTS": ["owner", "admin", "member", "viewer", "lead", "developer", "guest"],
-        "VIEW_ISSUES": ["owner", "admin", "member", "viewer", "lead", "developer", "guest"],
-        "CREATE_ISSUES": ["owner", "admin", "member", "lead", "developer"],
-        "EDIT_ISSUES": ["owner", "admin", "member", "lead", "developer"],
-        "TRANSITION_ISSUES": ["owner", "admin", "member", "lead", "developer"],
-        "MANAGE_SPRINTS": ["owner", "admin", "lead"],
-        "ADMINISTER_PROJECT": ["owner", "admin", "lead"],
-        "COMMENT": ["owner", "admin", "member", "viewer", "lead", "developer"],
-        "DELETE_COMMENT": ["owner", "admin", "lead", "developer"],
-    }
-    
-    allowed_roles = permission_mappings.get(permission_key, [])
-    
-    # Check project role first, then org role
-    if project_role and project_role in allowed_roles:
-        return True
-    if org_role and org_role in allowed_roles:
-        return True
-    
-    return False
-
+) -> Project:
+    """Require specific permission for project, raise 403 if not allowed."""
+    access = await resolve_project_access(db, project_id=project_id, user_id=user_id)
+    return access.require(permission_key)
@@ -0,0 +1,111 @@
+import json
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated user fields needed by request handlers."""
+    id: UUID
+    is_active: bool
+    is_superuser: bool
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["id"] = str(self.id)
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "Principal":
+        data = json.loads(raw)
+        return cls(
+            id=UUID(data["id"]),
+            is_active=bool(data["is_active"]),
+            is_superuser=bool(data["is_superuser"]),
+        )
+
+
+class PrincipalCache:
+    """TTL cache of principals keyed by the JWT `sub` claim.
+
+    Entries always live in process memory. When `use_redis` is enabled they are
+    also written to Redis, so a principal loaded by one worker is reused by the
+    others and an invalidation removes it everywhere. Entries already held in
+    another worker's memory expire after `ttl_seconds`.
+    """
+
+    key_prefix = "principal:"
+
+    def __init__(self, *, ttl_seconds: int, max_size: int, use_redis: bool = False):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.use_redis = use_redis
+        self._entries: Dict[str, Tuple[float, Principal]] = {}
+
+    async def get(self, sub: str) -> Optional[Principal]:
+        """Return cached principal or None on miss/expiry"""
+        if self.ttl_seconds <= 0:
+            return None
+
+        entry = self._entries.get(sub)
+        if entry:
+            expires_at, principal = entry
+            if expires_at > time.monotonic():
+                return principal
+            self._entries.pop(sub, None)
+
+        if self.use_redis:
+            raw = await self._redis_call("get", self.key_prefix + sub)
+            if raw:
+                principal = Principal.from_json(raw)
+                self._store_local(sub, principal)
+                return principal
+
+        return None
+
+    async def set(self, sub: str, principal: Principal) -> None:
+        """Cache principal for `sub`"""
+        if self.ttl_seconds <= 0:
+            return
+
+        self._store_local(sub, principal)
+        if self.use_redis:
+            await self._redis_call(
+                "set", self.key_prefix + sub, principal.to_json(), ex=self.ttl_seconds
+            )
+
+    async def invalidate(self, sub: str) -> None:
+        """Drop cached principal for `sub`"""
+        self._entries.pop(sub, None)
+        if self.use_redis:
+            await self._redis_call("delete", self.key_prefix + sub)
+
+    def clear(self) -> None:
+        """Drop all in-process entries"""
+        self._entries.clear()
+
+    def _store_local(self, sub: str, principal: Principal) -> None:
+        if sub not in self._entries and len(self._entries) >= self.max_size:
+            # Evict the entry closest to expiry
+            oldest = min(self._entries, key=lambda key: self._entries[key][0])
+            self._entries.pop(oldest, None)
+        self._entries[sub] = (time.monotonic() + self.ttl_seconds, principal)
+
+    async def _redis_call(self, method: str, *args, **kwargs):
+        # Redis is an optional backing store: on errors fall back to memory only
+        try:
+            return await getattr(get_redis(), method)(*args, **kwargs)
+        except Exception:
+            return None
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    use_redis=settings.PRINCIPAL_CACHE_USE_REDIS,
+)
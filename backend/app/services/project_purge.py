@@ -0,0 +1,131 @@
+"""Background purge of deleted projects.
+
+Deleting a project only sets `deleted_at`, which hides it at once, and queues
+a project.delete job running `purge_project`. The purge removes the
+project's rows table by table, dependents first, in chunks of
+PROJECT_PURGE_CHUNK_SIZE rows. Each chunk is its own short transaction
+followed by a PROJECT_PURGE_PAUSE_SECONDS breather, so locks are brief, WAL
+is written at a pace replicas keep up with and foreground queries are not
+starved. The ON DELETE CASCADE constraints find nothing left to cascade to.
+
+Every chunk deletes part of what is left, so the purge resumes after a
+pause, a crash, a redelivered task or a failure (via the job's resume
+endpoint) without any state beyond the job's progress count.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import List
+from uuid import UUID
+
+from sqlalchemy import delete, func, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.associations import project_members, task_watchers
+from app.models.attachment import Attachment
+from app.models.comment import Comment
+from app.models.job import Job
+from app.models.project import Project
+from app.models.saved_view import SavedView
+from app.models.sprint import Sprint, SprintBurndownSnapshot
+from app.models.status_count import ProjectStatusCount
+from app.models.task import Task, TaskDependency, TaskHistory, TaskStatusTransition
+from app.services.jobs import JobProgress
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PurgeStep:
+    table: str
+    key: list  # primary key columns
+    condition: object
+    # False for steps deleting a subset of the next step's rows
+    counted: bool = True
+
+
+def purge_steps(project_id: UUID) -> List[PurgeStep]:
+    """Tables of a project in deletion order."""
+    tasks = select(Task.id).where(Task.project_id == project_id)
+    sprints = select(Sprint.id).where(Sprint.project_id == project_id)
+    return [
+        PurgeStep("task_history", [TaskHistory.id, TaskHistory.created_at], TaskHistory.task_id.in_(tasks)),
+        PurgeStep("task_status_transitions", [TaskStatusTransition.id], TaskStatusTransition.project_id == project_id),
+        # Replies first: deleting a parent would cascade to an unbounded number of them
+        PurgeStep(
+            "comments", [Comment.id], Comment.task_id.in_(tasks) & Comment.parent_comment_id.isnot(None), counted=False
+        ),
+        PurgeStep("comments", [Comment.id], Comment.task_id.in_(tasks)),
+        PurgeStep("attachments", [Attachment.id], Attachment.task_id.in_(tasks)),
+        PurgeStep(
+            "task_watchers", [task_watchers.c.task_id, task_watchers.c.user_id], task_watchers.c.task_id.in_(tasks)
+        ),
+        PurgeStep(
+            "task_dependencies",
+            [TaskDependency.task_id, TaskDependency.depends_on_task_id],
+            or_(TaskDependency.task_id.in_(tasks), TaskDependency.depends_on_task_id.in_(tasks)),
+        ),
+        # Subtasks first, for the same reason as replies
+        PurgeStep(
+            "tasks", [Task.id], (Task.project_id == project_id) & Task.parent_task_id.isnot(None), counted=False
+        ),
+        PurgeStep("tasks", [Task.id], Task.project_id == project_id),
+        PurgeStep("project_status_counts", [ProjectStatusCount.id], ProjectStatusCount.project_id == project_id),
+        PurgeStep(
+            "sprint_burndown_snapshots",
+            [SprintBurndownSnapshot.sprint_id, SprintBurndownSnapshot.day],
+            SprintBurndownSnapshot.sprint_id.in_(sprints),
+        ),
+        PurgeStep("sprints", [Sprint.id], Sprint.project_id == project_id),
+        PurgeStep("saved_views", [SavedView.id], SavedView.project_id == project_id),
+        PurgeStep(
+            "project_members",
+            [project_members.c.project_id, project_members.c.user_id],
+            project_members.c.project_id == project_id,
+        ),
+    ]
+
+
+async def count_rows(db: AsyncSession, project_id: UUID) -> int:
+    """Rows left to purge, including the project, for progress reporting."""
+    total = 1
+    for step in purge_steps(project_id):
+        if step.counted:
+            result = await db.execute(select(func.count()).select_from(step.key[0].table).where(step.condition))
+            total += result.scalar()
+    return total
+
+
+async def delete_chunk(db: AsyncSession, key: list, condition, chunk_size: int) -> int:
+    """Delete up to `chunk_size` rows matching condition in one transaction; returns their number."""
+    table = key[0].table
+    chunk = select(*key).where(condition).limit(chunk_size)
+    column = tuple_(*key) if len(key) > 1 else key[0]
+    result = await db.execute(delete(table).where(column.in_(chunk)))
+    await db.commit()
+    return result.rowcount
+
+
+async def purge_project(db: AsyncSession, job: Job, progress: JobProgress) -> dict:
+    """Handler of project.delete jobs; commits chunk by chunk and is resumable."""
+    project_id = job.project_id
+    chunk_size = settings.PROJECT_PURGE_CHUNK_SIZE
+    deleted = job.progress
+    if job.total is None:
+        await progress(deleted, deleted + await count_rows(db, project_id))
+
+    for step in purge_steps(project_id):
+        while True:
+            count = await delete_chunk(db, step.key, step.condition, chunk_size)
+            deleted += count
+            # Also where a pause request is noticed
+            await progress(deleted)
+            if count < chunk_size:
+                break
+            await asyncio.sleep(settings.PROJECT_PURGE_PAUSE_SECONDS)
+        logger.info("Purged %s of project %s", step.table, project_id)
+
+    result = await db.execute(delete(Project).where(Project.id == project_id, Project.deleted_at.isnot(None)))
+    deleted += result.rowcount
+    return {"deleted_rows": deleted}
@@ -0,0 +1,156 @@
+"""Lexicographic ranks for backlog ordering.
+
+A rank is a base-62 fraction written as a string (``"V"`` ~ 0.5). Ranks are
+compared bytewise (``COLLATE "C"``), never end in ``"0"``, and a new rank can
+always be generated strictly between two others, so moving a task only
+rewrites that task's row. Ranks grow longer after many moves into the same
+gap; `rebalance_ranks` rewrites a list with short, evenly spaced ranks.
+Appends step the last rank by a fixed amount instead of halving the open
+gap above it, so appended ranks stay APPEND_WIDTH characters long.
+"""
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, update
+
+from app.db.session import AsyncSessionLocal
+from app.models.task import Task
+
+ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(ALPHABET)
+_INDEX = {char: index for index, char in enumerate(ALPHABET)}
+
+REBALANCE_BATCH_SIZE = 1000
+# Digits of an appended rank; leaves room for millions of appends
+APPEND_WIDTH = 4
+
+
+def rank_between(lower: Optional[str], upper: Optional[str]) -> str:
+    """Return rank strictly between `lower` and `upper` (None = open end)."""
+    lower = lower or ""
+    if upper is not None and lower >= upper:
+        raise ValueError(f"Cannot rank between {lower!r} and {upper!r}")
+
+    digits = []
+    index = 0
+    while True:
+        lo = _INDEX[lower[index]] if index < len(lower) else 0
+        hi = _INDEX[upper[index]] if upper is not None and index < len(upper) else BASE
+        if lo == hi:
+            digits.append(ALPHABET[lo])
+        else:
+            mid = (lo + hi) // 2
+            if mid > lo:
+                digits.append(ALPHABET[mid])
+                return "".join(digits)
+            # Adjacent digits: keep the lower one, the rest only has to exceed `lower`
+            digits.append(ALPHABET[lo])
+            upper = None
+        index += 1
+
+
+def spread_ranks(count: int) -> List[str]:
+    """Return `count` short, evenly spaced, increasing ranks."""
+    if count <= 0:
+        return []
+
+    width = 1
+    while BASE ** width <= count * 2:
+        width += 1
+    step = BASE ** width // (count + 1)
+
+    ranks = []
+    for position in range(1, count + 1):
+        value = position * step
+        chars = []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            chars.append(ALPHABET[digit])
+        ranks.append("".join(reversed(chars)).rstrip("0"))
+    return ranks
+
+
+def rank_after(lower: Optional[str]) -> str:
+    """Return rank greater than `lower` for appending, at most APPEND_WIDTH digits past any leading "z"s."""
+    if lower is None:
+        return rank_between(None, None)
+    # The digit after the leading "z"s is never "z", so the increment never carries out of the rank
+    width = len(lower) - len(lower.lstrip("z")) + APPEND_WIDTH
+    # Dropping digits past `width` and adding one in the last place exceeds `lower`
+    digits = [_INDEX[char] for char in lower[:width].ljust(width, "0")]
+    index = width - 1
+    while digits[index] == BASE - 1:
+        digits[index] = 0
+        index -= 1
+    digits[index] += 1
+    return "".join(ALPHABET[digit] for digit in digits[:index + 1])
+
+
+def ranks_after(lower: Optional[str], count: int) -> List[str]:
+    """Return `count` increasing ranks greater than `lower` (appending to a list)."""
+    ranks = []
+    for _ in range(count):
+        lower = rank_after(lower)
+        ranks.append(lower)
+    return ranks
+
+
+def ranks_between(lower: Optional[str], upper: Optional[str], count: int) -> List[str]:
+    """Return `count` increasing ranks strictly between `lower` and `upper`."""
+    # The prefix is below `upper` at a digit `upper` has, so its extensions stay below it too
+    prefix = rank_between(lower, upper)
+    return [prefix + rank for rank in spread_ranks(count)]
+
+
+def reordered_ranks(
+    ranked: List[Tuple[UUID, Optional[str]]], moved: List[Tuple[UUID, int]]
+) -> Dict[UUID, str]:
+    """New ranks of `moved` tasks (task id, index in the reordered list).
+
+    `ranked` is the whole list in rank order. The other tasks keep their
+    ranks and relative order; each run of moved tasks gets ranks between the
+    untouched tasks around it. Tasks not in `ranked` are ignored.
+    """
+    listed = {task_id for task_id, _ in ranked}
+    moved = sorted((item for item in moved if item[0] in listed), key=lambda item: item[1])
+    moved_ids = {task_id for task_id, _ in moved}
+    order = [(task_id, rank, False) for task_id, rank in ranked if task_id not in moved_ids]
+    for task_id, index in moved:
+        order.insert(min(max(index, 0), len(order)), (task_id, None, True))
+
+    ranks: Dict[UUID, str] = {}
+    lower: Optional[str] = None
+    run: List[UUID] = []
+    # The end of the list closes the last run with an open upper bound
+    for task_id, rank, is_moved in order + [(None, None, False)]:
+        if is_moved:
+            run.append(task_id)
+            continue
+        if run:
+            ranks.update(zip(run, ranks_between(lower, rank, len(run))))
+            run = []
+        if rank is not None:
+            lower = rank
+    return ranks
+
+
+async def rebalance_ranks(*, project_id: UUID, sprint_id: Optional[UUID] = None) -> int:
+    """Rewrite ranks of one backlog list (project + sprint) evenly; returns task count."""
+    async with AsyncSessionLocal() as db:
+        sprint_filter = Task.sprint_id == sprint_id if sprint_id else Task.sprint_id.is_(None)
+        result = await db.execute(
+            select(Task.id)
+            .where(Task.project_id == project_id, sprint_filter)
+            .order_by(Task.rank.asc().nulls_last(), Task.created_at.asc())
+            .with_for_update()
+        )
+        task_ids = result.scalars().all()
+
+        rows = [{"id": task_id, "rank": rank} for task_id, rank in zip(task_ids, spread_ranks(len(task_ids)))]
+        for start in range(0, len(rows), REBALANCE_BATCH_SIZE):
+            await db.execute(
+                update(Task).execution_options(synchronize_session=False),
+                rows[start:start + REBALANCE_BATCH_SIZE],
+            )
+        await db.commit()
+        return len(task_ids)
@@ -0,0 +1,167 @@
+"""Precomputed saved view results.
+
+Each view stores its result count and the task ids of its first page. Task
+writes call `apply_task_change`, which evaluates the view filters in Python
+against the task before and after the change and adjusts the stored results
+with at most three set-based UPDATEs in the writer's transaction:
+
+* a new matching task is prepended to the first page (lists are newest first);
+* a task that starts matching increments the count and drops the page;
+* a task that stops matching decrements the count and drops the page if it
+  was on it.
+
+Dropped pages (and counts, for bulk changes) are recomputed on the next read.
+Writers lock every view of the project, cached or not, so a recomputation
+either waits for an uncommitted task write and counts it, or runs first and
+has that write's delta applied on top.
+Views whose filter uses `now` / `today` are also recomputed once their
+results are older than SAVED_VIEW_TIME_FILTER_TTL_SECONDS.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import case, func, literal, select, update, any_
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, array
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud.task import task as crud_task
+from app.models.saved_view import SavedView
+from app.models.task import Task
+from app.services.task_filter import TaskFilter, compile_filter
+
+
+def view_filter(view: SavedView) -> Optional[TaskFilter]:
+    return compile_filter(view.filter) if view.filter else None
+
+
+def _matches(task_filter: Optional[TaskFilter], values: Optional[dict], owner_id: UUID, now: datetime) -> bool:
+    if values is None:
+        return False
+    return task_filter is None or task_filter.matches(values, user_id=owner_id, now=now)
+
+
+async def apply_task_change(
+    db: AsyncSession,
+    *,
+    task: Task,
+    before: Optional[dict],
+    after: Optional[dict]
+) -> None:
+    """Update cached results of the project's views for one task write.
+
+    `before` / `after` are `task_values` snapshots; None for create / delete.
+    """
+    # Uncached views are locked too: a reader recomputing one waits for this write
+    result = await db.execute(
+        select(SavedView.id, SavedView.owner_id, SavedView.filter, SavedView.cached_at)
+        .where(SavedView.project_id == task.project_id)
+        .order_by(SavedView.id)
+        .with_for_update()
+    )
+    now = datetime.now(timezone.utc)
+    prepend, added, removed = [], [], []
+    for view in result.all():
+        if view.cached_at is None:
+            continue
+        task_filter = view_filter(view)
+        was = _matches(task_filter, before, view.owner_id, now)
+        is_ = _matches(task_filter, after, view.owner_id, now)
+        if is_ and not was:
+            (prepend if before is None else added).append(view.id)
+        elif was and not is_:
+            removed.append(view.id)
+
+    task_id = literal(task.id, PG_UUID(as_uuid=True))
+    if prepend:
+        page = (array([task_id]).op("||")(SavedView.cached_task_ids))
+        await _update_views(
+            db, prepend,
+            cached_count=SavedView.cached_count + 1,
+            cached_task_ids=case(
+                (SavedView.cached_task_ids.is_(None), None),
+                else_=func.trim_array(page, func.greatest(func.cardinality(page) - SavedView.page_size, 0)),
+            ),
+        )
+    if added:
+        await _update_views(db, added, cached_count=SavedView.cached_count + 1, cached_task_ids=None)
+    if removed:
+        await _update_views(
+            db, removed,
+            cached_count=SavedView.cached_count - 1,
+            cached_task_ids=case(
+                (task_id == any_(SavedView.cached_task_ids), None),
+                else_=SavedView.cached_task_ids,
+            ),
+        )
+
+
+async def invalidate_project_views(db: AsyncSession, *, project_ids: Iterable[UUID]) -> None:
+    """Drop cached results of all views of projects (after bulk writes)."""
+    project_ids = list(project_ids)
+    if not project_ids:
+        return
+    await db.execute(
+        update(SavedView)
+        .where(SavedView.project_id == any_(literal(project_ids, ARRAY(PG_UUID(as_uuid=True)))))
+        .values(cached_count=None, cached_task_ids=None, cached_at=None, updated_at=SavedView.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _update_views(db: AsyncSession, view_ids: List[UUID], **values) -> None:
+    # Cache maintenance is not an edit of the view: keep updated_at
+    await db.execute(
+        update(SavedView)
+        .where(SavedView.id == any_(literal(view_ids, ARRAY(PG_UUID(as_uuid=True)))))
+        .values(updated_at=SavedView.updated_at, **values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _is_fresh(view: SavedView, task_filter: Optional[TaskFilter], now: datetime) -> bool:
+    if view.cached_at is None:
+        return False
+    if task_filter is not None and task_filter.uses_time:
+        return view.cached_at > now - timedelta(seconds=settings.SAVED_VIEW_TIME_FILTER_TTL_SECONDS)
+    return True
+
+
+async def get_view_results(db: AsyncSession, *, view: SavedView) -> Tuple[int, List[Task]]:
+    """Return (count, first page) from the cache, recomputing stale parts.
+
+    The caller commits when results were recomputed.
+    """
+    task_filter = view_filter(view)
+    now = datetime.now(timezone.utc)
+    if _is_fresh(view, task_filter, now) and view.cached_task_ids is not None:
+        tasks = await crud_task.get_many(db, ids=view.cached_task_ids)
+        by_id = {task.id: task for task in tasks}
+        return view.cached_count, [by_id[task_id] for task_id in view.cached_task_ids if task_id in by_id]
+
+    # Lock the row so concurrent task writes apply their deltas after this
+    # recomputation instead of being overwritten by it
+    result = await db.execute(
+        select(SavedView)
+        .where(SavedView.id == view.id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    view = result.scalar_one()
+    clause = task_filter.clause(user_id=view.owner_id, now=now) if task_filter else None
+
+    values = {}
+    count = view.cached_count
+    if not _is_fresh(view, task_filter, now):
+        query = select(func.count()).select_from(Task).where(Task.project_id == view.project_id)
+        if clause is not None:
+            query = query.where(clause)
+        count = (await db.execute(query)).scalar()
+        values.update(cached_count=count, cached_at=now)
+
+    tasks = await crud_task.get_by_project(
+        db, project_id=view.project_id, limit=view.page_size, filter_clause=clause
+    )
+    await _update_views(db, [view.id], cached_task_ids=[task.id for task in tasks], **values)
+    return count, tasks
@@ -0,0 +1,100 @@
+"""Full-text task search.
+
+Titles, descriptions and comment contents are matched against the generated
+`search_vector` columns (GIN-indexed) and ranked with `ts_rank`; comment hits
+count for half. Queries shaped like a task key (`PROJ-12`) additionally match
+tasks whose key starts with it (PROJ-12, PROJ-120..129, ...) and rank those
+first. Results are paged by a (rank, id) keyset.
+"""
+import re
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import REAL, cast, func, literal, literal_column, or_, select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.task import task as crud_task
+from app.models.comment import Comment
+from app.models.project import Project
+from app.models.task import Task
+
+# Must match the configuration of the generated search_vector columns
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+
+COMMENT_WEIGHT = 0.5
+KEY_MATCH_RANK = 100.0
+MAX_TASK_NUMBER = 2 ** 31 - 1
+
+_TASK_KEY = re.compile(r"^\s*([A-Za-z][A-Za-z0-9]*)-(\d+)\s*$")
+
+
+def parse_task_key(q: str) -> Optional[Tuple[str, str]]:
+    """Return (project key, number prefix) if `q` looks like a task key."""
+    match = _TASK_KEY.match(q)
+    if not match:
+        return None
+    return match.group(1).upper(), match.group(2)
+
+
+def task_number_ranges(prefix: str) -> List[Tuple[int, int]]:
+    """Inclusive task number ranges whose decimal form starts with `prefix`."""
+    low = int(prefix)
+    if low == 0 or str(low) != prefix:
+        return []
+
+    ranges = []
+    high = low
+    while low <= MAX_TASK_NUMBER:
+        ranges.append((low, min(high, MAX_TASK_NUMBER)))
+        low, high = low * 10, high * 10 + 9
+    return ranges
+
+
+async def search_tasks(
+    db: AsyncSession,
+    *,
+    q: str,
+    user_id: UUID,
+    project_id: Optional[UUID] = None,
+    limit: int = 20,
+    after: Optional[Tuple[float, UUID]] = None
+) -> List[Tuple[Task, float]]:
+    """Return (task, rank) pairs, best first, for tasks visible to the user."""
+    scope = Task.project_id == project_id if project_id else crud_task.visible_to(user_id)
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+
+    branches = [
+        select(Task.id.label("task_id"), cast(func.ts_rank(Task.search_vector, tsquery), REAL).label("rank"))
+        .where(Task.search_vector.op("@@")(tsquery), scope),
+        select(Comment.task_id, cast(func.ts_rank(Comment.search_vector, tsquery) * COMMENT_WEIGHT, REAL))
+        .join(Task, Task.id == Comment.task_id)
+        .where(Comment.search_vector.op("@@")(tsquery), Comment.deleted_at.is_(None), scope),
+    ]
+
+    task_key = parse_task_key(q)
+    number_ranges = task_number_ranges(task_key[1]) if task_key else []
+    if number_ranges:
+        branches.append(
+            select(Task.id, cast(literal(KEY_MATCH_RANK), REAL))
+            .join(Project, Project.id == Task.project_id)
+            .where(
+                Project.key == task_key[0],
+                or_(*[Task.task_number.between(low, high) for low, high in number_ranges]),
+                scope,
+            )
+        )
+
+    matches = union_all(*branches).subquery("matches")
+    ranked = (
+        select(matches.c.task_id, func.max(matches.c.rank).label("rank"))
+        .group_by(matches.c.task_id)
+        .subquery("ranked")
+    )
+
+    query = select(Task, ranked.c.rank).join(ranked, ranked.c.task_id == Task.id)
+    if after:
+        query = query.where(tuple_(ranked.c.rank, Task.id) < tuple_(*after))
+    query = query.order_by(ranked.c.rank.desc(), Task.id.desc()).limit(limit)
+
+    result = await db.execute(query)
+    return [(row.Task, row.rank) for row in result.all()]
@@ -0,0 +1,130 @@
+"""Local SMTP sink for tests and development.
+
+Accepts mail over plain SMTP (no TLS, no auth) and keeps it in memory instead
+of delivering it. Point SMTP_HOST/SMTP_PORT at it with SMTP_TLS=false.
+
+Usage:
+    python -m app.services.smtp_sink --port 1025
+"""
+import argparse
+import asyncio
+from dataclasses import dataclass
+from email import message_from_bytes, policy
+from email.message import EmailMessage
+from typing import List, Optional
+
+
+@dataclass
+class ReceivedMail:
+    sender: str
+    recipients: List[str]
+    message: EmailMessage
+
+
+class SmtpSink:
+    """Minimal SMTP server storing received messages in `messages`."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, *, echo: bool = False):
+        self.host = host
+        self.port = port
+        self.echo = echo
+        self.messages: List[ReceivedMail] = []
+        self.connections = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> int:
+        """Start listening; returns the bound port."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "SmtpSink":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+
+        async def reply(line: str) -> None:
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        sender, recipients = "", []
+        await reply("220 smtp-sink ESMTP")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode("utf-8", "replace").strip()
+                verb = command[:4].upper()
+                if verb == "EHLO":
+                    await reply("250-smtp-sink")
+                    await reply("250 8BITMIME")
+                elif verb == "HELO":
+                    await reply("250 smtp-sink")
+                elif verb == "MAIL":
+                    sender, recipients = _address(command), []
+                    await reply("250 OK")
+                elif verb == "RCPT":
+                    recipients.append(_address(command))
+                    await reply("250 OK")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    message = message_from_bytes(await _read_data(reader), policy=policy.default)
+                    self.messages.append(ReceivedMail(sender, recipients, message))
+                    if self.echo:
+                        print(f"📧 {sender} -> {', '.join(recipients)}: {message['Subject']}")
+                    sender, recipients = "", []
+                    await reply("250 OK")
+                elif verb == "RSET":
+                    sender, recipients = "", []
+                    await reply("250 OK")
+                elif verb == "NOOP":
+                    await reply("250 OK")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        finally:
+            writer.close()
+
+
+def _address(command: str) -> str:
+    _, _, value = command.partition(":")
+    return value.strip().split(" ")[0].strip("<>")
+
+
+async def _read_data(reader: asyncio.StreamReader) -> bytes:
+    lines = []
+    while True:
+        line = await reader.readline()
+        if line in (b".\r\n", b".\n", b""):
+            return b"".join(lines)
+        # Undo dot-stuffing
+        lines.append(line[1:] if line.startswith(b"..") else line)
+
+
+async def serve(host: str, port: int) -> None:
+    sink = SmtpSink(host, port, echo=True)
+    await sink.start()
+    print(f"📭 SMTP sink listening on {host}:{sink.port}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port))
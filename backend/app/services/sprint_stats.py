@@ -0,0 +1,95 @@
+"""Cached sprint statistics.
+
+Statistics are computed by `crud_sprint.get_stats` / `get_stats_batch` and
+cached per process under the sprint's `stats_version`. Task writes that can
+change a sprint's statistics bump that version in their own transaction
+(`invalidate_sprint_stats`), so once they commit every worker sees a new
+version and recomputes; a stale entry is never served. Entries computed
+while a write commits are at worst fresher than their version.
+"""
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import any_, literal, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud.sprint import sprint as crud_sprint
+from app.models.sprint import Sprint
+
+# Task attributes the statistics depend on
+STATS_FIELDS = ("sprint_id", "status", "story_points", "estimated_hours", "logged_hours")
+
+
+class SprintStatsCache:
+    """LRU of sprint id -> (stats_version, stats)."""
+
+    def __init__(self, *, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[UUID, Tuple[int, dict]]" = OrderedDict()
+
+    def get(self, sprint_id: UUID, version: int) -> Optional[dict]:
+        entry = self._entries.get(sprint_id)
+        if entry is None or entry[0] != version:
+            return None
+        self._entries.move_to_end(sprint_id)
+        return dict(entry[1])
+
+    def put(self, sprint_id: UUID, version: int, stats: dict) -> None:
+        current = self._entries.get(sprint_id)
+        if current is not None and current[0] > version:
+            return
+        self._entries[sprint_id] = (version, dict(stats))
+        self._entries.move_to_end(sprint_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+sprint_stats_cache = SprintStatsCache(max_size=settings.SPRINT_STATS_CACHE_SIZE)
+
+
+def stats_changed(before: dict, after: dict) -> bool:
+    return any(before.get(field) != after.get(field) for field in STATS_FIELDS)
+
+
+async def get_sprint_stats(db: AsyncSession, *, sprint: Sprint) -> dict:
+    """Statistics of one sprint, from the cache when its version matches."""
+    stats = sprint_stats_cache.get(sprint.id, sprint.stats_version)
+    if stats is None:
+        stats = await crud_sprint.get_stats(db, sprint_id=sprint.id)
+        sprint_stats_cache.put(sprint.id, sprint.stats_version, stats)
+    return stats
+
+
+async def get_sprints_stats(db: AsyncSession, *, sprints: List[Sprint]) -> Dict[UUID, dict]:
+    """Statistics of many sprints; cache misses are computed in one query."""
+    stats = {}
+    for sprint in sprints:
+        cached = sprint_stats_cache.get(sprint.id, sprint.stats_version)
+        if cached is not None:
+            stats[sprint.id] = cached
+
+    missing = [sprint for sprint in sprints if sprint.id not in stats]
+    computed = await crud_sprint.get_stats_batch(db, sprint_ids=[sprint.id for sprint in missing])
+    for sprint in missing:
+        stats[sprint.id] = computed[sprint.id]
+        sprint_stats_cache.put(sprint.id, sprint.stats_version, computed[sprint.id])
+    return stats
+
+
+async def invalidate_sprint_stats(db: AsyncSession, *, sprint_ids: Iterable[Optional[UUID]]) -> None:
+    """Bump stats_version of sprints whose tasks changed (None ids are ignored)."""
+    sprint_ids = list({sprint_id for sprint_id in sprint_ids if sprint_id})
+    if not sprint_ids:
+        return
+    await db.execute(
+        update(Sprint)
+        .where(Sprint.id == any_(literal(sprint_ids, ARRAY(PG_UUID(as_uuid=True)))))
+        .values(stats_version=Sprint.stats_version + 1, updated_at=Sprint.updated_at)
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,196 @@
+"""Denormalized task counts per project, sprint and status.
+
+Board headers read `project_status_counts` instead of grouping `tasks`. Task
+writers describe a change as the (project, sprint, status) keys it removes and
+adds; `apply_deltas` adjusts the counters with one upsert in the writer's
+transaction, touching rows in key order so concurrent writers lock them in
+the same order.
+
+Changes made outside these paths (sprints deleted in SQL, manual fixes) make
+the counters drift; the reconciliation job recounts every project from
+`tasks` each STATUS_COUNT_RECONCILE_INTERVAL_SECONDS.
+"""
+import asyncio
+import logging
+from collections import Counter
+from enum import Enum
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete, exists, func, literal, select
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, engine
+from app.models.project import Project
+from app.models.status_count import ProjectStatusCount
+from app.models.task import Task
+
+logger = logging.getLogger(__name__)
+
+CountKey = Tuple[UUID, Optional[UUID], str]
+
+COUNT_KEY_COLUMNS = ["project_id", "sprint_id", "status"]
+# pg_try_advisory_lock key: one reconciliation run at a time across workers
+RECONCILE_LOCK_ID = 7_140_014
+
+
+def count_key(task: Task) -> CountKey:
+    status = task.status.value if isinstance(task.status, Enum) else task.status
+    return task.project_id, task.sprint_id, status
+
+
+def count_deltas(*, removed: Iterable[CountKey] = (), added: Iterable[CountKey] = ()) -> Dict[CountKey, int]:
+    """Net counter changes; keys whose changes cancel out are dropped."""
+    deltas = Counter(added)
+    deltas.subtract(removed)
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+async def apply_deltas(db: AsyncSession, deltas: Mapping[CountKey, int]) -> None:
+    """Add `deltas` to the counters with one INSERT ... ON CONFLICT DO UPDATE."""
+    if not deltas:
+        return
+    rows = [
+        {"id": uuid4(), "project_id": project_id, "sprint_id": sprint_id, "status": status, "count": delta}
+        for (project_id, sprint_id, status), delta in sorted(deltas.items(), key=_lock_order)
+    ]
+    stmt = insert(ProjectStatusCount).values(rows)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=COUNT_KEY_COLUMNS,
+            set_={"count": ProjectStatusCount.count + stmt.excluded["count"]},
+        )
+    )
+
+
+async def record_task_change(
+    db: AsyncSession,
+    *,
+    removed: Iterable[CountKey] = (),
+    added: Iterable[CountKey] = ()
+) -> None:
+    """Update the counters for tasks leaving `removed` keys and entering `added` ones."""
+    await apply_deltas(db, count_deltas(removed=removed, added=added))
+
+
+async def move_sprint_to_backlog(db: AsyncSession, *, sprint_id: UUID) -> None:
+    """Fold a sprint's counters into the backlog before the sprint is deleted.
+
+    Deleting a sprint sets its tasks' sprint_id to NULL; the sprint's own
+    counter rows are removed by the cascade.
+    """
+    sprint_counts = select(
+        func.gen_random_uuid(),
+        ProjectStatusCount.project_id,
+        literal(None, PG_UUID(as_uuid=True)),
+        ProjectStatusCount.status,
+        ProjectStatusCount.count,
+    ).where(ProjectStatusCount.sprint_id == sprint_id)
+    stmt = insert(ProjectStatusCount).from_select(["id", *COUNT_KEY_COLUMNS, "count"], sprint_counts)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=COUNT_KEY_COLUMNS,
+            set_={"count": ProjectStatusCount.count + stmt.excluded["count"]},
+        )
+    )
+
+
+async def get_project_counts(db: AsyncSession, *, project_id: UUID) -> List[ProjectStatusCount]:
+    """All non-zero counters of a project (backlog first, then by sprint)."""
+    result = await db.execute(
+        select(ProjectStatusCount)
+        .where(ProjectStatusCount.project_id == project_id, ProjectStatusCount.count != 0)
+        .order_by(ProjectStatusCount.sprint_id.asc().nulls_first(), ProjectStatusCount.status)
+    )
+    return result.scalars().all()
+
+
+async def reconcile_project(db: AsyncSession, *, project_id: UUID) -> int:
+    """Recount a project's counters from `tasks`; returns the number of rows fixed.
+
+    The caller commits.
+    """
+    # Writers that already adjusted these rows commit before the recount sees
+    # their tasks; writers blocked on the locks apply their deltas on top of it.
+    # Locked in the writers' `_lock_order` (bytewise, hence COLLATE "C") so
+    # neither side can deadlock the other
+    await db.execute(
+        select(ProjectStatusCount.id)
+        .where(ProjectStatusCount.project_id == project_id)
+        .order_by(ProjectStatusCount.sprint_id.asc().nulls_first(), ProjectStatusCount.status.collate("C"))
+        .with_for_update()
+    )
+
+    actual = (
+        select(func.gen_random_uuid(), Task.project_id, Task.sprint_id, Task.status, func.count())
+        .where(Task.project_id == project_id, Task.status.is_not(None))
+        .group_by(Task.project_id, Task.sprint_id, Task.status)
+    )
+    stmt = insert(ProjectStatusCount).from_select(["id", *COUNT_KEY_COLUMNS, "count"], actual)
+    result = await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=COUNT_KEY_COLUMNS,
+            set_={"count": stmt.excluded["count"]},
+            where=ProjectStatusCount.count != stmt.excluded["count"],
+        ).returning(ProjectStatusCount.id)
+    )
+    fixed = len(result.all())
+
+    has_tasks = exists().where(
+        Task.project_id == ProjectStatusCount.project_id,
+        Task.sprint_id.is_not_distinct_from(ProjectStatusCount.sprint_id),
+        Task.status == ProjectStatusCount.status,
+    )
+    result = await db.execute(
+        delete(ProjectStatusCount)
+        .where(ProjectStatusCount.project_id == project_id, ~has_tasks)
+        .returning(ProjectStatusCount.count)
+    )
+    fixed += sum(1 for (count,) in result.all() if count)
+    return fixed
+
+
+async def reconcile_status_counts() -> Optional[int]:
+    """Reconcile every project, one transaction each.
+
+    Returns the number of rows fixed, or None if another process holds the
+    reconciliation lock.
+    """
+    async with engine.connect() as lock_connection:
+        acquired = await lock_connection.scalar(select(func.pg_try_advisory_lock(RECONCILE_LOCK_ID)))
+        await lock_connection.commit()
+        if not acquired:
+            return None
+        try:
+            async with AsyncSessionLocal() as db:
+                project_ids = (await db.execute(select(Project.id))).scalars().all()
+
+            fixed = 0
+            for project_id in project_ids:
+                async with AsyncSessionLocal() as db:
+                    fixed += await reconcile_project(db, project_id=project_id)
+                    await db.commit()
+            return fixed
+        finally:
+            await lock_connection.scalar(select(func.pg_advisory_unlock(RECONCILE_LOCK_ID)))
+            await lock_connection.commit()
+
+
+async def run_reconciliation(interval: int = settings.STATUS_COUNT_RECONCILE_INTERVAL_SECONDS) -> None:
+    """Reconcile counters every `interval` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            fixed = await reconcile_status_counts()
+        except Exception:
+            logger.exception("Status count reconciliation failed")
+            continue
+        if fixed:
+            logger.warning("Status count reconciliation repaired %s drifted counters", fixed)
+
+
+def _lock_order(item: Tuple[CountKey, int]) -> tuple:
+    (project_id, sprint_id, status), _ = item
+    return str(project_id), str(sprint_id or ""), status
@@ -0,0 +1,148 @@
+"""Task status transition log and cumulative flow.
+
+`task_status_transitions` holds one compact row per status change (and one
+with from_status NULL per created task). The cumulative flow diagram sums,
+per UTC day and status, arrivals minus departures and accumulates them with a
+window function; the aggregate reads only the covering
+idx_task_status_transition_cfd index.
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, insert, null, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task, TaskHistory, TaskStatusTransition
+
+Transition = Tuple[UUID, UUID, Optional[str], str]  # task, project, from, to
+
+
+def history_status(value):
+    """Status recorded in a task_history value.
+
+    Older rows hold the enum repr (`TaskStatus.DONE`) instead of the value.
+    """
+    return func.lower(func.regexp_replace(value, r"^TaskStatus\.", ""))
+
+
+async def record_transitions(db: AsyncSession, transitions: Iterable[Transition]) -> None:
+    """Log status changes with one multi-row INSERT (unchanged statuses are skipped)."""
+    rows = [
+        {"task_id": task_id, "project_id": project_id, "from_status": _value(from_status), "to_status": _value(to_status)}
+        for task_id, project_id, from_status, to_status in transitions
+        if _value(from_status) != _value(to_status)
+    ]
+    if rows:
+        await db.execute(insert(TaskStatusTransition).values(rows))
+
+
+async def get_cumulative_flow(
+    db: AsyncSession,
+    *,
+    project_id: UUID,
+    start: date,
+    end: date
+) -> List[Tuple[date, Dict[str, int]]]:
+    """Tasks per status at the end of each day from `start` to `end` (inclusive)."""
+    log = TaskStatusTransition
+    day = func.date_trunc("day", func.timezone("UTC", log.transitioned_at))
+    until = datetime.combine(end + timedelta(days=1), time.min, tzinfo=timezone.utc)
+
+    arrivals = (
+        select(day.label("day"), log.to_status.label("status"), func.count().label("delta"))
+        .where(log.project_id == project_id, log.transitioned_at < until)
+        .group_by(day, log.to_status)
+    )
+    departures = (
+        select(day, log.from_status, -func.count())
+        .where(log.project_id == project_id, log.transitioned_at < until, log.from_status.is_not(None))
+        .group_by(day, log.from_status)
+    )
+    moves = union_all(arrivals, departures).subquery("moves")
+    daily = (
+        select(moves.c.day, moves.c.status, func.sum(moves.c.delta).label("delta"))
+        .group_by(moves.c.day, moves.c.status)
+        .subquery("daily")
+    )
+    result = await db.execute(
+        select(
+            daily.c.day,
+            daily.c.status,
+            func.sum(daily.c.delta).over(partition_by=daily.c.status, order_by=daily.c.day).label("count"),
+        ).order_by(daily.c.day)
+    )
+
+    # Only days with changes come back: carry counts forward over the others
+    counts: Dict[str, int] = {}
+    rows = iter(result.all())
+    row = next(rows, None)
+    series = []
+    current = start
+    while current <= end:
+        while row is not None and row.day.date() <= current:
+            counts[row.status] = int(row.count)
+            row = next(rows, None)
+        series.append((current, {status: count for status, count in counts.items() if count}))
+        current += timedelta(days=1)
+    return series
+
+
+async def backfill_transitions(db: AsyncSession, *, project_id: UUID) -> int:
+    """Build a project's log from task_history for changes made before it existed.
+
+    Adds the creation row of tasks without one, and status changes older than
+    the task's first logged transition, so it can run after the log went live
+    and again without duplicating rows. Returns the number of rows written;
+    the caller commits.
+    """
+    log = TaskStatusTransition
+    status_rows = (TaskHistory.field_name == "status", TaskHistory.new_value.is_not(None))
+    first_logged = select(func.min(log.transitioned_at)).where(log.task_id == Task.id).scalar_subquery()
+    creation_logged = select(log.id).where(log.task_id == Task.id, log.from_status.is_(None)).exists()
+
+    # The first status change tells the initial status; without one it is the current status
+    initial_status = (
+        select(history_status(TaskHistory.old_value))
+        .where(TaskHistory.task_id == Task.id, *status_rows, TaskHistory.old_value.is_not(None))
+        .order_by(TaskHistory.created_at)
+        .limit(1)
+        .scalar_subquery()
+    )
+    created = select(
+        Task.id,
+        Task.project_id,
+        null(),
+        func.coalesce(initial_status, Task.status),
+        Task.created_at,
+    ).where(Task.project_id == project_id, Task.status.is_not(None), ~creation_logged)
+    changed = (
+        select(
+            TaskHistory.task_id,
+            Task.project_id,
+            history_status(TaskHistory.old_value),
+            history_status(TaskHistory.new_value),
+            TaskHistory.created_at,
+        )
+        .join(Task, Task.id == TaskHistory.task_id)
+        .where(
+            Task.project_id == project_id,
+            *status_rows,
+            or_(first_logged.is_(None), TaskHistory.created_at < first_logged),
+        )
+    )
+
+    # One statement: both parts see the log as it was before the backfill
+    result = await db.execute(
+        insert(log)
+        .from_select(
+            ["task_id", "project_id", "from_status", "to_status", "transitioned_at"],
+            union_all(created, changed),
+        )
+    )
+    return result.rowcount
+
+
+def _value(status):
+    return status.value if isinstance(status, Enum) else status
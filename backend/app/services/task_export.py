@@ -0,0 +1,175 @@
+"""Streaming export of a project's tasks.
+
+Tasks are read through a server-side cursor in (created_at, id) order, one
+batch at a time, with history and comments of each batch loaded alongside, so
+memory stays constant regardless of project size. Every task record carries a
+`cursor`; passing the last one received back resumes the export after that
+task. Records are encoded as NDJSON (history and comments nested) or CSV
+(history and comments as JSON columns, tags comma-separated as accepted by the
+task import), optionally gzip-compressed on the fly.
+"""
+import csv
+import io
+import json
+import zlib
+from collections import defaultdict
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, tuple_, any_, literal
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.pagination import encode_cursor
+from app.models.comment import Comment
+from app.models.project import Project
+from app.models.task import Task, TaskHistory
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_INCLUDES = ("history", "comments")
+
+# Generated columns (search vectors) are derived data and not exported
+TASK_COLUMNS = [column for column in Task.__table__.columns if column.computed is None]
+TASK_FIELDS = ("key",) + tuple(column.key for column in TASK_COLUMNS) + ("cursor",)
+HISTORY_FIELDS = ("id", "user_id", "action", "field_name", "old_value", "new_value", "created_at")
+COMMENT_FIELDS = ("id", "parent_comment_id", "user_id", "content", "created_at", "updated_at")
+
+# Bytes buffered before a chunk is sent (and compressed)
+CHUNK_SIZE = 64 * 1024
+
+
+async def iter_task_records(
+    db: AsyncSession,
+    *,
+    project: Project,
+    include: Sequence[str] = (),
+    after: Optional[Tuple[datetime, UUID]] = None,
+    batch_size: int = settings.TASK_EXPORT_BATCH_SIZE
+) -> AsyncIterator[dict]:
+    """Yield one dict per task, oldest first, starting after `after`."""
+    query = (
+        select(*TASK_COLUMNS)
+        .where(Task.project_id == project.id)
+        .order_by(Task.created_at.asc(), Task.id.asc())
+        .execution_options(yield_per=batch_size)
+    )
+    if after:
+        query = query.where(tuple_(Task.created_at, Task.id) > tuple_(*after))
+
+    result = await db.stream(query)
+    async for rows in result.partitions():
+        task_ids = [row.id for row in rows]
+        history = await _load_children(db, TaskHistory, HISTORY_FIELDS, task_ids) if "history" in include else None
+        comments = await _load_children(db, Comment, COMMENT_FIELDS, task_ids) if "comments" in include else None
+
+        for row in rows:
+            record = {"key": f"{project.key}-{row.task_number}", **row._asdict()}
+            record["cursor"] = encode_cursor(row.created_at, row.id)
+            if history is not None:
+                record["history"] = history.get(row.id, [])
+            if comments is not None:
+                record["comments"] = comments.get(row.id, [])
+            yield record
+
+
+async def _load_children(db: AsyncSession, model, fields: Sequence[str], task_ids: List[UUID]) -> Dict[UUID, List[dict]]:
+    """Load rows of `model` for a batch of tasks, grouped by task id."""
+    columns = [getattr(model, field) for field in fields]
+    ids = literal(task_ids, ARRAY(PG_UUID(as_uuid=True)))
+    query = select(model.task_id, *columns).where(model.task_id == any_(ids)).order_by(model.created_at.asc())
+    if model is Comment:
+        query = query.where(Comment.deleted_at.is_(None))
+
+    grouped = defaultdict(list)
+    for row in (await db.execute(query)).all():
+        task_id, *values = row
+        grouped[task_id].append(dict(zip(fields, values)))
+    return grouped
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def to_ndjson(record: dict) -> str:
+    return json.dumps(record, default=_json_default, ensure_ascii=False) + "\n"
+
+
+class CsvEncoder:
+    """Encode task records as CSV lines, header first."""
+
+    def __init__(self, include: Sequence[str] = ()):
+        self.fields = TASK_FIELDS + tuple(name for name in EXPORT_INCLUDES if name in include)
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def header(self) -> str:
+        return self._write(self.fields)
+
+    def encode(self, record: dict) -> str:
+        return self._write([self._cell(record.get(field)) for field in self.fields])
+
+    def _write(self, values) -> str:
+        self._writer.writerow(values)
+        text = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return text
+
+    @staticmethod
+    def _cell(value) -> str:
+        if value is None:
+            return ""
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, list) and all(isinstance(item, str) for item in value):
+            return ",".join(value)
+        if isinstance(value, (list, dict)):
+            return json.dumps(value, default=_json_default, ensure_ascii=False)
+        return str(value)
+
+
+async def encode_export(
+    records: AsyncIterator[dict],
+    *,
+    export_format: str = "ndjson",
+    include: Sequence[str] = (),
+    compress: bool = False
+) -> AsyncIterator[bytes]:
+    """Encode records into byte chunks of about CHUNK_SIZE."""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+    parts: List[str] = []
+    size = 0
+
+    def pack() -> bytes:
+        nonlocal size
+        data = "".join(parts).encode()
+        parts.clear()
+        size = 0
+        return compressor.compress(data) if compressor else data
+
+    if export_format == "csv":
+        encoder = CsvEncoder(include)
+        encode = encoder.encode
+        parts.append(encoder.header())
+    else:
+        encode = to_ndjson
+
+    async for record in records:
+        line = encode(record)
+        parts.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            chunk = pack()
+            if chunk:
+                yield chunk
+
+    chunk = pack()
+    if compressor:
+        chunk += compressor.flush()
+    if chunk:
+        yield chunk
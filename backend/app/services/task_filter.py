@@ -0,0 +1,389 @@
+"""Task filter expressions.
+
+A compact query language for task lists, e.g.::
+
+    status in (todo, review) and assignee = me and due < now+7d and tags has backend
+
+Comparisons are `field op value` joined by `and` / `or` / `not` and
+parentheses. Values are bare words, "quoted strings", `(lists, of, values)`,
+`null`, `me` (the current user) and times: ISO dates, `now` and `today` with
+an optional offset such as `now+7d` or `today-2w` (units m, h, d, w).
+
+Expressions are parsed and validated against the task fields once and cached
+by their text; the cached `TaskFilter` only binds `me` and `now` per request.
+Operators compile to index-friendly SQL (`tags has` to `@>` on the GIN index,
+time comparisons to ranges on btree indexes).
+"""
+import operator
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple, Type
+from uuid import UUID
+
+from sqlalchemy import String, and_, not_, or_, type_coerce
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import settings
+from app.models.task import Task
+from app.schemas.task import TaskPriority, TaskStatus, TaskType
+
+
+class FilterError(ValueError):
+    """Invalid filter expression; `position` is the offending character offset."""
+
+    def __init__(self, message: str, position: int):
+        super().__init__(f"{message} (at position {position})")
+        self.position = position
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    column: Any
+    kind: str
+    choices: Optional[Type[Enum]] = None
+
+
+FIELDS = {
+    "status": FieldSpec(Task.status, "enum", TaskStatus),
+    "priority": FieldSpec(Task.priority, "enum", TaskPriority),
+    "type": FieldSpec(Task.type, "enum", TaskType),
+    "assignee": FieldSpec(Task.assignee_id, "user"),
+    "reporter": FieldSpec(Task.reporter_id, "user"),
+    "sprint": FieldSpec(Task.sprint_id, "uuid"),
+    "project": FieldSpec(Task.project_id, "uuid"),
+    "parent": FieldSpec(Task.parent_task_id, "uuid"),
+    "number": FieldSpec(Task.task_number, "number"),
+    "points": FieldSpec(Task.story_points, "number"),
+    "estimate": FieldSpec(Task.estimated_hours, "number"),
+    "due": FieldSpec(Task.due_date, "time"),
+    "created": FieldSpec(Task.created_at, "time"),
+    "updated": FieldSpec(Task.updated_at, "time"),
+    "resolved": FieldSpec(Task.resolved_at, "time"),
+    "title": FieldSpec(Task.title, "text"),
+    "description": FieldSpec(Task.description, "text"),
+    "tags": FieldSpec(Task.tags, "tags"),
+}
+
+OPERATORS = {
+    "enum": {"=", "!=", "in", "not in"},
+    "user": {"=", "!=", "in", "not in"},
+    "uuid": {"=", "!=", "in", "not in"},
+    "number": {"=", "!=", "<", "<=", ">", ">=", "in", "not in"},
+    "time": {"=", "!=", "<", "<=", ">", ">="},
+    "text": {"=", "!=", "~"},
+    "tags": {"has", "not has", "in"},
+}
+NOT_NULL = {"title", "project", "number"}
+
+_ME = object()
+
+_TOKEN = re.compile(
+    r'\s*(?:(?P<string>"(?:[^"\\]|\\.)*")|(?P<symbol>!=|<=|>=|[=<>~(),])|(?P<word>[^\s()=!<>~,"]+))'
+)
+_RELATIVE_TIME = re.compile(r"^(now|today)(?:([+-])(\d+)([mhdw]))?$")
+_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+_COMPARISONS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+
+
+@dataclass(frozen=True)
+class RelativeTime:
+    base: str
+    offset: timedelta
+
+    def resolve(self, now: datetime) -> datetime:
+        if self.base == "today":
+            now = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return now + self.offset
+
+
+@dataclass(frozen=True)
+class Comparison:
+    field: str
+    op: str
+    value: Any
+
+
+@dataclass(frozen=True)
+class BoolOp:
+    op: str
+    items: Tuple[Any, ...]
+
+
+class TaskFilter:
+    """Parsed and validated filter; `clause` binds `me` and `now`."""
+
+    def __init__(self, text: str, tree):
+        self.text = text
+        self.tree = tree
+        self.uses_time = _uses_relative_time(tree)
+
+    def clause(self, *, user_id: UUID, now: Optional[datetime] = None) -> ColumnElement:
+        return _compile(self.tree, user_id, now or datetime.now(timezone.utc))
+
+    def matches(self, task: dict, *, user_id: UUID, now: Optional[datetime] = None) -> bool:
+        """Evaluate against a task snapshot (see `task_values`) as the SQL clause would."""
+        return _evaluate(self.tree, task, user_id, now or datetime.now(timezone.utc)) is True
+
+
+def task_values(task: Task) -> dict:
+    """Snapshot of the task attributes filters can reference."""
+    return {spec.column.key: getattr(task, spec.column.key) for spec in FIELDS.values()}
+
+
+@lru_cache(maxsize=settings.TASK_FILTER_CACHE_SIZE)
+def compile_filter(text: str) -> TaskFilter:
+    """Parse and validate a filter expression (cached by text), raise FilterError."""
+    return TaskFilter(text, _Parser(text).parse())
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.tokens = self._tokenize(text)
+        self.index = 0
+        self.end = len(text)
+
+    @staticmethod
+    def _tokenize(text: str) -> List[Tuple[str, str, int]]:
+        tokens = []
+        position = 0
+        while position < len(text):
+            match = _TOKEN.match(text, position)
+            if not match or match.end() == position:
+                break
+            kind = match.lastgroup
+            if kind is None:
+                break
+            value = match.group(kind)
+            if kind == "string":
+                value = re.sub(r"\\(.)", r"\1", value[1:-1])
+            tokens.append((kind, value, match.start(kind)))
+            position = match.end()
+        rest = text[position:]
+        if rest.strip():
+            raise FilterError("Unexpected character", len(text) - len(rest.lstrip()))
+        return tokens
+
+    def parse(self):
+        if not self.tokens:
+            raise FilterError("Empty filter", 0)
+        tree = self._or()
+        if self._peek():
+            raise FilterError(f"Unexpected '{self._peek()[1]}'", self._peek()[2])
+        return tree
+
+    def _peek(self):
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+
+    def _next(self, expected: str = "value"):
+        token = self._peek()
+        if token is None:
+            raise FilterError(f"Expected {expected}", self.end)
+        self.index += 1
+        return token
+
+    def _keyword(self, *words: str) -> bool:
+        token = self._peek()
+        if token and token[0] == "word" and token[1].lower() in words:
+            self.index += 1
+            return True
+        return False
+
+    def _symbol(self, symbol: str) -> bool:
+        token = self._peek()
+        if token and token[0] == "symbol" and token[1] == symbol:
+            self.index += 1
+            return True
+        return False
+
+    def _or(self):
+        items = [self._and()]
+        while self._keyword("or"):
+            items.append(self._and())
+        return items[0] if len(items) == 1 else BoolOp("or", tuple(items))
+
+    def _and(self):
+        items = [self._unary()]
+        while self._keyword("and"):
+            items.append(self._unary())
+        return items[0] if len(items) == 1 else BoolOp("and", tuple(items))
+
+    def _unary(self):
+        if self._keyword("not"):
+            return BoolOp("not", (self._unary(),))
+        if self._symbol("("):
+            tree = self._or()
+            if not self._symbol(")"):
+                raise FilterError("Expected ')'", self._peek()[2] if self._peek() else self.end)
+            return tree
+        return self._comparison()
+
+    def _comparison(self) -> Comparison:
+        kind, name, position = self._next("field")
+        spec = FIELDS.get(name.lower()) if kind == "word" else None
+        if spec is None:
+            raise FilterError(f"Unknown field '{name}'", position)
+        name = name.lower()
+
+        kind, op, op_position = self._next("operator")
+        op = op.lower()
+        if op == "not":
+            kind, second, _ = self._next("operator")
+            op = f"not {second.lower()}"
+        if op not in OPERATORS[spec.kind]:
+            raise FilterError(f"Operator '{op}' is not supported for '{name}'", op_position)
+
+        if op in ("in", "not in"):
+            value = tuple(self._list(name, spec))
+        else:
+            value = self._value(name, spec, allow_null=op in ("=", "!="))
+        return Comparison(name, op, value)
+
+    def _list(self, name: str, spec: FieldSpec) -> List[Any]:
+        if not self._symbol("("):
+            raise FilterError("Expected '('", self._peek()[2] if self._peek() else self.end)
+        values = [self._value(name, spec)]
+        while self._symbol(","):
+            values.append(self._value(name, spec))
+        if not self._symbol(")"):
+            raise FilterError("Expected ')'", self._peek()[2] if self._peek() else self.end)
+        return values
+
+    def _value(self, name: str, spec: FieldSpec, allow_null: bool = False):
+        kind, raw, position = self._next()
+        if kind == "symbol":
+            raise FilterError(f"Expected value, got '{raw}'", position)
+        word = raw.lower() if kind == "word" else None
+
+        if word == "null":
+            if not allow_null or name in NOT_NULL:
+                raise FilterError(f"'{name}' cannot be compared with null here", position)
+            return None
+        try:
+            return self._convert(spec, raw, word)
+        except (ValueError, KeyError):
+            raise FilterError(f"Invalid value '{raw}' for '{name}'", position)
+
+    @staticmethod
+    def _convert(spec: FieldSpec, raw: str, word: Optional[str]):
+        if spec.kind == "enum":
+            return spec.choices(raw.lower()).value
+        if spec.kind == "user" and word == "me":
+            return _ME
+        if spec.kind in ("user", "uuid"):
+            return UUID(raw)
+        if spec.kind == "number":
+            return float(raw) if "." in raw else int(raw)
+        if spec.kind == "time":
+            match = _RELATIVE_TIME.match(word or "")
+            if match:
+                base, sign, amount, unit = match.groups()
+                offset = timedelta(**{_UNITS[unit]: int(amount)}) if unit else timedelta()
+                return RelativeTime(base, -offset if sign == "-" else offset)
+            value = datetime.fromisoformat(raw)
+            return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+        return raw
+
+
+def _compile(tree, user_id: UUID, now: datetime) -> ColumnElement:
+    if isinstance(tree, BoolOp):
+        items = [_compile(item, user_id, now) for item in tree.items]
+        if tree.op == "not":
+            return not_(items[0])
+        return and_(*items) if tree.op == "and" else or_(*items)
+
+    def bind(value):
+        if value is _ME:
+            return user_id
+        if isinstance(value, RelativeTime):
+            return value.resolve(now)
+        return value
+
+    spec = FIELDS[tree.field]
+    column = spec.column
+    if spec.kind == "tags":
+        # The model uses the generic ARRAY; array operators need the PostgreSQL one
+        column = type_coerce(column, ARRAY(String))
+    op, value = tree.op, tree.value
+
+    if op == "=":
+        return column.is_(None) if value is None else column == bind(value)
+    if op == "!=":
+        # Unlike SQL `<>`, "assignee != me" also matches unassigned tasks
+        return column.is_not(None) if value is None else column.is_distinct_from(bind(value))
+    if op == "in":
+        if spec.kind == "tags":
+            return column.overlap([bind(item) for item in value])
+        return column.in_([bind(item) for item in value])
+    if op == "not in":
+        return or_(column.not_in([bind(item) for item in value]), column.is_(None))
+    if op == "has":
+        return column.contains([bind(value)])
+    if op == "not has":
+        return or_(not_(column.contains([bind(value)])), column.is_(None))
+    if op == "~":
+        escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return column.ilike(f"%{escaped}%", escape="\\")
+    return column.op(op)(bind(value))
+
+
+def _uses_relative_time(tree) -> bool:
+    if isinstance(tree, BoolOp):
+        return any(_uses_relative_time(item) for item in tree.items)
+    values = tree.value if isinstance(tree.value, tuple) else (tree.value,)
+    return any(isinstance(value, RelativeTime) for value in values)
+
+
+def _evaluate(tree, task: dict, user_id: UUID, now: datetime) -> Optional[bool]:
+    """Three-valued evaluation mirroring `_compile` (None is SQL NULL)."""
+    if isinstance(tree, BoolOp):
+        results = [_evaluate(item, task, user_id, now) for item in tree.items]
+        if tree.op == "not":
+            return None if results[0] is None else not results[0]
+        decisive = tree.op == "or"
+        if decisive in results:
+            return decisive
+        return None if None in results else not decisive
+
+    def bind(value):
+        if value is _ME:
+            return user_id
+        if isinstance(value, RelativeTime):
+            return value.resolve(now)
+        return value
+
+    spec = FIELDS[tree.field]
+    actual = task.get(spec.column.key)
+    op, value = tree.op, tree.value
+    if isinstance(actual, Enum):
+        actual = actual.value
+
+    if op == "=":
+        if value is None:
+            return actual is None
+        return None if actual is None else actual == bind(value)
+    if op == "!=":
+        return actual is not None if value is None else actual != bind(value)
+    if op == "not in" and actual is None:
+        return True
+    if op == "not has" and actual is None:
+        return True
+    if actual is None:
+        return None
+    if op == "in":
+        values = [bind(item) for item in value]
+        if spec.kind == "tags":
+            return any(item in actual for item in values)
+        return actual in values
+    if op == "not in":
+        return actual not in [bind(item) for item in value]
+    if op == "has":
+        return bind(value) in actual
+    if op == "not has":
+        return bind(value) not in actual
+    if op == "~":
+        return value.lower() in actual.lower()
+    return _COMPARISONS[op](actual, bind(value))
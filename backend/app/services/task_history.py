@@ -0,0 +1,80 @@
+"""Task history change sets.
+
+A `TaskChangeSet` collects the history rows of one request (field diffs of
+any number of tasks, plus created/deleted entries) and writes them with a
+single multi-row INSERT, instead of one flushed ORM object per row.
+"""
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task, TaskHistory
+
+FieldChange = Tuple[str, Any, Any]  # field, old, new
+
+
+def diff_task(task: Task, changes: Dict[str, Any]) -> List[FieldChange]:
+    """Fields of `changes` whose value differs from the task's (enums compare by value)."""
+    diff = []
+    for field, new_value in changes.items():
+        old_value = _value(getattr(task, field, None))
+        new_value = _value(new_value)
+        if old_value != new_value:
+            diff.append((field, old_value, new_value))
+    return diff
+
+
+class TaskChangeSet:
+    """History rows recorded by one user, written together by `write`."""
+
+    def __init__(self, *, user_id: UUID):
+        self.user_id = user_id
+        self.rows: List[dict] = []
+
+    def record(
+        self,
+        task_id: UUID,
+        action: str,
+        *,
+        field_name: Optional[str] = None,
+        old_value: Any = None,
+        new_value: Any = None
+    ) -> None:
+        self.rows.append({
+            "id": uuid4(),
+            "task_id": task_id,
+            "user_id": self.user_id,
+            "action": action,
+            "field_name": field_name,
+            "old_value": _text(old_value),
+            "new_value": _text(new_value),
+        })
+
+    def diff(self, task: Task, changes: Dict[str, Any]) -> List[FieldChange]:
+        """Record an "updated" row per changed field; returns the changes.
+
+        Call before the task is modified.
+        """
+        diff = diff_task(task, changes)
+        for field, old_value, new_value in diff:
+            self.record(task.id, "updated", field_name=field, old_value=old_value, new_value=new_value)
+        return diff
+
+    async def write(self, db: AsyncSession) -> int:
+        """Insert the recorded rows in one statement; returns their number."""
+        if self.rows:
+            await db.execute(insert(TaskHistory).values(self.rows))
+        written = len(self.rows)
+        self.rows = []
+        return written
+
+
+def _value(value):
+    return value.value if isinstance(value, Enum) else value
+
+
+def _text(value) -> Optional[str]:
+    return None if value is None else str(_value(value))
@@ -0,0 +1,253 @@
+"""Bulk task import through PostgreSQL COPY.
+
+Rows are parsed from NDJSON or CSV, validated, and written in batches with
+asyncpg `copy_records_to_table`. The project row is locked once for the whole
+import, so task numbers form one contiguous block; `key_sequence` and the
+status counters are updated once at the end. The caller owns the
+transaction: commit after the last progress event, roll back on error.
+
+The lock blocks every numbered insert into the project, so the body must have
+been received before the import starts: `spool_body` stores a streamed body
+(the job path imports its upload file).
+"""
+import asyncio
+import codecs
+import csv
+import json
+import tempfile
+import uuid
+from collections import Counter
+from dataclasses import dataclass, asdict
+from typing import IO, AsyncIterator, List, Optional, Tuple
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud.task import task as crud_task
+from app.models.project import Project
+from app.schemas.task import TaskImportRow
+from app.services.outbox import record_event
+from app.services.ranking import ranks_after
+from app.services.saved_views import invalidate_project_views
+from app.services.status_counts import apply_deltas
+
+IMPORT_FORMATS = ("ndjson", "csv")
+
+TASK_COLUMNS = (
+    "id", "project_id", "task_number", "title", "description", "status", "priority", "type",
+    "assignee_id", "reporter_id", "due_date", "estimated_hours", "story_points", "tags",
+    "custom_fields", "logged_hours", "position", "rank",
+)
+HISTORY_COLUMNS = ("id", "task_id", "user_id", "action", "extra_metadata")
+TRANSITION_COLUMNS = ("task_id", "project_id", "to_status")
+_IMPORT_METADATA = json.dumps({"source": "import"})
+# Spooled bodies larger than this move from memory to a temporary file
+SPOOL_MEMORY_SIZE = 8 * 1024 * 1024
+SPOOL_CHUNK_SIZE = 64 * 1024
+
+
+class TaskImportError(ValueError):
+    """Invalid input row; `line` is 1-based."""
+
+    def __init__(self, line: int, detail: str):
+        super().__init__(f"Line {line}: {detail}")
+        self.line = line
+        self.detail = detail
+
+
+@dataclass
+class ImportProgress:
+    imported: int = 0
+    first_number: Optional[int] = None
+    last_number: Optional[int] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into decoded lines (without line endings)."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def parse_ndjson(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, dict]]:
+    """Yield (line number, object) for each non-empty NDJSON line."""
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            raise TaskImportError(line_number, "Invalid JSON")
+        if not isinstance(data, dict):
+            raise TaskImportError(line_number, "Expected a JSON object")
+        yield line_number, data
+
+
+async def parse_csv(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, dict]]:
+    """Yield (line number, row) for CSV with a header row; empty cells are omitted."""
+    header: Optional[List[str]] = None
+    record: List[str] = []
+    line_number = 0
+    start = 0
+    async for line in lines:
+        line_number += 1
+        if not record:
+            start = line_number
+        record.append(line)
+        text = "\n".join(record)
+        # Quoted fields may span lines; the record is complete once quotes balance
+        if text.count('"') % 2:
+            continue
+        record = []
+        if not text.strip():
+            continue
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) > len(header):
+            raise TaskImportError(start, "Too many columns")
+        yield start, {name: value for name, value in zip(header, values) if value != ""}
+
+    if record:
+        raise TaskImportError(start, "Unterminated quoted field")
+
+
+async def spool_body(chunks: AsyncIterator[bytes]) -> IO[bytes]:
+    """Receive a whole body into a temporary file, rewound for reading."""
+    spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_SIZE)
+    try:
+        async for chunk in chunks:
+            await asyncio.to_thread(spooled.write, chunk)
+    except BaseException:
+        spooled.close()
+        raise
+    spooled.seek(0)
+    return spooled
+
+
+async def read_chunks(file: IO[bytes]) -> AsyncIterator[bytes]:
+    while chunk := await asyncio.to_thread(file.read, SPOOL_CHUNK_SIZE):
+        yield chunk
+
+
+def parse_rows(chunks: AsyncIterator[bytes], import_format: str) -> AsyncIterator[Tuple[int, dict]]:
+    """Parse a byte stream in one of IMPORT_FORMATS."""
+    if import_format == "csv":
+        return parse_csv(iter_lines(chunks))
+    return parse_ndjson(iter_lines(chunks))
+
+
+async def import_tasks(
+    db: AsyncSession,
+    *,
+    project_id: UUID,
+    reporter_id: UUID,
+    rows: AsyncIterator[Tuple[int, dict]],
+    batch_size: int = settings.TASK_IMPORT_BATCH_SIZE
+) -> AsyncIterator[ImportProgress]:
+    """Import rows into project backlog, yielding progress after each batch."""
+    result = await db.execute(
+        select(Project.key_sequence).where(Project.id == project_id).with_for_update()
+    )
+    next_number = (result.scalar_one() or 0) + 1
+    last_rank = await crud_task.get_last_rank(db, project_id=project_id)
+    connection = await _driver_connection(db)
+
+    progress = ImportProgress()
+    batch: List[TaskImportRow] = []
+    status_counts: Counter = Counter()
+
+    async def flush() -> None:
+        nonlocal next_number, last_rank
+        ranks = ranks_after(last_rank, len(batch))
+        tasks, history, transitions = [], [], []
+        for number, (item, rank) in enumerate(zip(batch, ranks), start=next_number):
+            task_id = uuid.uuid4()
+            tasks.append(_task_record(item, task_id, project_id, reporter_id, number, rank))
+            history.append((uuid.uuid4(), task_id, reporter_id, "created", _IMPORT_METADATA))
+            transitions.append((task_id, project_id, item.status.value))
+            status_counts[(project_id, None, item.status.value)] += 1
+
+        await connection.copy_records_to_table("tasks", records=tasks, columns=TASK_COLUMNS)
+        await connection.copy_records_to_table("task_history", records=history, columns=HISTORY_COLUMNS)
+        await connection.copy_records_to_table(
+            "task_status_transitions", records=transitions, columns=TRANSITION_COLUMNS
+        )
+
+        if progress.first_number is None:
+            progress.first_number = next_number
+        next_number += len(batch)
+        progress.last_number = next_number - 1
+        progress.imported += len(batch)
+        last_rank = ranks[-1]
+        batch.clear()
+
+    async for line_number, data in rows:
+        try:
+            batch.append(TaskImportRow.model_validate(data))
+        except ValidationError as exc:
+            error = exc.errors()[0]
+            field = ".".join(str(part) for part in error["loc"])
+            raise TaskImportError(line_number, f"{field}: {error['msg']}" if field else error["msg"])
+        if len(batch) >= batch_size:
+            await flush()
+            yield progress
+
+    if batch:
+        await flush()
+        yield progress
+
+    if progress.imported:
+        await db.execute(
+            update(Project)
+            .where(Project.id == project_id)
+            .values(key_sequence=progress.last_number)
+            .execution_options(synchronize_session=False)
+        )
+        await apply_deltas(db, status_counts)
+        await invalidate_project_views(db, project_ids=[project_id])
+        # One event for the whole import rather than one per task
+        await record_event(
+            db, "project", project_id, "tasks.imported",
+            project_id=project_id, actor_id=reporter_id, imported=progress.imported,
+            first_number=progress.first_number, last_number=progress.last_number,
+        )
+
+
+def _task_record(
+    item: TaskImportRow,
+    task_id: UUID,
+    project_id: UUID,
+    reporter_id: UUID,
+    number: int,
+    rank: str
+) -> tuple:
+    return (
+        task_id, project_id, number, item.title, item.description, item.status.value,
+        item.priority.value, item.type.value, item.assignee_id, reporter_id, item.due_date,
+        item.estimated_hours, item.story_points, item.tags or [], "{}", 0.0, 0, rank,
+    )
+
+
+async def _driver_connection(db: AsyncSession):
+    # COPY is not exposed by SQLAlchemy; use asyncpg on the session's connection
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    return raw.driver_connection
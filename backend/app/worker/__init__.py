@@ -0,0 +1,5 @@
+# Background job worker: celery -A app.worker worker
+from app.worker.celery_app import celery_app
+from app.worker.tasks import enqueue
+
+__all__ = ["celery_app", "enqueue"]
@@ -0,0 +1,32 @@
+from celery import Celery
+from celery.signals import worker_process_init
+
+from app.core.config import settings
+from app.db.session import engine
+
+celery_app = Celery(
+    "tasktracker",
+    broker=settings.CELERY_BROKER_URL or settings.REDIS_URL,
+    include=["app.worker.tasks"],
+)
+
+celery_app.conf.update(
+    # Job status and progress live in the jobs table
+    task_ignore_result=True,
+    # A job is acknowledged once done, so a crashed worker's job runs again
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    # Only a crashed worker's task is redelivered, never one still running
+    broker_transport_options={"visibility_timeout": settings.JOB_VISIBILITY_TIMEOUT_SECONDS},
+    worker_prefetch_multiplier=1,
+    task_serializer="json",
+    accept_content=["json"],
+    # Tasks called directly run in the calling process
+    task_always_eager=settings.JOBS_RUN_LOCALLY,
+)
+
+
+@worker_process_init.connect
+def reset_connection_pool(**kwargs) -> None:
+    """Forked worker processes must not reuse the parent's database connections."""
+    engine.sync_engine.dispose(close=False)
@@ -0,0 +1,164 @@
+"""Celery tasks for long-running operations.
+
+Each task takes a job id and runs the job's handler through
+`app.services.jobs.execute_job`, which skips finished jobs; handlers leave
+their changes uncommitted so a job's work and its final status commit
+together. Worker processes keep one event loop for all their tasks.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Set
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.pagination import decode_cursor
+from app.crud.project import project as crud_project
+from app.crud.sprint import sprint as crud_sprint
+from app.db.session import AsyncSessionLocal
+from app.models.job import Job
+from app.models.task import Task
+from app.services.board_events import board_hub
+from app.services.jobs import JobProgress, execute_job, find_stalled_jobs, job_file
+from app.services.project_purge import purge_project
+from app.services.task_export import encode_export, iter_task_records
+from app.services.task_import import import_tasks, parse_rows, read_chunks
+from app.worker.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+# pg_try_advisory_xact_lock key: one stalled job sweep at a time across workers
+JOB_SWEEP_LOCK_ID = 7_140_024
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def run(coro: Awaitable) -> None:
+    """Run a coroutine on this worker process's event loop."""
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+    _loop.run_until_complete(coro)
+
+
+async def complete_sprint(db: AsyncSession, job: Job, progress: JobProgress) -> dict:
+    sprint = await crud_sprint.get(db, id=UUID(job.params["sprint_id"]))
+    if sprint is None:
+        raise LookupError("Sprint not found")
+    if sprint.status != "completed":
+        sprint = await crud_sprint.complete(db, sprint=sprint, actor_id=job.created_by)
+    return jsonable_encoder({"sprint_id": sprint.id, "completed_at": sprint.completed_at})
+
+
+async def export_project(db: AsyncSession, job: Job, progress: JobProgress) -> dict:
+    """Write the export to a job file, reporting exported tasks."""
+    # One snapshot for the count, the task cursor and the related-record queries
+    await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    project = await crud_project.get(db, id=job.project_id)
+    if project is None:
+        raise LookupError("Project not found")
+    export_format, include, gzip = job.params["format"], job.params.get("include", []), job.params.get("gzip", False)
+    after = decode_cursor(job.params["cursor"]) if job.params.get("cursor") else None
+
+    total = (await db.execute(select(func.count(Task.id)).where(Task.project_id == project.id))).scalar()
+    await progress(0, total)
+    exported = 0
+
+    async def records():
+        nonlocal exported
+        async for record in iter_task_records(db, project=project, include=include, after=after):
+            yield record
+            exported += 1
+            if exported % settings.TASK_EXPORT_BATCH_SIZE == 0:
+                await progress(exported)
+
+    suffix = f"{export_format}.gz" if gzip else export_format
+    path = job_file(job.id, suffix)
+    partial = path.with_name(path.name + ".partial")
+    with partial.open("wb") as output:
+        async for chunk in encode_export(records(), export_format=export_format, include=include, compress=gzip):
+            await asyncio.to_thread(output.write, chunk)
+    partial.replace(path)
+    await progress(exported)
+    return {"file": path.name, "filename": f"{project.key}-tasks.{suffix}", "tasks": exported}
+
+
+async def import_project_tasks(db: AsyncSession, job: Job, progress: JobProgress) -> dict:
+    """Import the uploaded body; the job's upload file is removed once it succeeds."""
+    result = {"imported": 0}
+    with job_file(job.id, "upload").open("rb") as upload:
+        async for batch in import_tasks(
+            db,
+            project_id=job.project_id,
+            reporter_id=job.created_by,
+            rows=parse_rows(read_chunks(upload), job.params["format"]),
+        ):
+            result = batch.to_dict()
+            await progress(batch.imported)
+    return result
+
+
+async def run_import(job_id: UUID) -> None:
+    job = await execute_job(job_id, import_project_tasks)
+    if job is not None and job.status == "succeeded" and job.result["imported"]:
+        await board_hub.publish(job.project_id, "tasks.imported", imported=job.result["imported"])
+
+
+# Job kind -> coroutine running a job of that kind
+JOB_RUNNERS: Dict[str, Callable[[UUID], Awaitable]] = {
+    "project.delete": lambda job_id: execute_job(job_id, purge_project),
+    "project.export": lambda job_id: execute_job(job_id, export_project),
+    "tasks.import": run_import,
+    "sprint.complete": lambda job_id: execute_job(job_id, complete_sprint),
+}
+
+
+@celery_app.task(name="jobs.run")
+def run_job(kind: str, job_id: str) -> None:
+    run(JOB_RUNNERS[kind](UUID(job_id)))
+
+
+# Jobs running in the API process (JOBS_RUN_LOCALLY), referenced until done
+_local_jobs: Set[asyncio.Task] = set()
+
+
+def enqueue(job: Job) -> None:
+    """Start a committed job on a worker, or in this process with JOBS_RUN_LOCALLY."""
+    if settings.JOBS_RUN_LOCALLY:
+        task = asyncio.create_task(JOB_RUNNERS[job.kind](job.id))
+        _local_jobs.add(task)
+        task.add_done_callback(_local_jobs.discard)
+    else:
+        run_job.delay(job.kind, str(job.id))
+
+
+async def requeue_stalled_jobs(queued_for: int = settings.JOB_SWEEP_INTERVAL_SECONDS) -> Optional[int]:
+    """Enqueue jobs whose task was lost again; None if another process is at it.
+
+    Duplicate deliveries are harmless: only one run can claim a job.
+    """
+    async with AsyncSessionLocal() as db:
+        acquired = (await db.execute(select(func.pg_try_advisory_xact_lock(JOB_SWEEP_LOCK_ID)))).scalar()
+        if not acquired:
+            return None
+        jobs = await find_stalled_jobs(db, queued_for=queued_for)
+        await db.commit()
+    for job in jobs:
+        enqueue(job)
+    return len(jobs)
+
+
+async def run_job_sweep(interval: int = settings.JOB_SWEEP_INTERVAL_SECONDS) -> None:
+    """Re-enqueue stalled jobs every `interval` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            requeued = await requeue_stalled_jobs(interval)
+        except Exception:
+            logger.exception("Stalled job sweep failed")
+            continue
+        if requeued:
+            logger.info("Re-enqueued %d stalled jobs", requeued)
@@ -0,0 +1,53 @@
+"""Script to build the task status transition log from existing task history
+
+Usage:
+    python backfill_status_transitions.py [--project-id <uuid>]
+
+Safe to run again: tasks already in the log only get their older history added.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import select
+
+from app.db.session import AsyncSessionLocal
+from app.models.project import Project
+from app.services.status_transitions import backfill_transitions
+# Import all models to avoid relationship errors
+from app.db import base  # noqa: F401
+
+
+async def run(args) -> None:
+    async with AsyncSessionLocal() as db:
+        query = select(Project.id, Project.key).order_by(Project.key)
+        if args.project_id:
+            query = query.where(Project.id == args.project_id)
+        projects = (await db.execute(query)).all()
+
+    if not projects:
+        print("⚠️ No projects found")
+        return
+
+    started = time.perf_counter()
+    total = 0
+    # One transaction per project keeps locks and WAL per commit bounded
+    for project_id, key in projects:
+        async with AsyncSessionLocal() as db:
+            written = await backfill_transitions(db, project_id=project_id)
+            await db.commit()
+        total += written
+        print(f"📦 {key}: {written} transitions")
+
+    print(f"✅ Wrote {total} transitions for {len(projects)} projects in {time.perf_counter() - started:.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--project-id", type=uuid.UUID)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
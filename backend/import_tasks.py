@@ -0,0 +1,75 @@
+"""Script to bulk import tasks into a project from an NDJSON or CSV file
+
+Usage:
+    python import_tasks.py --project-id <uuid> --reporter-email admin@tasktracker.com tasks.ndjson
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from app.core.config import settings
+from app.crud.user import user as crud_user
+from app.db.session import AsyncSessionLocal
+from app.services.task_import import IMPORT_FORMATS, TaskImportError, import_tasks, parse_rows
+# Import all models to avoid relationship errors
+from app.db import base  # noqa: F401
+
+CHUNK_SIZE = 1024 * 1024
+
+
+async def read_chunks(path: str):
+    with open(path, "rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            yield chunk
+
+
+async def run(args) -> None:
+    import_format = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+
+    async with AsyncSessionLocal() as db:
+        reporter = await crud_user.get_by_email(db, email=args.reporter_email)
+        if not reporter:
+            print(f"❌ User {args.reporter_email} not found")
+            return
+
+        started = time.perf_counter()
+        progress = None
+        try:
+            async for progress in import_tasks(
+                db,
+                project_id=args.project_id,
+                reporter_id=reporter.id,
+                rows=parse_rows(read_chunks(args.path), import_format),
+                batch_size=args.batch_size,
+            ):
+                elapsed = time.perf_counter() - started
+                print(f"📦 {progress.imported} tasks ({progress.imported / elapsed:,.0f} tasks/s)")
+            await db.commit()
+        except TaskImportError as exc:
+            await db.rollback()
+            print(f"❌ {exc}; nothing was imported")
+            return
+
+    if not progress:
+        print("⚠️ No tasks found in file")
+        return
+    elapsed = time.perf_counter() - started
+    print(
+        f"✅ Imported {progress.imported} tasks (#{progress.first_number}-#{progress.last_number}) "
+        f"in {elapsed:.2f}s ({progress.imported / elapsed:,.0f} tasks/s)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--project-id", type=uuid.UUID, required=True)
+    parser.add_argument("--reporter-email", required=True)
+    parser.add_argument("--format", choices=IMPORT_FORMATS)
+    parser.add_argument("--batch-size", type=int, default=settings.TASK_IMPORT_BATCH_SIZE)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Per-field flushed history rows vs one change-set insert.
+
+Times recording the history of a multi-field task edit both ways against the
+configured DATABASE_URL: one ORM TaskHistory object flushed per changed field
+(the former `add_history`), and `TaskChangeSet` writing every row with one
+multi-row INSERT. Each round runs in a transaction that is rolled back. Also
+times the in-process diff alone.
+
+Usage:
+    python -m loadtests.history_benchmark --fields 6 --tasks 1 --repeat 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import select
+
+from app.db import base  # noqa: F401  (register all models)
+from app.db.session import AsyncSessionLocal
+from app.models.task import Task, TaskHistory
+from app.services.task_history import TaskChangeSet, diff_task
+
+FIELDS = ("title", "description", "priority", "story_points", "estimated_hours", "due_date", "status", "type")
+
+
+def edit(task: Task, count: int) -> dict:
+    values = {
+        "title": f"{task.title} (edited)",
+        "description": "Edited",
+        "priority": "low" if task.priority != "low" else "high",
+        "story_points": (task.story_points or 0) + 1,
+        "estimated_hours": (task.estimated_hours or 0) + 1,
+        "due_date": None if task.due_date else task.created_at,
+        "status": "in_progress" if task.status != "in_progress" else "todo",
+        "type": "bug" if task.type != "bug" else "task",
+    }
+    return {field: values[field] for field in FIELDS[:count]}
+
+
+async def per_field(db, tasks, changes, user_id) -> None:
+    for task, task_changes in zip(tasks, changes):
+        for field, old_value, new_value in diff_task(task, task_changes):
+            db.add(TaskHistory(
+                task_id=task.id, user_id=user_id, action="updated", field_name=field,
+                old_value=str(old_value) if old_value is not None else None,
+                new_value=str(new_value) if new_value is not None else None,
+            ))
+            await db.flush()
+
+
+async def change_set(db, tasks, changes, user_id) -> None:
+    history = TaskChangeSet(user_id=user_id)
+    for task, task_changes in zip(tasks, changes):
+        history.diff(task, task_changes)
+    await history.write(db)
+
+
+async def time_writes(write, tasks, changes, repeat: int):
+    samples = []
+    async with AsyncSessionLocal() as db:
+        user_id = tasks[0].reporter_id
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await write(db, tasks, changes, user_id)
+            samples.append((time.perf_counter() - started) * 1000)
+            await db.rollback()
+    return samples
+
+
+def summary(label, samples):
+    print(f"{label:<10} median={statistics.median(samples):8.3f}ms  min={min(samples):8.3f}ms  max={max(samples):8.3f}ms")
+
+
+async def main(args) -> None:
+    async with AsyncSessionLocal() as db:
+        tasks = (await db.execute(select(Task).limit(args.tasks))).scalars().all()
+        db.expunge_all()
+    if len(tasks) < args.tasks:
+        raise SystemExit(f"need {args.tasks} existing tasks, found {len(tasks)}")
+    changes = [edit(task, args.fields) for task in tasks]
+
+    diff_samples = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        for task, task_changes in zip(tasks, changes):
+            diff_task(task, task_changes)
+        diff_samples.append((time.perf_counter() - started) * 1000)
+
+    per_field_samples = await time_writes(per_field, tasks, changes, args.repeat)
+    change_set_samples = await time_writes(change_set, tasks, changes, args.repeat)
+
+    print(f"{args.tasks} task(s) x {args.fields} changed fields, {args.repeat} rounds")
+    summary("diff", diff_samples)
+    summary("per-field", per_field_samples)
+    summary("change set", change_set_samples)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fields", type=int, default=6, choices=range(1, len(FIELDS) + 1))
+    parser.add_argument("--tasks", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
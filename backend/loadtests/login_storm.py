@@ -0,0 +1,94 @@
+"""Login storm load test.
+
+Measures latency of unrelated endpoints first on an idle server and then while
+many clients hammer /auth/login. With password hashing off the event loop the
+p99 of the probe requests should stay roughly flat between the two phases.
+
+Usage:
+    python loadtests/login_storm.py --base-url http://localhost:8000 \\
+        --username admin --password Admin123! --logins 50 --duration 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(label: str, samples: List[float]) -> None:
+    print(
+        f"{label:<14} n={len(samples):<6} "
+        f"p50={percentile(samples, 50):7.1f}ms "
+        f"p99={percentile(samples, 99):7.1f}ms "
+        f"max={max(samples, default=0):7.1f}ms "
+        f"mean={statistics.fmean(samples) if samples else 0:7.1f}ms"
+    )
+
+
+async def login(client: httpx.AsyncClient, args) -> httpx.Response:
+    return await client.post(
+        f"{args.api}/auth/login",
+        data={"username": args.username, "password": args.password},
+    )
+
+
+async def probe(client: httpx.AsyncClient, args, token: str, stop_at: float) -> List[float]:
+    """Hit unrelated endpoints sequentially and record latencies (ms)."""
+    samples = []
+    headers = {"Authorization": f"Bearer {token}"}
+    while time.perf_counter() < stop_at:
+        started = time.perf_counter()
+        await client.get(f"{args.base_url}/health")
+        await client.get(f"{args.api}/projects", headers=headers)
+        samples.append((time.perf_counter() - started) * 1000 / 2)
+        await asyncio.sleep(args.probe_interval)
+    return samples
+
+
+async def storm(client: httpx.AsyncClient, args, stop_at: float) -> int:
+    count = 0
+    while time.perf_counter() < stop_at:
+        await login(client, args)
+        count += 1
+    return count
+
+
+async def main(args) -> None:
+    args.api = f"{args.base_url}/api/v1"
+    limits = httpx.Limits(max_connections=args.logins + 10)
+    async with httpx.AsyncClient(timeout=30, limits=limits) as client:
+        response = await login(client, args)
+        response.raise_for_status()
+        token = response.json()["access_token"]
+
+        baseline = await probe(client, args, token, time.perf_counter() + args.duration / 2)
+
+        stop_at = time.perf_counter() + args.duration
+        storm_tasks = [asyncio.create_task(storm(client, args, stop_at)) for _ in range(args.logins)]
+        under_load = await probe(client, args, token, stop_at)
+        logins = sum(await asyncio.gather(*storm_tasks))
+
+    print(f"logins completed during storm: {logins} ({logins / args.duration:.1f}/s)")
+    report("idle", baseline)
+    report("login storm", under_load)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="Admin123!")
+    parser.add_argument("--logins", type=int, default=50, help="concurrent login clients")
+    parser.add_argument("--duration", type=float, default=20.0, help="storm duration in seconds")
+    parser.add_argument("--probe-interval", type=float, default=0.05)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,113 @@
+"""Offset vs cursor pagination benchmark for task listings.
+
+Seeds a throwaway project with many tasks (unless --project-id is given),
+then times fetching page N with OFFSET/LIMIT and with the keyset cursor used
+by GET /tasks, straight through crud_task against the configured DATABASE_URL.
+
+Usage:
+    python -m loadtests.pagination_benchmark --tasks 100000 --page 1000 --page-size 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert, select
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.crud.task import task as crud_task
+from app.db import base  # noqa: F401  (register all models)
+from app.db.session import AsyncSessionLocal
+from app.models.organization import Organization
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+
+
+async def seed(db, count: int) -> uuid.UUID:
+    user = (await db.execute(select(User).limit(1))).scalar_one()
+    org = Organization(name="Pagination bench", slug=f"bench-{uuid.uuid4().hex[:8]}", owner_id=user.id)
+    db.add(org)
+    await db.flush()
+    project = Project(
+        organization_id=org.id, name="Pagination bench",
+        key=f"PB{uuid.uuid4().hex[:6].upper()}"[:10], created_by=user.id, key_sequence=count,
+    )
+    db.add(project)
+    await db.flush()
+
+    started = datetime.now(timezone.utc)
+    batch = []
+    for number in range(1, count + 1):
+        batch.append({
+            "id": uuid.uuid4(), "project_id": project.id, "task_number": number,
+            "title": f"Task {number}", "reporter_id": user.id,
+            "created_at": started - timedelta(seconds=number // 3),  # deliberate timestamp ties
+        })
+        if len(batch) == 5000:
+            await db.execute(insert(Task), batch)
+            batch = []
+    if batch:
+        await db.execute(insert(Task), batch)
+    await db.commit()
+    return project.id
+
+
+async def time_offset(db, project_id, page: int, size: int, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await crud_task.get_by_project(db, project_id=project_id, skip=page * size, limit=size)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+async def time_cursor(db, project_id, page: int, size: int, repeat: int):
+    # Walk to the page once to obtain its cursor, then time fetching it
+    cursor = None
+    for _ in range(page):
+        rows = await crud_task.get_by_project(
+            db, project_id=project_id, limit=size, after=decode_cursor(cursor) if cursor else None
+        )
+        cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await crud_task.get_by_project(db, project_id=project_id, limit=size, after=decode_cursor(cursor))
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def summary(label, samples):
+    print(f"{label:<8} median={statistics.median(samples):8.2f}ms  min={min(samples):8.2f}ms  max={max(samples):8.2f}ms")
+
+
+async def main(args) -> None:
+    async with AsyncSessionLocal() as db:
+        project_id = uuid.UUID(args.project_id) if args.project_id else await seed(db, args.tasks)
+        try:
+            offset_samples = await time_offset(db, project_id, args.page, args.page_size, args.repeat)
+            cursor_samples = await time_cursor(db, project_id, args.page, args.page_size, args.repeat)
+        finally:
+            if not args.project_id and not args.keep:
+                project = await db.get(Project, project_id)
+                await db.execute(delete(Organization).where(Organization.id == project.organization_id))
+                await db.commit()
+
+    print(f"page {args.page} (size {args.page_size}) of project {project_id}")
+    summary("offset", offset_samples)
+    summary("cursor", cursor_samples)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--project-id", help="benchmark an existing project instead of seeding one")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded project")
+    asyncio.run(main(parser.parse_args()))
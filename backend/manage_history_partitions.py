@@ -0,0 +1,43 @@
+"""Script to create upcoming task history partitions and archive old ones
+
+Usage:
+    python manage_history_partitions.py [--months-ahead N] [--retention-months N] [--archive-dir DIR]
+
+Defaults come from the TASK_HISTORY_* settings; the API runs the same
+maintenance periodically.
+"""
+import argparse
+import asyncio
+
+from app.core.config import settings
+from app.services.history_partitions import maintain_partitions
+
+
+async def run(args) -> None:
+    outcome = await maintain_partitions(
+        months_ahead=args.months_ahead,
+        retention_months=args.retention_months,
+        archive_dir=args.archive_dir,
+    )
+    if outcome is None:
+        print("⚠️ Maintenance is already running elsewhere")
+        return
+
+    created, archived = outcome
+    for name in created:
+        print(f"🆕 Created {name}")
+    for path in archived:
+        print(f"📦 Archived {path}")
+    print(f"✅ {len(created)} partitions created, {len(archived)} archived")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--months-ahead", type=int, default=settings.TASK_HISTORY_PARTITION_MONTHS_AHEAD)
+    parser.add_argument("--retention-months", type=int, default=settings.TASK_HISTORY_RETENTION_MONTHS)
+    parser.add_argument("--archive-dir", default=settings.TASK_HISTORY_ARCHIVE_DIR)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_current_user, get_db
+from app.main import app
+from app.models.comment import Comment
+from app.models.project import Project
+from app.models.sprint import Sprint
+from app.models.task import Task
+from app.models.user import User
+from tests.fakes import RecordingSession
+
+
+@pytest.fixture
+def world():
+    now = datetime.now(timezone.utc)
+    user = User(id=uuid4(), is_active=True, is_superuser=False)
+    other_user_id = uuid4()
+    project = Project(
+        id=uuid4(), organization_id=uuid4(), created_by=other_user_id, key="PROJ", name="Project",
+        status="active", key_sequence=1, created_at=now,
+    )
+    task = Task(
+        id=uuid4(), project_id=project.id, task_number=1, title="Task", status="todo",
+        priority="medium", type="task", reporter_id=user.id, logged_hours=0, position=0,
+        tags=[], created_at=now,
+    )
+    comment = Comment(id=uuid4(), task_id=task.id, user_id=other_user_id, content="Hi", created_at=now)
+    sprint = Sprint(id=uuid4(), project_id=project.id, name="Sprint 1", status="active", created_at=now)
+    return {"user": user, "project": project, "task": task, "comment": comment, "sprint": sprint}
+
+
+@pytest.fixture
+def client_for(world):
+    def make(*objects):
+        session = RecordingSession(objects)
+        app.dependency_overrides[get_db] = lambda: session
+        app.dependency_overrides[get_current_user] = lambda: world["user"]
+        return TestClient(app), session
+
+    yield make
+    app.dependency_overrides.clear()
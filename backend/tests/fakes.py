@@ -0,0 +1,95 @@
+"""Test doubles standing in for AsyncSession and its results."""
+from collections import namedtuple
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from sqlalchemy.sql import Select
+
+from app.models.permission import PermissionSchemeRule
+from app.models.project import Project
+
+AccessRow = namedtuple("AccessRow", ["Project", "project_role", "org_role", "scheme_version"])
+
+
+class FakeResult:
+    def __init__(self, rows, rowcount=0):
+        self.rows = rows
+        self.rowcount = rowcount
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+    def scalar_one_or_none(self):
+        return self.first()
+
+    def scalar(self):
+        return self.first()
+
+    def scalars(self):
+        return self
+
+    def unique(self):
+        return self
+
+    def all(self):
+        return list(self.rows)
+
+
+class RecordingSession:
+    def __init__(self, objects, role="lead", scheme_version=None):
+        self.info = {}
+        self.queries = []
+        self.objects = {(type(obj), getattr(obj, "id", id(obj))): obj for obj in objects}
+        self.role = role
+        self.scheme_version = scheme_version
+        self._identity = {}
+
+    async def get(self, model, ident):
+        key = (model, ident)
+        if key in self._identity:
+            return self._identity[key]
+        self.queries.append(f"get {model.__tablename__}")
+        obj = self.objects.get(key)
+        if obj is not None:
+            self._identity[key] = obj
+        return obj
+
+    async def execute(self, stmt):
+        self.queries.append(stmt)
+        if not isinstance(stmt, Select):
+            return FakeResult([], rowcount=1)
+
+        entity = stmt.column_descriptions[0]["entity"]
+        rows = [obj for (model, _), obj in self.objects.items() if model is entity]
+        if entity is Project and len(stmt.column_descriptions) > 1:
+            rows = [AccessRow(project, self.role, None, self.scheme_version) for project in rows]
+        elif entity is PermissionSchemeRule:
+            rows = [(rule.permission_key, rule.principal_type, rule.principal_identifier) for rule in rows]
+        return FakeResult(rows)
+
+    def add(self, obj):
+        pass
+
+    async def flush(self):
+        pass
+
+    async def refresh(self, obj):
+        # Fill what the database would: column defaults, id and timestamps
+        for column in obj.__table__.columns:
+            if getattr(obj, column.key, None) is not None:
+                continue
+            if column.default is not None and column.default.is_scalar:
+                setattr(obj, column.key, column.default.arg)
+        if obj.id is None:
+            obj.id = uuid4()
+        if obj.created_at is None:
+            obj.created_at = datetime.now(timezone.utc)
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+    async def close(self):
+        pass
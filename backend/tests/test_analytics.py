@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.sprint import Sprint
+from app.services.analytics import clear_cache, get_project_analytics
+from app.services.status_transitions import history_status
+from tests.fakes import RecordingSession
+
+
+def completed_sprint(project_id, weeks_ago):
+    end = datetime(2026, 3, 1, tzinfo=timezone.utc) - timedelta(weeks=weeks_ago)
+    return Sprint(
+        id=uuid4(), project_id=project_id, name=f"Sprint -{weeks_ago}", status="completed",
+        start_date=end - timedelta(weeks=2), completed_at=end, created_at=end - timedelta(weeks=3),
+    )
+
+
+def test_analytics_are_cached_until_a_sprint_closes(world, client_for):
+    clear_cache()
+    project_id = world["project"].id
+    newest_first = [completed_sprint(project_id, 0), completed_sprint(project_id, 2)]
+
+    for expected_queries in (4, 2):  # access + sprints (+ velocity + flow on a miss)
+        client, session = client_for(world["project"], *newest_first)
+
+        response = client.get(f"/api/v1/projects/{project_id}/analytics?sprints=2")
+
+        assert response.status_code == 200
+        assert len(session.queries) == expected_queries
+
+    body = response.json()
+    assert body["last_completed_sprint_id"] == str(newest_first[0].id)
+    assert [sprint["name"] for sprint in body["sprints"]] == ["Sprint -2", "Sprint -0"]
+    clear_cache()
+
+
+async def test_no_completed_sprints_skips_aggregates():
+    session = RecordingSession([])
+
+    analytics = await get_project_analytics(session, project_id=uuid4(), window=6)
+
+    assert len(session.queries) == 1
+    assert analytics.sprints == [] and analytics.project.velocity == 0
+
+
+def test_history_status_accepts_enum_repr():
+    sql = str(history_status(Sprint.name).compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    assert "regexp_replace" in sql and "TaskStatus" in sql
@@ -0,0 +1,174 @@
+import json
+import time
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.api.v1.endpoints import board
+from app.core.config import settings
+from app.main import app
+from app.services import board_events
+from app.services.board_events import BoardHub, board_hub
+
+
+def event(seq, event_type="task.updated"):
+    return json.dumps({"seq": seq, "type": event_type})
+
+
+class FakePipeline:
+    def __init__(self, results):
+        self.results = results
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+    async def execute(self):
+        return self.results
+
+
+class FakeRedis:
+    def __init__(self, *results):
+        self.results = results
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self.results)
+
+
+def make_hub(queue_size=10):
+    return BoardHub(enabled=True, history_size=100, history_ttl=60, queue_size=queue_size)
+
+
+async def test_events_reach_only_subscribers_of_their_project():
+    hub = make_hub()
+    project_id, other_id = uuid4(), uuid4()
+    queue, other = hub.subscribe(project_id), hub.subscribe(other_id)
+
+    hub.dispatch(f"board:{project_id}", event(1))
+
+    assert queue.get_nowait() == event(1)
+    assert other.empty()
+
+
+async def test_slow_subscriber_is_told_to_reload():
+    hub = make_hub(queue_size=2)
+    project_id = uuid4()
+    queue = hub.subscribe(project_id)
+
+    for seq in (1, 2, 3):
+        hub.dispatch(f"board:{project_id}", event(seq))
+
+    assert queue.get_nowait() is None
+    assert queue.empty()
+
+
+@pytest.mark.parametrize("since, results, expected", [
+    (None, ("7", [], []), (7, [])),
+    (5, ("7", [("x", 3.0)], [event(6), event(7)]), (7, [event(6), event(7)])),
+    (5, ("7", [("x", 7.0)], [event(7)]), (7, None)),  # event 6 fell out of the history
+    (9, ("7", [("x", 3.0)], []), (7, None)),  # sequence reset
+])
+async def test_resume_replays_history_or_asks_for_reload(monkeypatch, since, results, expected):
+    monkeypatch.setattr(board_events, "get_redis", lambda: FakeRedis(*results))
+
+    assert await make_hub().replay(uuid4(), since) == expected
+
+
+def test_socket_resumes_and_skips_replayed_events(monkeypatch, world):
+    project_id = world["project"].id
+
+    async def authenticate(db, token):
+        return world["user"]
+
+    async def ensure_access(db, *, project_id, user_id):
+        return world["project"]
+
+    async def replay(project_id, since):
+        # Published while the history was read: seq 2 arrives both ways
+        board_hub.dispatch(f"board:{project_id}", event(2))
+        board_hub.dispatch(f"board:{project_id}", event(3))
+        return 2, [event(2)]
+
+    monkeypatch.setattr(board, "authenticate_token", authenticate)
+    monkeypatch.setattr(board, "ensure_project_access", ensure_access)
+    monkeypatch.setattr(board_hub, "enabled", True)
+    monkeypatch.setattr(board_hub, "replay", replay)
+
+    with TestClient(app).websocket_connect(
+        f"/api/v1/projects/{project_id}/events?since=1", subprotocols=["bearer", "t"]
+    ) as socket:
+        assert socket.accepted_subprotocol == "bearer"
+        received = [socket.receive_json() for _ in range(3)]
+
+    assert received == [json.loads(event(2)), {"type": "board.ready", "seq": 2}, json.loads(event(3))]
+
+
+@pytest.mark.parametrize("subprotocols", [["bearer", "bad"], []])
+def test_socket_rejects_invalid_or_missing_token(world, subprotocols):
+    with pytest.raises(WebSocketDisconnect) as disconnect:
+        with TestClient(app).websocket_connect(
+            f"/api/v1/projects/{world['project'].id}/events", subprotocols=subprotocols
+        ):
+            pass
+
+    assert disconnect.value.code == 1008
+
+
+@pytest.mark.parametrize("expires_in, access_checks", [(0.1, 1), (None, 2)])
+def test_socket_closes_when_token_expires_or_access_is_lost(monkeypatch, world, expires_in, access_checks):
+    checks = []
+
+    async def authenticate(db, token):
+        return world["user"]
+
+    async def ensure_access(db, *, project_id, user_id):
+        checks.append(project_id)
+        if len(checks) > 1:
+            raise HTTPException(status_code=404, detail="Project not found")
+        return world["project"]
+
+    async def replay(project_id, since):
+        return 0, []
+
+    monkeypatch.setattr(board, "authenticate_token", authenticate)
+    monkeypatch.setattr(board, "ensure_project_access", ensure_access)
+    monkeypatch.setattr(board, "_token_expiry", lambda token: time.time() + expires_in if expires_in else None)
+    monkeypatch.setattr(settings, "BOARD_SOCKET_RECHECK_SECONDS", 0.2)
+    monkeypatch.setattr(board_hub, "enabled", True)
+    monkeypatch.setattr(board_hub, "replay", replay)
+
+    with TestClient(app).websocket_connect(
+        f"/api/v1/projects/{world['project'].id}/events", subprotocols=["bearer", "t"]
+    ) as socket:
+        assert socket.receive_json() == {"type": "board.ready", "seq": 0}
+        with pytest.raises(WebSocketDisconnect) as disconnect:
+            socket.receive_json()
+
+    assert disconnect.value.code == 1008
+    assert len(checks) == access_checks
+
+
+def test_task_update_publishes_event(monkeypatch, world, client_for):
+    published = []
+
+    async def publish_many(events):
+        published.extend(events)
+        return list(range(1, len(events) + 1))
+
+    monkeypatch.setattr(board_hub, "publish_many", publish_many)
+    client, session = client_for(world["project"], world["task"])
+
+    response = client.patch(f"/api/v1/tasks/{world['task'].id}", json={"title": "Renamed"})
+
+    assert response.status_code == 200
+    ((project_id, event_type, data),) = published
+    assert (project_id, event_type) == (world["project"].id, "task.updated")
+    assert data["task"]["title"] == "Renamed"
@@ -0,0 +1,83 @@
+from datetime import date, datetime, timezone
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from app.models.task import TaskHistory
+from app.services import history_partitions
+from app.services.history_partitions import add_months, partition_month, partition_name
+from tests.fakes import FakeResult
+
+
+class FakeConnection:
+    def __init__(self, tables):
+        self.tables = tables
+        self.statements = []
+
+    async def execute(self, stmt):
+        statement = str(stmt)
+        if "CONCURRENTLY" in statement and ("task_history_default", True) in self.tables:
+            raise RuntimeError("cannot detach partitions concurrently when a default partition exists")
+        self.statements.append(statement)
+        return FakeResult(self.tables)
+
+
+def test_partition_names_round_trip():
+    assert add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert partition_name(date(2026, 3, 1)) == "task_history_y2026m03"
+    assert partition_month("task_history_y2026m03") == date(2026, 3, 1)
+    assert partition_month("task_history_default") is None
+
+
+def test_task_history_is_range_partitioned():
+    ddl = str(CreateTable(TaskHistory.__table__).compile(dialect=postgresql.dialect()))
+
+    assert "PRIMARY KEY (id, created_at)" in ddl
+    assert "PARTITION BY RANGE (created_at)" in ddl
+
+
+async def test_only_missing_partitions_are_created(monkeypatch):
+    monkeypatch.setattr(history_partitions, "current_month", lambda: date(2026, 12, 1))
+    conn = FakeConnection([("task_history_y2026m12", True), ("task_history_default", True)])
+
+    created = await history_partitions.create_partitions(conn, months_ahead=2)
+
+    assert created == ["task_history_y2027m01", "task_history_y2027m02"]
+    assert "FOR VALUES FROM ('2027-01-01') TO ('2027-02-01')" in conn.statements[1]
+
+
+async def test_expired_partitions_are_detached_archived_and_dropped(monkeypatch, tmp_path):
+    monkeypatch.setattr(history_partitions, "current_month", lambda: date(2026, 10, 1))
+    archived_tables = []
+
+    async def copy_to_file(conn, table, path):
+        archived_tables.append(table)
+
+    monkeypatch.setattr(history_partitions, "_copy_to_file", copy_to_file)
+    conn = FakeConnection([
+        ("task_history_y2026m07", False),  # left detached by an interrupted run
+        ("task_history_y2026m08", True),
+        ("task_history_y2026m09", True),
+        ("task_history_default", True),
+    ])
+
+    paths = await history_partitions.archive_partitions(conn, retention_months=1, archive_dir=str(tmp_path))
+
+    assert archived_tables == ["task_history_y2026m07", "task_history_y2026m08"]
+    assert paths == [str(tmp_path / f"{table}.csv.gz") for table in archived_tables]
+    assert [statement for statement in conn.statements if "DETACH" in statement] == [
+        "ALTER TABLE task_history DETACH PARTITION task_history_y2026m08"
+    ]
+    assert "DROP TABLE task_history_y2026m09" not in conn.statements
+
+
+def test_history_query_is_bounded_by_task_creation(world, client_for):
+    world["task"].created_at = datetime(2026, 3, 4, tzinfo=timezone.utc)
+    client, session = client_for(world["project"], world["task"])
+
+    response = client.get(f"/api/v1/tasks/{world['task'].id}/history")
+
+    assert response.status_code == 200
+    history = str(session.queries[-1].compile(dialect=postgresql.dialect()))
+    assert "task_history.created_at >= %(created_at_1)s" in history
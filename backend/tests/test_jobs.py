@@ -0,0 +1,228 @@
+import asyncio
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.models.job import Job
+from app.services.jobs import JobPaused, JobProgress, execute_job, set_job_paused
+from app.worker import celery_app, tasks
+from tests.fakes import FakeResult
+
+
+class JobSession:
+    """Session factory and session returning `job` from the claiming UPDATE."""
+
+    def __init__(self, job):
+        self.job = job
+        self.queries = []
+        self.commits = 0
+        self.rolled_back = False
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt):
+        self.queries.append(stmt)
+        return FakeResult([self.job] if len(self.queries) == 1 and self.job else [])
+
+    def add(self, obj):
+        pass
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rolled_back = True
+
+    async def refresh(self, obj):
+        obj.status = "failed"
+
+
+class StatusSession(JobSession):
+    """Returns `status` from every UPDATE ... RETURNING status."""
+
+    def __init__(self, status):
+        super().__init__(None)
+        self.status = status
+
+    async def execute(self, stmt):
+        self.queries.append(stmt)
+        return FakeResult([self.status])
+
+
+def make_job(**values):
+    defaults = dict(
+        id=uuid4(), kind="sprint.complete", status="queued", params={}, progress=0, attempts=0,
+        created_at=datetime.now(timezone.utc),
+    )
+    return Job(**{**defaults, **values})
+
+
+async def test_finished_jobs_are_not_run_again():
+    calls = []
+
+    async def handler(db, job, progress):
+        calls.append(job)
+
+    assert await execute_job(uuid4(), handler, session_factory=JobSession(None)) is None
+    assert calls == []
+
+
+async def test_running_jobs_are_taken_over_only_with_a_stale_heartbeat():
+    session = JobSession(None)
+
+    await execute_job(uuid4(), None, session_factory=session)
+
+    claim = str(session.queries[0].compile(dialect=postgresql.dialect()))
+    assert "jobs.status = %(status_2)s AND (jobs.heartbeat_at IS NULL OR jobs.heartbeat_at <= now() - " in claim
+    assert "heartbeat_at=now()" in claim
+
+
+async def test_noticed_pause_clears_the_heartbeat():
+    session = StatusSession("paused")
+
+    with pytest.raises(JobPaused):
+        await JobProgress(uuid4(), session)(3)
+
+    # Cleared in the transaction that saw the pause, before it commits
+    assert session.queries[1].compile().params["heartbeat_at"] is None
+    assert session.commits == 1
+
+
+@pytest.mark.parametrize("status", ["running", "queued"])
+async def test_resume_lets_a_live_run_go_on(status):
+    job = make_job(kind="project.delete", status="paused")
+
+    assert await set_job_paused(StatusSession(status), job, False)
+    assert job.status == status
+    assert not await set_job_paused(StatusSession(None), job, False)
+
+
+async def test_handler_work_commits_with_the_final_status(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "JOB_FILES_DIR", str(tmp_path))
+    job = make_job()
+    session = JobSession(job)
+
+    async def handler(db, job, progress):
+        return {"done": True}
+
+    finished = await execute_job(job.id, handler, session_factory=session)
+
+    assert finished.status == "succeeded"
+    assert finished.result == {"done": True}
+    assert session.commits == 2  # claim, then work + status
+
+
+async def test_failed_job_is_rolled_back_and_recorded():
+    job = make_job()
+    session = JobSession(job)
+
+    async def handler(db, job, progress):
+        raise LookupError("Sprint not found")
+
+    finished = await execute_job(job.id, handler, session_factory=session)
+
+    assert session.rolled_back
+    assert finished.status == "failed"
+    assert session.queries[-1].compile().params["error"] == "Sprint not found"
+
+
+def test_project_deletion_returns_a_job(world, client_for, monkeypatch):
+    started = []
+    monkeypatch.setattr("app.api.v1.endpoints.jobs.enqueue", started.append)
+    client, _ = client_for(world["project"])
+
+    response = client.delete(f"/api/v1/projects/{world['project'].id}")
+
+    assert response.status_code == 202
+    assert response.json()["kind"] == "project.delete"
+    assert response.headers["location"] == f"/api/v1/jobs/{response.json()['id']}"
+    assert [job.kind for job in started] == ["project.delete"]
+
+
+def test_async_sprint_completion_reuses_the_active_job(world, client_for, monkeypatch):
+    started = []
+    monkeypatch.setattr("app.api.v1.endpoints.jobs.enqueue", started.append)
+    sprint = world["sprint"]
+    active = make_job(idempotency_key=str(sprint.id), created_by=world["user"].id, project_id=sprint.project_id)
+    active.status = "running"
+    client, _ = client_for(world["project"], sprint, active)
+
+    response = client.post(f"/api/v1/sprints/{sprint.id}/complete", headers={"Prefer": "respond-async"})
+
+    assert response.status_code == 202
+    assert response.json()["id"] == str(active.id)
+    assert started == []
+
+
+def test_retrying_a_job_that_never_started_enqueues_it_again(world, client_for, monkeypatch):
+    started = []
+    monkeypatch.setattr("app.api.v1.endpoints.jobs.enqueue", started.append)
+    sprint = world["sprint"]
+    queued = make_job(idempotency_key=str(sprint.id), created_by=world["user"].id, project_id=sprint.project_id)
+    client, _ = client_for(world["project"], sprint, queued)
+
+    response = client.post(f"/api/v1/sprints/{sprint.id}/complete", headers={"Prefer": "respond-async"})
+
+    assert response.status_code == 202
+    assert response.json()["id"] == str(queued.id)
+    assert started == [queued]
+
+
+async def test_sweep_enqueues_stalled_jobs_again(monkeypatch):
+    stalled = [make_job(), make_job(status="running")]
+    session = JobSession(None)
+    results = iter([FakeResult([True]), FakeResult(stalled)])
+
+    async def execute(stmt):
+        session.queries.append(stmt)
+        return next(results)
+
+    session.execute = execute
+    started = []
+    monkeypatch.setattr(tasks, "AsyncSessionLocal", session)
+    monkeypatch.setattr(tasks, "enqueue", started.append)
+
+    assert await tasks.requeue_stalled_jobs(300) == 2
+    assert started == stalled
+    sql = str(session.queries[1].compile(dialect=postgresql.dialect()))
+    assert "jobs.status = %(status_1)s AND jobs.created_at <" in sql
+    assert "jobs.heartbeat_at IS NULL" in sql
+
+
+def test_jobs_are_only_visible_to_their_creator(world, client_for):
+    own = make_job(created_by=world["user"].id, project_id=uuid4())
+    own.progress, own.total = 40, 100
+    other = make_job(created_by=uuid4())
+    client, _ = client_for(own, other)
+
+    response = client.get(f"/api/v1/jobs/{own.id}")
+    assert response.status_code == 200
+    assert (response.json()["progress"], response.json()["total"]) == (40, 100)
+    assert client.get(f"/api/v1/jobs/{other.id}").status_code == 404
+
+
+async def test_local_mode_runs_jobs_without_a_broker(monkeypatch):
+    ran = []
+
+    async def runner(job_id):
+        ran.append(job_id)
+
+    monkeypatch.setattr(settings, "JOBS_RUN_LOCALLY", True)
+    monkeypatch.setitem(tasks.JOB_RUNNERS, "sprint.complete", runner)
+    job = make_job()
+
+    tasks.enqueue(job)
+    await asyncio.gather(*tasks._local_jobs)
+
+    assert ran == [job.id]
+    assert "jobs.run" in celery_app.tasks
@@ -0,0 +1,190 @@
+import json
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.crud.comment import comment as crud_comment
+from app.models.outbox import OutboxEvent
+from app.models.user import User
+from app.schemas.comment import CommentCreate
+from app.services.notifications import Mailer, NotificationPipeline, compose_email, describe
+from app.services.smtp_sink import SmtpSink
+from tests.test_outbox import outbox_inserts
+from tests.fakes import FakeResult, RecordingSession
+
+
+class ScriptedSession:
+    """Returns canned rows for each query in order."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.queries = []
+
+    async def execute(self, stmt):
+        self.queries.append(stmt)
+        return FakeResult(self.results.pop(0))
+
+
+class RecordingMailer:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, messages, *, batch_size):
+        self.sent.extend(messages)
+        return len(messages)
+
+
+def user(name, **extra):
+    return SimpleNamespace(id=uuid4(), email=f"{name}@example.com", first_name=name, username=name, is_active=True, **extra)
+
+
+def entry(event_type, aggregate_id, project_id, **payload):
+    return {
+        "type": event_type,
+        "aggregate_id": str(aggregate_id),
+        "project_id": str(project_id),
+        "payload": json.dumps(payload, default=str),
+    }
+
+
+def test_describe_skips_events_nobody_hears_about():
+    sprint_id = str(uuid4())
+    assert describe("task.created", {}) is None
+    assert describe("task.moved", {"from_sprint_id": sprint_id, "sprint_id": sprint_id, "rank": "b"}) is None
+    assert describe("comment.updated", {"mentioned_users": []}) is None
+    change = describe("task.updated", {"changes": {"story_points": {"old": None, "new": 3}}})
+    assert change.text == "Changed story points: none → 3"
+
+
+async def test_changes_within_window_are_coalesced_per_recipient():
+    task_id, project_id = uuid4(), uuid4()
+    alice, bob = user("alice"), user("bob")
+    mailer = RecordingMailer()
+    pipeline = NotificationPipeline(mailer=mailer, window=60)
+
+    pipeline.collect("events:task", "1-0", entry(
+        "task.updated", task_id, project_id, actor_id=alice.id, changes={"status": {"old": "todo", "new": "done"}}
+    ), now=0)
+    pipeline.collect("events:task", "2-0", entry(
+        "task.updated", task_id, project_id, actor_id=bob.id, changes={"title": {"old": "A", "new": "B"}}
+    ), now=30)
+    pipeline.collect("events:task", "3-0", entry("task.created", task_id, project_id), now=30)
+    # Redelivered entries are not counted twice
+    pipeline.collect("events:task", "2-0", entry(
+        "task.updated", task_id, project_id, actor_id=bob.id, changes={"title": {"old": "A", "new": "B"}}
+    ), now=30)
+
+    sent, acked = await pipeline.flush(ScriptedSession(), now=59)
+    assert sent == 0
+    assert acked == [("events:task", "3-0")]
+
+    task_row = SimpleNamespace(id=task_id, task_number=7, title="B", key="WEB")
+    watchers = [SimpleNamespace(task_id=task_id, **vars(watcher)) for watcher in (alice, bob)]
+    session = ScriptedSession([task_row], watchers, [alice, bob])
+    sent, acked = await pipeline.flush(session, now=60)
+
+    assert len(session.queries) == 3
+    assert sent == 2
+    assert sorted(acked) == [("events:task", "1-0"), ("events:task", "2-0")]
+    by_recipient = {message["To"]: message for message in mailer.sent}
+    # Each watcher hears about the other's change only
+    alice_body = by_recipient["alice <alice@example.com>"].get_content()
+    assert "Changed title: A → B (by bob)" in alice_body
+    assert "status" not in alice_body
+    assert by_recipient["bob <bob@example.com>"]["Subject"] == "[WEB-7] B"
+    assert "Changed status: todo → done (by alice)" in by_recipient["bob <bob@example.com>"].get_content()
+
+
+async def test_failed_batch_is_retried_without_resending_earlier_ones():
+    task_id, project_id = uuid4(), uuid4()
+    actor, alice, bob = user("actor"), user("alice"), user("bob")
+    attempts = []
+
+    class FlakyMailer(RecordingMailer):
+        async def send(self, messages, *, batch_size):
+            attempts.append([message["To"] for message in messages])
+            if len(attempts) == 2:
+                raise OSError("SMTP connection lost")
+            return await super().send(messages, batch_size=batch_size)
+
+    mailer = FlakyMailer()
+    pipeline = NotificationPipeline(mailer=mailer, window=0, batch_size=1)
+    pipeline.collect("events:task", "1-0", entry(
+        "task.updated", task_id, project_id, actor_id=actor.id, changes={"title": {"old": "A", "new": "B"}}
+    ), now=0)
+
+    def session():
+        task_row = SimpleNamespace(id=task_id, task_number=1, title="B", key="WEB")
+        watchers = [SimpleNamespace(task_id=task_id, **vars(watcher)) for watcher in (alice, bob)]
+        return ScriptedSession([task_row], watchers, [actor])
+
+    with pytest.raises(OSError):
+        await pipeline.flush(session(), now=0)
+    sent, acked = await pipeline.flush(session(), now=0)
+
+    assert attempts == [["alice <alice@example.com>"], ["bob <bob@example.com>"], ["bob <bob@example.com>"]]
+    assert [message["To"] for message in mailer.sent] == ["alice <alice@example.com>", "bob <bob@example.com>"]
+    assert (sent, acked) == (1, [("events:task", "1-0")])
+
+
+async def test_mentions_reach_project_members_only():
+    task_id, comment_id, project_id = uuid4(), uuid4(), uuid4()
+    author, member, outsider = user("author"), user("member"), user("outsider")
+    mailer = RecordingMailer()
+    pipeline = NotificationPipeline(mailer=mailer, window=0)
+    pipeline.collect("events:comment", "1-0", entry(
+        "comment.created", comment_id, project_id,
+        actor_id=author.id, task_id=task_id, mentioned_users=[member.id, outsider.id],
+    ), now=0)
+
+    task_row = SimpleNamespace(id=task_id, task_number=1, title="Task", key="WEB")
+    session = ScriptedSession(
+        [task_row], [], [author, member, outsider], [(project_id, author.id), (project_id, member.id)]
+    )
+    sent, _ = await pipeline.flush(session, now=0)
+
+    assert sent == 1
+    (message,) = mailer.sent
+    assert message["To"] == "member <member@example.com>"
+    assert "You were mentioned in a comment (by author)" in message.get_content()
+
+
+async def test_comment_mentions_reach_the_outbox_event():
+    project_id = uuid4()
+    member = User(id=uuid4(), username="member", email="member@example.com", is_active=True)
+    other = User(id=uuid4(), username="other", email="other@example.com", is_active=True)
+    session = RecordingSession([member, other])
+
+    comment = await crud_comment.create_for_user(
+        session,
+        obj_in=CommentCreate(task_id=uuid4(), content="@member please check, cc ops@other.io"),
+        user_id=uuid4(),
+        project_id=project_id,
+    )
+
+    assert comment.mentioned_users == [member.id]
+    (created,) = outbox_inserts(session)
+    payload = created._multi_values[0][0][OutboxEvent.__table__.c.payload]
+    assert payload["mentioned_users"] == [str(member.id)]
+    assert describe("comment.created", payload).mentioned == (member.id,)
+
+    # Editing notifies only the users the edit adds
+    await crud_comment.update_content(session, db_obj=comment, content="@member @other", project_id=project_id)
+
+    assert comment.mentioned_users == [member.id, other.id]
+    payload = outbox_inserts(session)[-1]._multi_values[0][0][OutboxEvent.__table__.c.payload]
+    assert payload["mentioned_users"] == [str(other.id)]
+
+
+async def test_mailer_sends_batches_over_one_connection_each():
+    async with SmtpSink() as sink:
+        mailer = Mailer(host=sink.host, port=sink.port, use_tls=False, user=None, password=None, sender="Tracker <t@example.com>")
+        messages = [compose_email(f"user{i}@example.com", f"user{i}", "WEB-1", "Task", ["Changed"]) for i in range(5)]
+
+        assert await mailer.send(messages, batch_size=2) == 5
+
+    assert sink.connections == 3
+    assert [mail.recipients for mail in sink.messages] == [[f"user{i}@example.com"] for i in range(5)]
+    assert sink.messages[0].message["From"] == "Tracker <t@example.com>"
+    assert sink.messages[0].message["Subject"] == "[WEB-1] Task"
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.crud.task import task as crud_task
+from app.models.outbox import OutboxEvent
+from app.models.task import Task
+from app.services import outbox
+from app.services.outbox import RelayMetrics, record_events, relay_batch
+from tests.fakes import RecordingSession
+
+
+def sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def outbox_inserts(session):
+    return [query for query in session.queries if getattr(query, "table", None) == OutboxEvent.__table__]
+
+
+class FakePipeline:
+    def __init__(self):
+        self.added = []
+        self.executed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def xadd(self, stream, fields, **kwargs):
+        self.added.append((stream, fields))
+
+    async def execute(self):
+        self.executed = True
+
+
+class FakeRedis:
+    def __init__(self):
+        self.pipe = FakePipeline()
+
+    def pipeline(self, transaction=True):
+        return self.pipe
+
+
+async def test_events_are_recorded_with_one_json_safe_insert():
+    task_id, project_id = uuid4(), uuid4()
+    session = RecordingSession([])
+
+    await record_events(session, [
+        ("task", task_id, project_id, "task.created", {"actor_id": uuid4()}),
+        ("task", task_id, project_id, "task.deleted", {}),
+    ])
+
+    (insert,) = session.queries
+    rows = insert._multi_values[0]
+    assert len(rows) == 2
+    assert isinstance(rows[0][OutboxEvent.__table__.c.payload]["actor_id"], str)
+
+
+async def test_task_update_records_changed_fields_only():
+    task = Task(id=uuid4(), project_id=uuid4(), title="Task", status="todo", logged_hours=0)
+    actor_id = uuid4()
+    session = RecordingSession([])
+
+    await crud_task.update(session, db_obj=task, obj_in={"title": "Task"})
+    assert outbox_inserts(session) == []
+
+    await crud_task.update(session, db_obj=task, obj_in={"title": "Renamed", "status": "done"}, actor_id=actor_id)
+    (insert,) = outbox_inserts(session)
+    (row,) = insert._multi_values[0]
+    assert row[OutboxEvent.__table__.c.event_type] == "task.updated"
+    assert row[OutboxEvent.__table__.c.payload] == {
+        "actor_id": str(actor_id),
+        "changes": {"title": {"old": "Task", "new": "Renamed"}, "status": {"old": "todo", "new": "done"}},
+    }
+
+
+async def test_relay_publishes_claimed_batch_and_deletes_it(monkeypatch):
+    created_at = datetime.now(timezone.utc) - timedelta(seconds=5)
+    events = [
+        OutboxEvent(
+            id=number, aggregate_type=aggregate_type, aggregate_id=uuid4(), project_id=None,
+            event_type=f"{aggregate_type}.created", payload={}, created_at=created_at,
+        )
+        for number, aggregate_type in ((1, "task"), (2, "comment"))
+    ]
+    redis = FakeRedis()
+    metrics = RelayMetrics()
+    monkeypatch.setattr(outbox, "get_redis", lambda: redis)
+    monkeypatch.setattr(outbox, "relay_metrics", metrics)
+    session = RecordingSession(events)
+
+    assert await relay_batch(session, batch_size=10) == 2
+
+    claim, remove = session.queries
+    assert "FOR UPDATE SKIP LOCKED" in sql(claim)
+    assert [stream for stream, _ in redis.pipe.added] == ["events:task", "events:comment"]
+    assert [fields["outbox_id"] for _, fields in redis.pipe.added] == [1, 2]
+    assert redis.pipe.executed
+    assert [1, 2] in remove.compile().params.values()
+    assert metrics.published == 2 and metrics.last_lag_seconds >= 5
+
+
+def test_throughput_only_counts_recent_batches(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(outbox.time, "monotonic", lambda: now)
+    metrics = RelayMetrics()
+    metrics.record(600, 0.5)
+
+    now = 1030.0
+    metrics.record(600, 2.0)
+    assert metrics.throughput() == 20.0
+    assert metrics.max_lag_seconds == 2.0
+
+    now = 1070.0
+    assert metrics.throughput() == 10.0
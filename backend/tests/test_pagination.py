@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.crud.task import task as crud_task
+from app.db import base  # noqa: F401  (register all models)
+from app.models.task import Task
+
+
+def test_cursor_roundtrip():
+    created_at = datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+    task_id = uuid4()
+
+    cursor = encode_cursor(created_at, task_id)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, task_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "garbage", encode_cursor(datetime.now(), uuid4())[:-3]])
+def test_invalid_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_keyset_page_has_no_offset():
+    after = (datetime.now(timezone.utc), uuid4())
+
+    query = crud_task._paginate(select(Task), skip=40, limit=20, after=after)
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert "(tasks.created_at, tasks.id) <" in sql
+    assert "OFFSET" not in sql
+    assert "ORDER BY tasks.created_at DESC, tasks.id DESC" in sql
+
+
+def test_offset_page_without_cursor():
+    query = crud_task._paginate(select(Task), skip=40, limit=20, after=None)
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert "OFFSET" in sql
@@ -0,0 +1,113 @@
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.db import base  # noqa: F401  (register all models)
+from app.models.project import Project
+from app.services.permission_cache import PermissionSchemeCache, compile_scheme
+from app.services.permissions import ProjectAccess
+
+
+def make_access(**overrides):
+    user_id = overrides.pop("user_id", uuid4())
+    project = Project(id=uuid4(), organization_id=uuid4(), created_by=overrides.pop("created_by", uuid4()))
+    return ProjectAccess(project=project, user_id=user_id, **overrides)
+
+
+def test_no_roles_means_no_access():
+    access = make_access()
+
+    assert not access.has_access
+    assert not access.has_permission("VIEW_ISSUES")
+    with pytest.raises(HTTPException) as exc:
+        access.ensure_access()
+    assert exc.value.status_code == 403
+
+
+def test_creator_has_access_without_roles():
+    user_id = uuid4()
+    access = make_access(user_id=user_id, created_by=user_id)
+
+    assert access.ensure_access() is access.project
+    assert not access.has_permission("EDIT_ISSUES")
+
+
+def test_scheme_role_rule_grants_permission():
+    access = make_access(
+        project_role="viewer",
+        scheme=compile_scheme(uuid4(), 1, [("EDIT_ISSUES", "role", "viewer")]),
+    )
+
+    assert access.has_permission("EDIT_ISSUES")
+    assert not access.has_permission("MANAGE_SPRINTS")
+
+
+def test_scheme_user_rule_grants_permission():
+    user_id = uuid4()
+    access = make_access(
+        user_id=user_id,
+        org_role="guest",
+        scheme=compile_scheme(uuid4(), 1, [("MANAGE_SPRINTS", "user", str(user_id))]),
+    )
+
+    assert access.has_permission("MANAGE_SPRINTS")
+
+
+def test_falls_back_to_role_mapping():
+    access = make_access(project_role="member", org_role="lead")
+
+    assert access.has_permission("CREATE_ISSUES")
+    assert access.has_permission("ADMINISTER_PROJECT")
+
+
+def test_require_raises_for_missing_permission():
+    access = make_access(project_role="viewer")
+
+    with pytest.raises(HTTPException) as exc:
+        access.require("DELETE_COMMENT")
+    assert exc.value.status_code == 403
+    assert "DELETE_COMMENT" in exc.value.detail
+
+
+def test_compiled_scheme_indexes_rules_by_key():
+    user_id = uuid4()
+    compiled = compile_scheme(
+        uuid4(),
+        1,
+        [
+            ("EDIT_ISSUES", "role", "developer"),
+            ("EDIT_ISSUES", "role", "lead"),
+            ("EDIT_ISSUES", "user", str(user_id)),
+            ("EDIT_ISSUES", "group", "qa"),
+        ],
+    )
+
+    assert compiled.roles["EDIT_ISSUES"] == {"developer", "lead"}
+    assert compiled.allows("EDIT_ISSUES", roles={"lead"}, user_id=uuid4())
+    assert compiled.allows("EDIT_ISSUES", roles=set(), user_id=user_id)
+    assert not compiled.allows("EDIT_ISSUES", roles={"viewer"}, user_id=uuid4())
+    assert not compiled.allows("MANAGE_SPRINTS", roles={"lead"}, user_id=user_id)
+
+
+def test_scheme_cache_serves_only_matching_version():
+    cache = PermissionSchemeCache(channel="test")
+    scheme_id = uuid4()
+    cache.put(compile_scheme(scheme_id, 2, []))
+
+    assert cache.get(scheme_id, 2) is not None
+    assert cache.get(scheme_id, 3) is None
+
+
+def test_scheme_cache_invalidation_message_drops_older_versions():
+    cache = PermissionSchemeCache(channel="test")
+    scheme_id = uuid4()
+    cache.put(compile_scheme(scheme_id, 2, []))
+
+    cache.handle_message('{"scheme_id": "%s", "version": 2}' % scheme_id)
+    assert cache.get(scheme_id, 2) is not None
+
+    cache.handle_message('{"scheme_id": "%s", "version": 3}' % scheme_id)
+    assert cache.get(scheme_id, 2) is None
+
+    cache.handle_message("not json")
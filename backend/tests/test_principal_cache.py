@@ -0,0 +1,67 @@
+from uuid import uuid4
+
+from app.services import principal_cache as principal_cache_module
+from app.services.principal_cache import Principal, PrincipalCache
+
+
+def make_principal(**overrides):
+    data = {"id": uuid4(), "is_active": True, "is_superuser": False}
+    data.update(overrides)
+    return Principal(**data)
+
+
+async def test_cache_returns_stored_principal():
+    cache = PrincipalCache(ttl_seconds=30, max_size=10)
+    principal = make_principal()
+
+    await cache.set(str(principal.id), principal)
+
+    assert await cache.get(str(principal.id)) == principal
+
+
+async def test_cache_entry_expires(monkeypatch):
+    cache = PrincipalCache(ttl_seconds=30, max_size=10)
+    principal = make_principal()
+    now = 1000.0
+    monkeypatch.setattr(principal_cache_module.time, "monotonic", lambda: now)
+    await cache.set(str(principal.id), principal)
+
+    now = 1031.0
+
+    assert await cache.get(str(principal.id)) is None
+
+
+async def test_invalidate_drops_entry():
+    cache = PrincipalCache(ttl_seconds=30, max_size=10)
+    principal = make_principal()
+    await cache.set(str(principal.id), principal)
+
+    await cache.invalidate(str(principal.id))
+
+    assert await cache.get(str(principal.id)) is None
+
+
+async def test_cache_is_bounded():
+    cache = PrincipalCache(ttl_seconds=30, max_size=2)
+    principals = [make_principal() for _ in range(3)]
+
+    for principal in principals:
+        await cache.set(str(principal.id), principal)
+
+    assert len(cache._entries) == 2
+    assert await cache.get(str(principals[-1].id)) == principals[-1]
+
+
+async def test_zero_ttl_disables_cache():
+    cache = PrincipalCache(ttl_seconds=0, max_size=10)
+    principal = make_principal()
+
+    await cache.set(str(principal.id), principal)
+
+    assert await cache.get(str(principal.id)) is None
+
+
+def test_principal_json_roundtrip():
+    principal = make_principal(is_superuser=True)
+
+    assert Principal.from_json(principal.to_json()) == principal
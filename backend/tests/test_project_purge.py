@@ -0,0 +1,126 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.models.job import Job
+from app.services.jobs import JobPaused, set_job_paused
+from app.services.project_purge import purge_project
+from tests.test_jobs import StatusSession
+from tests.fakes import FakeResult
+
+
+class PurgeSession:
+    """Deletes `rows[table]` rows in total; counts report them all."""
+
+    def __init__(self, rows):
+        self.rows = dict(rows)
+        self.deletes = []
+        self.commits = 0
+
+    async def execute(self, stmt):
+        if isinstance(stmt, Select):
+            table = stmt.get_final_froms()[0].name
+            return FakeResult([self.rows.get(table, 0)])
+        table = stmt.table.name
+        limit = stmt.whereclause.right.element._limit if table != "projects" else 1
+        count = min(self.rows.get(table, 0), limit)
+        self.rows[table] = self.rows.get(table, 0) - count
+        self.deletes.append((table, count))
+        return FakeResult([], rowcount=count)
+
+    async def commit(self):
+        self.commits += 1
+
+
+class Progress:
+    def __init__(self, pause_at=None):
+        self.reports = []
+        self.pause_at = pause_at
+
+    async def __call__(self, progress, total=None):
+        self.reports.append((progress, total))
+        if progress == self.pause_at:
+            raise JobPaused()
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(settings, "PROJECT_PURGE_CHUNK_SIZE", 2)
+    monkeypatch.setattr(settings, "PROJECT_PURGE_PAUSE_SECONDS", 0)
+
+
+def purge_job(**values):
+    defaults = dict(
+        id=uuid4(), kind="project.delete", project_id=uuid4(), status="running", params={}, progress=0, attempts=0,
+        created_at=datetime.now(timezone.utc),
+    )
+    return Job(**{**defaults, **values})
+
+
+async def test_rows_are_deleted_in_committed_chunks():
+    session = PurgeSession({"task_history": 5, "tasks": 2, "projects": 1})
+    progress = Progress()
+
+    result = await purge_project(session, purge_job(), progress)
+
+    history = [count for table, count in session.deletes if table == "task_history"]
+    assert history == [2, 2, 1]
+    assert session.deletes[-1] == ("projects", 1)
+    assert result == {"deleted_rows": 8}
+    assert progress.reports[0] == (0, 8)  # task history, tasks and the project
+    assert progress.reports[-1] == (7, None)
+    # Every chunk commits on its own; the project row commits with the job
+    assert session.commits == len(session.deletes) - 1
+
+
+async def test_paused_purge_resumes_from_its_progress():
+    session = PurgeSession({"task_history": 5, "projects": 1})
+
+    with pytest.raises(JobPaused):
+        await purge_project(session, purge_job(), Progress(pause_at=4))
+    assert session.rows["task_history"] == 1
+
+    progress = Progress()
+    result = await purge_project(session, purge_job(progress=4, total=6), progress)
+
+    assert progress.reports[0] == (5, None)  # no recount when resumed
+    assert result == {"deleted_rows": 6}
+
+
+def test_deleted_project_is_hidden_and_purged_by_a_job(world, client_for, monkeypatch):
+    started = []
+    monkeypatch.setattr("app.api.v1.endpoints.jobs.enqueue", started.append)
+    client, _ = client_for(world["project"])
+
+    response = client.delete(f"/api/v1/projects/{world['project'].id}")
+
+    assert response.status_code == 202
+    assert world["project"].deleted_at is not None
+    assert [job.kind for job in started] == ["project.delete"]
+
+
+def test_only_purges_can_be_paused(world, client_for):
+    purge = purge_job(created_by=world["user"].id)
+    other = purge_job(kind="sprint.complete", created_by=world["user"].id)
+    client, _ = client_for(purge, other)
+
+    response = client.post(f"/api/v1/jobs/{purge.id}/pause")
+    assert response.status_code == 200
+    assert response.json()["status"] == "paused"
+    assert client.post(f"/api/v1/jobs/{other.id}/pause").status_code == 409
+
+
+async def test_failed_purge_can_be_resumed():
+    session = StatusSession("queued")
+    job = purge_job(status="failed", error="deadlock detected", progress=4)
+
+    assert await set_job_paused(session, job, False)
+
+    assert job.status == "queued"
+    (resume,) = session.queries
+    assert resume.compile().params["status_2"] == ["paused", "failed"]
+    assert resume.compile().params["error"] is None
+    assert not await set_job_paused(StatusSession("queued"), purge_job(kind="project.export", status="failed"), False)
@@ -0,0 +1,147 @@
+"""Round trips issued by authorization-heavy endpoints.
+
+Endpoints run against a recording session standing in for AsyncSession. Every
+`execute` and every `get` that misses the identity map counts as one query.
+"""
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_current_user, get_db
+from app.main import app
+from app.models.permission import PermissionSchemeRule
+from app.models.task import Task
+from app.services.access import ensure_task_access
+from app.services.auth_context import bind_auth_context
+from app.services.permission_cache import permission_scheme_cache
+from app.services.permissions import require_project_permission
+from tests.fakes import RecordingSession
+
+
+def test_get_task_queries(world, client_for):
+    client, session = client_for(world["project"], world["task"])
+
+    response = client.get(f"/api/v1/tasks/{world['task'].id}")
+
+    assert response.status_code == 200
+    assert len(session.queries) == 2  # task + access
+
+
+def test_update_task_queries(world, client_for):
+    client, session = client_for(world["project"], world["task"])
+
+    response = client.patch(f"/api/v1/tasks/{world['task'].id}", json={"title": "Renamed"})
+
+    assert response.status_code == 200
+    assert len(session.queries) == 5  # task + access + outbox + history + saved views
+
+
+def test_delete_task_queries(world, client_for):
+    client, session = client_for(world["project"], world["task"])
+
+    response = client.delete(f"/api/v1/tasks/{world['task'].id}")
+
+    assert response.status_code == 204
+    assert len(session.queries) == 5  # task + access + history + saved views + delete
+
+
+def test_bulk_update_queries(world, client_for):
+    second = Task(
+        id=uuid4(), project_id=world["project"].id, task_number=2, title="Second", status="todo",
+        priority="medium", type="task", reporter_id=world["user"].id, logged_hours=0, position=1,
+        tags=[], created_at=world["task"].created_at,
+    )
+    client, session = client_for(world["project"], world["task"], second)
+
+    response = client.post("/api/v1/tasks/bulk", json={
+        "task_ids": [str(world["task"].id), str(second.id)],
+        "changes": {"status": "done", "priority": "high"},
+    })
+
+    assert response.status_code == 200
+    assert len(session.queries) == 7  # tasks + access + history + transitions + update + counters + views
+    history_insert = session.queries[2]
+    assert history_insert.table.name == "task_history"
+    assert len(history_insert._multi_values[0]) == 4  # 2 tasks x 2 fields
+
+
+def test_task_history_queries(world, client_for):
+    client, session = client_for(world["project"], world["task"])
+
+    response = client.get(f"/api/v1/tasks/{world['task'].id}/history")
+
+    assert response.status_code == 200
+    assert len(session.queries) == 3  # task + access + history
+
+
+def test_create_comment_queries(world, client_for):
+    client, session = client_for(world["project"], world["task"])
+
+    response = client.post("/api/v1/comments", json={"task_id": str(world["task"].id), "content": "Hello"})
+
+    assert response.status_code == 201
+    assert len(session.queries) == 3  # task + access + outbox
+
+
+def test_delete_comment_queries(world, client_for):
+    client, session = client_for(world["project"], world["task"], world["comment"])
+
+    response = client.delete(f"/api/v1/comments/{world['comment'].id}")
+
+    assert response.status_code == 204
+    assert len(session.queries) == 4  # comment + task + access + delete
+
+
+def test_update_project_queries(world, client_for):
+    client, session = client_for(world["project"])
+
+    response = client.patch(f"/api/v1/projects/{world['project'].id}", json={"name": "Renamed"})
+
+    assert response.status_code == 200
+    assert len(session.queries) == 1  # access
+
+
+def test_complete_sprint_queries(world, client_for):
+    client, session = client_for(world["project"], world["sprint"])
+
+    response = client.post(f"/api/v1/sprints/{world['sprint'].id}/complete")
+
+    assert response.status_code == 200
+    assert len(session.queries) == 4  # sprint + access + burndown snapshot + outbox
+
+
+async def test_auth_context_memoizes_repeated_checks(world):
+    session = RecordingSession([world["project"], world["task"]])
+    user_id = world["user"].id
+    bind_auth_context(session, user_id)
+
+    task = await ensure_task_access(session, task_id=world["task"].id, user_id=user_id)
+    for permission_key in ("EDIT_ISSUES", "TRANSITION_ISSUES", "ADMINISTER_PROJECT"):
+        await require_project_permission(
+            session, project_id=task.project_id, user_id=user_id, permission_key=permission_key
+        )
+
+    assert len(session.queries) == 2  # task + access
+
+
+def test_compiled_scheme_is_loaded_once(world, client_for):
+    scheme_id = uuid4()
+    world["project"].permission_scheme_id = scheme_id
+    rule = PermissionSchemeRule(
+        id=uuid4(), scheme_id=scheme_id, permission_key="EDIT_ISSUES",
+        principal_type="role", principal_identifier="viewer",
+    )
+    permission_scheme_cache.clear()
+
+    for expected_queries in (6, 5):  # rules are only loaded on the first request
+        session = RecordingSession([world["project"], world["task"], rule], role="viewer", scheme_version=1)
+        app.dependency_overrides[get_db] = lambda: session
+        app.dependency_overrides[get_current_user] = lambda: world["user"]
+
+        response = TestClient(app).patch(
+            f"/api/v1/tasks/{world['task'].id}", json={"title": f"Renamed {expected_queries}"}
+        )
+
+        assert response.status_code == 200
+        assert len(session.queries) == expected_queries
+    permission_scheme_cache.clear()
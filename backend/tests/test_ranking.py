@@ -0,0 +1,116 @@
+import random
+from uuid import uuid4
+
+import pytest
+
+from app.services.ranking import (
+    APPEND_WIDTH, ALPHABET, rank_after, rank_between, ranks_after, reordered_ranks, spread_ranks
+)
+
+
+@pytest.mark.parametrize(
+    "lower, upper",
+    [(None, None), (None, "V"), ("V", None), ("1", "2"), ("1", "1V"), ("0V", "1"), ("zz", None), ("Az", "B")],
+)
+def test_rank_between_is_strictly_between(lower, upper):
+    rank = rank_between(lower, upper)
+
+    assert (lower or "") < rank
+    assert upper is None or rank < upper
+    assert not rank.endswith("0")
+
+
+def test_rank_between_rejects_unordered_bounds():
+    with pytest.raises(ValueError):
+        rank_between("b", "a")
+    with pytest.raises(ValueError):
+        rank_between("a", "a")
+
+
+def test_repeated_inserts_keep_order():
+    ranks = [rank_between(None, None)]
+    rng = random.Random(7)
+    for _ in range(2000):
+        index = rng.randint(0, len(ranks))
+        lower = ranks[index - 1] if index > 0 else None
+        upper = ranks[index] if index < len(ranks) else None
+        ranks.insert(index, rank_between(lower, upper))
+
+    assert ranks == sorted(ranks)
+    assert len(set(ranks)) == len(ranks)
+
+
+def test_inserting_into_same_gap_grows_slowly():
+    lower, upper = "V", "W"
+    for _ in range(50):
+        upper = rank_between(lower, upper)
+
+    assert len(upper) < 15
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 61, 62, 1000, 50_000])
+def test_spread_ranks_are_sorted_and_short(count):
+    ranks = spread_ranks(count)
+
+    assert len(ranks) == count
+    assert ranks == sorted(ranks)
+    assert len(set(ranks)) == count
+    assert all(rank and not rank.endswith("0") for rank in ranks)
+    assert all(len(rank) <= 4 for rank in ranks)
+
+
+def test_alphabet_is_in_byte_order():
+    assert list(ALPHABET) == sorted(ALPHABET)
+
+
+@pytest.mark.parametrize("lower", [None, "V", "zz", "Vzzz"])
+def test_ranks_after_appends_in_order(lower):
+    ranks = ranks_after(lower, 5000)
+
+    assert ranks == sorted(ranks)
+    assert len(set(ranks)) == 5000
+    assert (lower or "") < ranks[0]
+    assert max(len(rank) for rank in ranks) <= len(lower or "") + 4
+
+
+def test_appending_one_at_a_time_keeps_ranks_short():
+    ranks = [rank_after(None)]
+    for _ in range(5000):
+        ranks.append(rank_after(ranks[-1]))
+
+    assert ranks == sorted(ranks)
+    assert len(set(ranks)) == len(ranks)
+    assert max(len(rank) for rank in ranks) <= APPEND_WIDTH
+    assert not any(rank.endswith("0") for rank in ranks)
+
+
+@pytest.mark.parametrize("lower", ["V0001x", "Vzzz", "zzzz", "zzzzV"])
+def test_rank_after_exceeds_long_ranks(lower):
+    assert rank_after(lower) > lower
+
+
+def reorder(ranked, moved):
+    ranks = dict(ranked)
+    ranks.update(reordered_ranks(ranked, moved))
+    return sorted(ranks, key=ranks.get)
+
+
+def test_partial_reorder_keeps_untouched_tasks_in_place():
+    ids = [uuid4() for _ in range(6)]
+    ranked = list(zip(ids, spread_ranks(6)))
+
+    # Swapping the tasks at positions 3 and 4 leaves the others where they were
+    assert reorder(ranked, [(ids[4], 3), (ids[3], 4)]) == ids[:3] + [ids[4], ids[3], ids[5]]
+    assert reorder(ranked, [(ids[5], 0), (ids[0], 5)]) == [ids[5]] + ids[1:5] + [ids[0]]
+    assert reorder(ranked, [(ids[1], 4), (ids[2], 5)]) == [ids[0], ids[3], ids[4], ids[5], ids[1], ids[2]]
+
+
+def test_reorder_only_ranks_listed_tasks():
+    ids = [uuid4() for _ in range(3)]
+    ranked = list(zip(ids, spread_ranks(3)))
+
+    ranks = reordered_ranks(ranked, [(ids[2], 0), (uuid4(), 1)])
+
+    assert list(ranks) == [ids[2]]
+    assert ranks[ids[2]] < ranked[0][1]
+
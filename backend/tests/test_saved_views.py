@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.saved_view import SavedView
+from app.models.task import Task
+from app.services.saved_views import apply_task_change
+from app.services.task_filter import task_values
+from tests.fakes import RecordingSession
+
+
+def make_view(project_id, filter_text):
+    return SavedView(
+        id=uuid4(), project_id=project_id, owner_id=uuid4(), name=filter_text, filter=filter_text,
+        page_size=20, cached_count=3, cached_task_ids=[], cached_at=datetime.now(timezone.utc),
+    )
+
+
+def sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+async def test_task_change_adjusts_matching_views_only():
+    project_id = uuid4()
+    todo_view, done_view, other_view = (
+        make_view(project_id, "status = todo"),
+        make_view(project_id, "status = done"),
+        make_view(project_id, "priority = low"),
+    )
+    session = RecordingSession([todo_view, done_view, other_view])
+    task = Task(id=uuid4(), project_id=project_id, status="todo", priority="high", tags=[])
+    before = task_values(task)
+    task.status = "done"
+
+    await apply_task_change(session, task=task, before=before, after=task_values(task))
+
+    select_views, added, removed = session.queries
+    assert "FOR UPDATE" in sql(select_views)
+    assert "cached_at IS NOT NULL" not in sql(select_views)
+    assert "saved_views.cached_count + " in sql(added)
+    assert [done_view.id] in added.compile().params.values()
+    assert "saved_views.cached_count - " in sql(removed)
+    assert [todo_view.id] in removed.compile().params.values()
+
+
+async def test_created_task_is_prepended_to_first_page():
+    project_id = uuid4()
+    view = make_view(project_id, None)
+    session = RecordingSession([view])
+    task = Task(id=uuid4(), project_id=project_id, status="todo", tags=[])
+
+    await apply_task_change(session, task=task, before=None, after=task_values(task))
+
+    _, prepend = session.queries
+    assert "trim_array(ARRAY[" in sql(prepend)
+
+
+async def test_unrelated_change_writes_nothing():
+    project_id = uuid4()
+    session = RecordingSession([make_view(project_id, "status = done")])
+    task = Task(id=uuid4(), project_id=project_id, status="todo", title="Old", tags=[])
+    before = task_values(task)
+    task.title = "New"
+
+    await apply_task_change(session, task=task, before=before, after=task_values(task))
+
+    assert len(session.queries) == 1
+
+
+async def test_uncached_views_are_locked_but_left_alone():
+    project_id = uuid4()
+    view = make_view(project_id, None)
+    view.cached_at = view.cached_count = None
+    session = RecordingSession([view])
+    task = Task(id=uuid4(), project_id=project_id, status="todo", tags=[])
+
+    await apply_task_change(session, task=task, before=None, after=task_values(task))
+
+    (select_views,) = session.queries
+    assert sql(select_views).endswith("ORDER BY saved_views.id FOR UPDATE")
+
@@ -0,0 +1,40 @@
+from uuid import uuid4
+
+import pytest
+
+from app.core.pagination import decode_rank_cursor, encode_rank_cursor
+from app.services.search import MAX_TASK_NUMBER, parse_task_key, task_number_ranges
+
+
+@pytest.mark.parametrize(
+    "q, expected",
+    [("PROJ-12", ("PROJ", "12")), (" proj-7 ", ("PROJ", "7")), ("PROJ", None), ("login bug", None), ("PROJ-12a", None)],
+)
+def test_parse_task_key(q, expected):
+    assert parse_task_key(q) == expected
+
+
+def test_task_number_ranges_cover_prefix():
+    ranges = task_number_ranges("12")
+
+    assert ranges[:3] == [(12, 12), (120, 129), (1200, 1299)]
+    assert ranges[-1][1] <= MAX_TASK_NUMBER
+
+    def matches(number):
+        return any(low <= number <= high for low, high in ranges)
+
+    for number in (12, 125, 1299, 12345678):
+        assert matches(number)
+    for number in (1, 13, 112, 130, 1300):
+        assert not matches(number)
+
+
+@pytest.mark.parametrize("prefix", ["0", "012"])
+def test_task_number_ranges_without_matches(prefix):
+    assert task_number_ranges(prefix) == []
+
+
+def test_rank_cursor_roundtrip():
+    task_id = uuid4()
+
+    assert decode_rank_cursor(encode_rank_cursor(0.0607927, task_id)) == (0.0607927, task_id)
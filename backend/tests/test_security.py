@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from fastapi import HTTPException
 
@@ -30,3 +32,32 @@ def test_decode_token_rejects_wrong_type():
 
     with pytest.raises(HTTPException):
         security.decode_token(refresh, expected_type="access")
+
+
+async def test_async_password_hash_roundtrip():
+    plain = "SecurePass123!"
+
+    hashed = await security.get_password_hash_async(plain)
+
+    assert await security.verify_password_async(plain, hashed)
+    assert not await security.verify_password_async("WrongPass123!", hashed)
+
+
+async def test_password_hashing_does_not_block_event_loop():
+    hashed = security.get_password_hash("SecurePass123!")
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.gather(
+        *(security.verify_password_async("SecurePass123!", hashed) for _ in range(8))
+    )
+    ticker_task.cancel()
+
+    # Eight bcrypt checks take well over 10ms; the loop must keep ticking meanwhile
+    assert ticks > 10
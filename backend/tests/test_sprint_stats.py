@@ -0,0 +1,118 @@
+from datetime import date
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.crud.sprint import sprint as crud_sprint
+from app.crud.task import task as crud_task
+from app.models.sprint import Sprint, SprintBurndownSnapshot
+from app.models.task import Task
+from app.services.sprint_stats import get_sprint_stats, get_sprints_stats, sprint_stats_cache
+from tests.fakes import RecordingSession
+
+
+def sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def make_sprint(version=0):
+    return Sprint(id=uuid4(), project_id=uuid4(), name="Sprint", status="active", stats_version=version)
+
+
+async def test_stats_are_one_filtered_aggregate():
+    sprint_stats_cache.clear()
+    session = RecordingSession([])
+
+    stats = await get_sprint_stats(session, sprint=make_sprint())
+
+    (query,) = session.queries
+    assert sql(query).count("FILTER (WHERE") == 5
+    assert stats["tasks_count"] == 0 and stats["logged_hours"] == 0
+
+
+async def test_stats_are_cached_per_version():
+    sprint_stats_cache.clear()
+    sprint = make_sprint()
+    session = RecordingSession([])
+
+    await get_sprint_stats(session, sprint=sprint)
+    await get_sprint_stats(session, sprint=sprint)
+    sprint.stats_version += 1
+    await get_sprint_stats(session, sprint=sprint)
+
+    assert len(session.queries) == 2
+
+
+async def test_batch_stats_query_only_misses():
+    sprint_stats_cache.clear()
+    cached, missing = make_sprint(), make_sprint()
+    session = RecordingSession([])
+    await get_sprint_stats(session, sprint=cached)
+
+    stats = await get_sprints_stats(session, sprints=[cached, missing])
+
+    batch = session.queries[-1]
+    assert len(session.queries) == 2
+    assert "GROUP BY tasks.sprint_id" in sql(batch)
+    assert [missing.id] in batch.compile().params.values()
+    assert set(stats) == {cached.id, missing.id}
+
+
+async def test_task_update_bumps_sprint_version_only_for_stats_fields():
+    task = Task(
+        id=uuid4(), project_id=uuid4(), sprint_id=uuid4(), status="todo", title="Task",
+        story_points=3, logged_hours=0,
+    )
+    session = RecordingSession([])
+
+    def bumps():
+        return [query for query in session.queries if "stats_version=(sprints.stats_version +" in sql(query)]
+
+    await crud_task.update(session, db_obj=task, obj_in={"title": "Renamed"})
+    assert bumps() == []
+
+    await crud_task.update(session, db_obj=task, obj_in={"story_points": 5})
+    assert len(bumps()) == 1
+
+
+def test_get_sprint_uses_cached_stats(world, client_for):
+    sprint_stats_cache.clear()
+    sprint = world["sprint"]
+    sprint.sprint_number, sprint.updated_at, sprint.completed_at = 1, None, None
+
+    for expected_queries in (3, 2):  # sprint + access (+ stats on a miss)
+        client, session = client_for(world["project"], world["sprint"])
+        sprint.stats_version = 0
+
+        response = client.get(f"/api/v1/sprints/{sprint.id}")
+
+        assert response.status_code == 200
+        assert len(session.queries) == expected_queries
+
+
+async def test_burndown_snapshot_is_one_upsert_for_all_active_sprints():
+    session = RecordingSession([])
+
+    await crud_sprint.record_burndown(session)
+
+    (upsert,) = session.queries
+    assert "GROUP BY sprints.id ON CONFLICT (sprint_id, day) DO UPDATE" in sql(upsert)
+    assert "active" in upsert.compile().params.values()
+
+
+def test_burndown_endpoint_reads_snapshots(world, client_for):
+    sprint = world["sprint"]
+    snapshots = [
+        SprintBurndownSnapshot(
+            sprint_id=sprint.id, day=date(2026, 3, day), total_tasks=10, remaining_tasks=10 - day,
+            total_points=20, remaining_points=20 - 2 * day,
+        )
+        for day in (1, 2)
+    ]
+    client, session = client_for(world["project"], sprint, *snapshots)
+
+    response = client.get(f"/api/v1/sprints/{sprint.id}/burndown")
+
+    assert response.status_code == 200
+    assert [point["remaining_points"] for point in response.json()["points"]] == [18, 16]
+    assert len(session.queries) == 3  # sprint + access + snapshots
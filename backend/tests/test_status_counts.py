@@ -0,0 +1,72 @@
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.status_count import ProjectStatusCount
+from app.services.status_counts import count_deltas, reconcile_project, record_task_change
+from tests.fakes import RecordingSession
+
+
+def test_count_deltas_cancel_out():
+    project_id, sprint_id = uuid4(), uuid4()
+
+    deltas = count_deltas(
+        removed=[(project_id, None, "todo"), (project_id, None, "todo")],
+        added=[(project_id, None, "todo"), (project_id, sprint_id, "done")],
+    )
+
+    assert deltas == {(project_id, None, "todo"): -1, (project_id, sprint_id, "done"): 1}
+
+
+async def test_unchanged_keys_issue_no_query():
+    session = RecordingSession([])
+    key = (uuid4(), None, "todo")
+
+    await record_task_change(session, removed=[key], added=[key])
+
+    assert session.queries == []
+
+
+async def test_change_is_one_ordered_upsert():
+    project_id, sprint_id = uuid4(), uuid4()
+    session = RecordingSession([])
+
+    await record_task_change(
+        session, removed=[(project_id, sprint_id, "todo")], added=[(project_id, None, "todo")]
+    )
+
+    (upsert,) = session.queries
+    sql = str(upsert.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (project_id, sprint_id, status) DO UPDATE" in sql
+    assert "project_status_counts.count + excluded.count" in sql
+    columns = ProjectStatusCount.__table__.c
+    rows = [(row[columns.sprint_id], row[columns.count]) for row in upsert._multi_values[0]]
+    assert rows == [(None, 1), (sprint_id, -1)]  # backlog row locked first
+
+
+async def test_reconciliation_locks_counters_in_writer_order():
+    session = RecordingSession([])
+
+    await reconcile_project(session, project_id=uuid4())
+
+    lock = str(session.queries[0].compile(dialect=postgresql.dialect()))
+    assert lock.endswith(
+        "ORDER BY project_status_counts.sprint_id ASC NULLS FIRST, project_status_counts.status COLLATE \"C\" FOR UPDATE"
+    )
+
+
+def test_status_counts_endpoint_sums_lists(world, client_for):
+    project_id = world["project"].id
+    counts = [
+        ProjectStatusCount(id=uuid4(), project_id=project_id, sprint_id=None, status="todo", count=4),
+        ProjectStatusCount(id=uuid4(), project_id=project_id, sprint_id=world["sprint"].id, status="todo", count=2),
+        ProjectStatusCount(id=uuid4(), project_id=project_id, sprint_id=world["sprint"].id, status="done", count=1),
+    ]
+    client, session = client_for(world["project"], *counts)
+
+    response = client.get(f"/api/v1/projects/{project_id}/status-counts")
+
+    assert response.status_code == 200
+    assert response.json()["totals"] == {"todo": 6, "done": 1}
+    assert len(response.json()["counts"]) == 3
+    assert len(session.queries) == 2  # access + counters
@@ -0,0 +1,73 @@
+from collections import namedtuple
+from datetime import date, datetime
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.schemas.task import TaskStatus
+from app.services.status_transitions import backfill_transitions, get_cumulative_flow, record_transitions
+from tests.fakes import FakeResult, RecordingSession
+
+FlowRow = namedtuple("FlowRow", ["day", "status", "count"])
+
+
+def sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+class FlowSession(RecordingSession):
+    def __init__(self, rows):
+        super().__init__([])
+        self.rows = rows
+
+    async def execute(self, stmt):
+        self.queries.append(stmt)
+        return FakeResult(self.rows)
+
+
+async def test_unchanged_statuses_are_not_logged():
+    task_id, project_id = uuid4(), uuid4()
+    session = RecordingSession([])
+
+    await record_transitions(session, [(task_id, project_id, "todo", TaskStatus.TODO)])
+    assert session.queries == []
+
+    await record_transitions(session, [(task_id, project_id, "todo", TaskStatus.DONE)])
+    (insert,) = session.queries
+    assert "done" in insert.compile().params.values()
+
+
+async def test_cumulative_flow_carries_counts_forward():
+    session = FlowSession([
+        FlowRow(datetime(2026, 2, 27), "todo", 3),
+        FlowRow(datetime(2026, 3, 2), "todo", 2),
+        FlowRow(datetime(2026, 3, 2), "done", 1),
+    ])
+
+    series = await get_cumulative_flow(session, project_id=uuid4(), start=date(2026, 3, 1), end=date(2026, 3, 3))
+
+    assert series == [
+        (date(2026, 3, 1), {"todo": 3}),
+        (date(2026, 3, 2), {"todo": 2, "done": 1}),
+        (date(2026, 3, 3), {"todo": 2, "done": 1}),
+    ]
+    (query,) = session.queries
+    assert "date_trunc" in sql(query) and "OVER (PARTITION BY" in sql(query)
+
+
+async def test_backfill_is_one_insert_select():
+    session = RecordingSession([])
+
+    await backfill_transitions(session, project_id=uuid4())
+
+    (insert,) = session.queries
+    assert "INSERT INTO task_status_transitions" in sql(insert)
+    assert "UNION ALL" in sql(insert)
+
+
+def test_cfd_rejects_inverted_range(world, client_for):
+    client, _ = client_for(world["project"])
+
+    response = client.get(f"/api/v1/projects/{world['project'].id}/cfd?start=2026-03-02&end=2026-03-01")
+
+    assert response.status_code == 400
@@ -0,0 +1,66 @@
+import gzip
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from app.services import task_export
+from app.services.task_export import encode_export
+from app.services.task_import import parse_rows
+
+
+def make_record(number: int) -> dict:
+    return {
+        "key": f"PROJ-{number}",
+        "id": uuid4(),
+        "task_number": number,
+        "title": f"Task, \"{number}\"",
+        "description": "multi\nline",
+        "tags": ["api", "backend"],
+        "custom_fields": {},
+        "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+        "cursor": "abc",
+        "history": [{"action": "created", "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc)}],
+    }
+
+
+async def records_of(records):
+    for record in records:
+        yield record
+
+
+async def export(records, **kwargs) -> bytes:
+    return b"".join([chunk async for chunk in encode_export(records_of(records), **kwargs)])
+
+
+async def test_ndjson_export_one_line_per_task():
+    records = [make_record(1), make_record(2)]
+
+    lines = (await export(records)).decode().splitlines()
+
+    assert [json.loads(line)["key"] for line in lines] == ["PROJ-1", "PROJ-2"]
+    assert json.loads(lines[0])["history"][0]["created_at"] == "2024-01-01T00:00:00+00:00"
+
+
+async def test_csv_export_is_readable_by_import():
+    records = [make_record(1), make_record(2)]
+    data = await export(records, export_format="csv", include=["history"])
+
+    async def chunks():
+        yield data
+
+    rows = [row async for _, row in parse_rows(chunks(), "csv")]
+
+    assert [row["title"] for row in rows] == ['Task, "1"', 'Task, "2"']
+    assert rows[0]["description"] == "multi\nline"
+    assert rows[0]["tags"] == "api,backend"
+    assert json.loads(rows[0]["history"])[0]["action"] == "created"
+
+
+async def test_gzip_export_is_chunked(monkeypatch):
+    monkeypatch.setattr(task_export, "CHUNK_SIZE", 100)
+    records = [make_record(number) for number in range(50)]
+
+    chunks = [chunk async for chunk in encode_export(records_of(records), compress=True)]
+
+    assert len(chunks) > 1
+    assert gzip.decompress(b"".join(chunks)) == await export(records)
@@ -0,0 +1,135 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import case, create_engine, not_, select, text as text_
+from sqlalchemy.dialects import postgresql
+
+from app.models.task import Task
+from app.services.task_filter import FilterError, _evaluate, compile_filter
+
+NOW = datetime(2026, 3, 10, 15, 30, tzinfo=timezone.utc)
+
+
+def render(text: str, user_id=None):
+    clause = compile_filter(text).clause(user_id=user_id or uuid4(), now=NOW)
+    compiled = clause.compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+def test_compiles_example_expression():
+    user_id = uuid4()
+
+    sql, params = render(
+        "status in (todo, review) and assignee = me and due < now+7d and tags has backend", user_id
+    )
+
+    assert "tasks.status IN" in sql
+    assert "tasks.tags @>" in sql
+    assert user_id in params.values()
+    assert datetime(2026, 3, 17, 15, 30, tzinfo=timezone.utc) in params.values()
+    assert ["backend"] in params.values()
+
+
+def test_precedence_and_grouping():
+    sql, _ = render('not (priority = high or title ~ "50%") and points >= 3')
+
+    assert sql.startswith("NOT (tasks.priority =")
+    assert "ILIKE" in sql and "AND (tasks.story_points >=" in sql
+
+
+def test_null_and_not_equal_semantics():
+    sql, _ = render("sprint = null and assignee != me")
+
+    assert "tasks.sprint_id IS NULL" in sql
+    assert "IS DISTINCT FROM" in sql
+
+
+def test_today_offsets():
+    _, params = render("created >= today-1w")
+
+    assert datetime(2026, 3, 3, tzinfo=timezone.utc) in params.values()
+
+
+def test_compiled_filters_are_cached():
+    assert compile_filter("status = done") is compile_filter("status = done")
+
+
+@pytest.mark.parametrize(
+    "text, position",
+    [
+        ("", 0),
+        ("colour = red", 0),
+        ("status = shipped", 9),
+        ("due has now", 4),
+        ("status in (todo", 15),
+        ("title = null", 8),
+        ("status = todo and", 17),
+        ("status = todo !", 14),
+    ],
+)
+def test_invalid_filters_report_position(text, position):
+    with pytest.raises(FilterError) as exc_info:
+        compile_filter(text)
+
+    assert exc_info.value.position == position
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("status in (todo, review) and assignee = me and tags has backend", True),
+        ("assignee != me", False),
+        ("sprint = null and due < now+7d", True),
+        ("not (due > now+3d)", True),
+        ("not (points > 3)", False),  # NULL comparison stays unknown under NOT
+        ("points not in (1, 2) and tags not has frontend", True),
+        ('title ~ "LOGIN" or number = 5', True),
+    ],
+)
+def test_matches_agrees_with_sql_semantics(text, expected):
+    user_id = uuid4()
+    task = {
+        "status": "todo", "assignee_id": user_id, "tags": ["backend"], "sprint_id": None,
+        "due_date": datetime(2026, 3, 12, tzinfo=timezone.utc), "story_points": None,
+        "title": "Fix login", "task_number": 7,
+    }
+
+    assert compile_filter(text).matches(task, user_id=user_id, now=NOW) is expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "points = 3",
+        "not (points = 3)",
+        "points != 3",
+        "not (points != 3)",
+        "points = null",
+        "not (points in (1, 2))",
+        "not (points not in (1, 2))",
+        "not (estimate > 1) or number = 7",
+        "points < 3 or not (points = 3)",
+        "not (points = 3 and number = 7)",
+    ],
+)
+def test_evaluate_matches_sql_for_null_columns(text):
+    user_id = uuid4()
+    task_filter = compile_filter(text)
+    clause = task_filter.clause(user_id=user_id, now=NOW)
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        conn.execute(text_("CREATE TABLE tasks (story_points INTEGER, estimated_hours REAL, task_number INTEGER)"))
+        conn.execute(text_("INSERT INTO tasks VALUES (NULL, NULL, 7)"))
+        # TRUE, FALSE or NULL (unknown) as the database computes it
+        expected = conn.execute(
+            select(case((clause, True), (not_(clause), False), else_=None)).select_from(Task.__table__)
+        ).scalar()
+
+    task = {"story_points": None, "estimated_hours": None, "task_number": 7}
+    assert _evaluate(task_filter.tree, task, user_id, NOW) is expected
+
+
+def test_uses_time():
+    assert compile_filter("due < now+7d").uses_time
+    assert not compile_filter("due < 2026-01-01").uses_time
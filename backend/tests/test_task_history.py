@@ -0,0 +1,58 @@
+from uuid import uuid4
+
+from app.models.task import Task, TaskHistory
+from app.schemas.task import TaskPriority, TaskStatus
+from app.services.task_history import TaskChangeSet, diff_task
+from tests.fakes import RecordingSession
+
+
+def make_task(**values):
+    return Task(id=uuid4(), title="Task", status="todo", priority="medium", story_points=3, **values)
+
+
+def test_diff_compares_enums_by_value():
+    task = make_task()
+
+    diff = diff_task(task, {"status": TaskStatus.TODO, "priority": TaskPriority.HIGH, "title": "Task"})
+
+    assert diff == [("priority", "medium", "high")]
+
+
+def test_change_set_keeps_falsy_values():
+    task = make_task()
+    history = TaskChangeSet(user_id=uuid4())
+
+    history.diff(task, {"story_points": 0, "description": "Details"})
+
+    assert [(row["field_name"], row["old_value"], row["new_value"]) for row in history.rows] == [
+        ("story_points", "3", "0"),
+        ("description", None, "Details"),
+    ]
+
+
+async def test_change_set_is_written_by_one_insert():
+    tasks = [make_task(), make_task()]
+    history = TaskChangeSet(user_id=uuid4())
+    for task in tasks:
+        history.diff(task, {"title": "Renamed", "status": "done", "story_points": 5})
+    session = RecordingSession([])
+
+    assert await history.write(session) == 6
+    assert await history.write(session) == 0
+
+    (insert,) = session.queries
+    assert insert.table.name == "task_history"
+    assert len(insert._multi_values[0]) == 6
+
+
+def test_update_task_writes_history_once(world, client_for):
+    client, session = client_for(world["project"], world["task"])
+
+    response = client.patch(
+        f"/api/v1/tasks/{world['task'].id}",
+        json={"title": "Renamed", "description": "Details", "priority": "high", "story_points": 8},
+    )
+
+    assert response.status_code == 200
+    (history,) = [query for query in session.queries if getattr(query, "table", None) == TaskHistory.__table__]
+    assert len(history._multi_values[0]) == 4
@@ -0,0 +1,65 @@
+import pytest
+
+from app.schemas.task import TaskImportRow
+from app.services import task_import
+from app.services.task_import import TaskImportError, parse_rows, read_chunks, spool_body
+
+
+async def chunks_of(text: str, size: int):
+    data = text.encode()
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def collect(text: str, import_format: str, size: int = 7):
+    return [row async for row in parse_rows(chunks_of(text, size), import_format)]
+
+
+async def test_parse_ndjson_across_chunks():
+    text = '{"title": "First"}\n\n{"title": "Ünïcode", "tags": ["a"]}\r\n{"title": "Last"}'
+
+    rows = await collect(text, "ndjson")
+
+    assert rows == [(1, {"title": "First"}), (3, {"title": "Ünïcode", "tags": ["a"]}), (4, {"title": "Last"})]
+
+
+async def test_parse_ndjson_reports_line():
+    with pytest.raises(TaskImportError) as exc_info:
+        await collect('{"title": "Ok"}\n{broken\n', "ndjson")
+
+    assert exc_info.value.line == 2
+
+
+async def test_parse_csv_with_quoted_newlines():
+    text = 'title,description,tags\r\nFirst,"two\nlines, ""quoted""",\r\nSecond,,"a,b"\r\n'
+
+    rows = await collect(text, "csv", size=5)
+
+    assert rows == [
+        (2, {"title": "First", "description": 'two\nlines, "quoted"'}),
+        (4, {"title": "Second", "tags": "a,b"}),
+    ]
+
+
+async def test_parse_csv_rejects_unterminated_quote():
+    with pytest.raises(TaskImportError):
+        await collect('title\n"open\n', "csv")
+
+
+def test_import_row_splits_csv_tags():
+    row = TaskImportRow.model_validate({"title": "Task", "tags": "backend, api,backend"})
+
+    assert sorted(row.tags) == ["api", "backend"]
+
+
+async def test_spooled_body_reads_back(monkeypatch):
+    monkeypatch.setattr(task_import, "SPOOL_MEMORY_SIZE", 16)  # spills to disk
+    text = "".join(f'{{"title": "Task {number}"}}\n' for number in range(50))
+
+    body = await spool_body(chunks_of(text, 7))
+
+    with body:
+        rows = [row async for row in parse_rows(read_chunks(body), "ndjson")]
+    assert len(rows) == 50
+    assert rows[-1] == (50, {"title": "Task 49"})
+
@@ -42,3 +42,16 @@ def test_task_status_enum_contains_all_columns(status):
     # Каждое значение перечисления должно иметь строковое представление (используется во фронте и миграциях).
     assert isinstance(status.value, str)
     assert status.value
+
+
+def test_task_bulk_update_requires_changes():
+    with pytest.raises(ValueError):
+        task_schema.TaskBulkUpdate(task_ids=[uuid4()], changes={})
+
+
+def test_task_bulk_update_deduplicates_ids():
+    task_id = uuid4()
+    payload = task_schema.TaskBulkUpdate(task_ids=[task_id, task_id], changes={"assignee_id": None})
+
+    assert payload.task_ids == [task_id]
+    assert payload.changes.model_dump(exclude_unset=True) == {"assignee_id": None}